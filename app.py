@@ -1,4 +1,6 @@
 import streamlit as st
+from streamlit.runtime.scriptrunner import add_script_run_ctx, get_script_run_ctx
+from streamlit.errors import StreamlitAPIException
 import pandas as pd
 import base64
 import io
@@ -6,6 +8,16 @@ from datetime import datetime, date
 import time
 import fcntl
 import os
+import re
+import unicodedata
+import hashlib
+import uuid
+import shutil
+import sqlite3
+import threading
+from contextlib import contextmanager
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
 import gspread
 from oauth2client.service_account import ServiceAccountCredentials
 import json
@@ -72,6 +84,124 @@ def safe_write_excel(df, file_path, max_retries=5, retry_delay=0.5):
                 raise Exception(f"Failed to write {file_path} after {max_retries} attempts: {e}")
     return False
 
+# Google Sheets quota - process-wide token buckets in front of every Sheets/Drive request
+SHEETS_QUOTA_PER_MINUTE = {
+    'read': int(os.getenv('SHEETS_READ_QUOTA_PER_MINUTE', '60')),
+    'write': int(os.getenv('SHEETS_WRITE_QUOTA_PER_MINUTE', '60')),
+}
+SHEETS_QUOTA_BURST = 10  # Requests that may go out back to back before the per-minute rate applies
+SHEETS_QUOTA_COOLDOWN_SECONDS = 30  # Pause after Google answers 429 without a Retry-After header
+SHEETS_PRIORITIES = ['save', 'read', 'refresh']  # Highest first
+SHEETS_PRIORITY_MAX_WAIT_SECONDS = {'save': 60, 'read': 15, 'refresh': 0}
+SHEETS_REFRESH_RESERVE = 3  # Tokens refreshes leave untouched so saves never wait behind them
+
+class SheetsQuotaExceeded(Exception):
+    """A Google Sheets request was held back by the local quota limiter"""
+
+_sheets_request_context = threading.local()
+
+@contextmanager
+def sheets_priority(priority):
+    """Run the Google Sheets requests made by this thread inside the block at `priority`"""
+    previous = getattr(_sheets_request_context, 'priority', 'read')
+    _sheets_request_context.priority = priority
+    try:
+        yield
+    finally:
+        _sheets_request_context.priority = previous
+
+@st.cache_resource(show_spinner=False)
+def _sheets_quota():
+    """Token buckets shared by every session of this process"""
+    capacity = {kind: min(SHEETS_QUOTA_BURST, quota) for kind, quota in SHEETS_QUOTA_PER_MINUTE.items()}
+    return {
+        'condition': threading.Condition(),
+        'capacity': capacity,
+        # Burst + one minute of refill never exceeds the Google per-minute quota
+        'rate': {kind: max(quota - capacity[kind], 1) / 60 for kind, quota in SHEETS_QUOTA_PER_MINUTE.items()},
+        'tokens': dict(capacity),
+        'updated': time.time(),
+        'blocked_until': 0,
+        'waiting': {(kind, priority): 0 for kind in SHEETS_QUOTA_PER_MINUTE for priority in SHEETS_PRIORITIES},
+    }
+
+def _refill_sheets_quota(quota, now):
+    """Add the tokens earned since the last refill"""
+    elapsed = now - quota['updated']
+    quota['updated'] = now
+    for kind, capacity in quota['capacity'].items():
+        quota['tokens'][kind] = min(capacity, quota['tokens'][kind] + elapsed * quota['rate'][kind])
+
+def acquire_sheets_quota(kind):
+    """Take one request token, waiting as long as this thread's priority allows (False if none was granted)"""
+    priority = getattr(_sheets_request_context, 'priority', 'read')
+    higher_priorities = SHEETS_PRIORITIES[:SHEETS_PRIORITIES.index(priority)]
+    reserve = SHEETS_REFRESH_RESERVE if priority == 'refresh' else 0
+    quota = _sheets_quota()
+    deadline = time.time() + SHEETS_PRIORITY_MAX_WAIT_SECONDS[priority]
+    
+    with quota['condition']:
+        quota['waiting'][(kind, priority)] += 1
+        try:
+            while True:
+                now = time.time()
+                _refill_sheets_quota(quota, now)
+                # Lower priorities yield while a higher priority request is waiting for the same bucket
+                yielding = any(quota['waiting'][(kind, higher)] for higher in higher_priorities)
+                if now >= quota['blocked_until'] and not yielding and quota['tokens'][kind] >= 1 + reserve:
+                    quota['tokens'][kind] -= 1
+                    return True
+                if now >= deadline:
+                    return False
+                quota['condition'].wait(min(deadline - now, 0.5))
+        finally:
+            quota['waiting'][(kind, priority)] -= 1
+            quota['condition'].notify_all()
+
+def report_sheets_quota_exceeded(retry_after=None):
+    """Stop sending requests for a while after Google answered 429"""
+    quota = _sheets_quota()
+    with quota['condition']:
+        quota['blocked_until'] = time.time() + (retry_after or SHEETS_QUOTA_COOLDOWN_SECONDS)
+        quota['tokens'] = {kind: 0 for kind in quota['tokens']}
+    print(f"⏳ Google Sheets quota exceeded, pausing requests for {retry_after or SHEETS_QUOTA_COOLDOWN_SECONDS}s")
+
+def sheets_quota_exhausted():
+    """True while Google asked us to back off (429), or when this thread's last sheet load was refused for quota"""
+    if getattr(_sheets_request_context, 'quota_refused', False):
+        return True
+    quota = _sheets_quota()
+    with quota['condition']:
+        return time.time() < quota['blocked_until']
+
+def _is_quota_error(error):
+    """Whether an exception means the Google Sheets quota was hit"""
+    if isinstance(error, SheetsQuotaExceeded):
+        return True
+    if isinstance(error, gspread.exceptions.APIError):
+        response = getattr(error, 'response', None)
+        return getattr(response, 'status_code', None) == 429 or getattr(error, 'error', {}).get('status') == 'RESOURCE_EXHAUSTED'
+    return False
+
+def _limit_sheets_requests(client):
+    """Route every HTTP request of a gspread client through the quota limiter"""
+    # gspread 6 moved the authorized session to client.http_client
+    session = getattr(client, 'http_client', client).session
+    send_request = session.request
+    
+    def limited_request(method, url, *args, **kwargs):
+        kind = 'read' if str(method).upper() == 'GET' else 'write'
+        if not acquire_sheets_quota(kind):
+            raise SheetsQuotaExceeded(f"Google Sheets {kind} quota exhausted, request to {url} held back")
+        response = send_request(method, url, *args, **kwargs)
+        if response.status_code == 429:
+            retry_after = response.headers.get('Retry-After', '')
+            report_sheets_quota_exceeded(int(retry_after) if retry_after.isdigit() else None)
+        return response
+    
+    session.request = limited_request
+    return client
+
 # Google Sheets Integration
 @st.cache_resource
 def get_google_sheets_client():
@@ -110,7 +240,7 @@ def get_google_sheets_client():
             scope = ['https://spreadsheets.google.com/feeds',
                     'https://www.googleapis.com/auth/drive']
             credentials = ServiceAccountCredentials.from_json_keyfile_dict(credentials_dict, scope)
-            client = gspread.authorize(credentials)
+            client = _limit_sheets_requests(gspread.authorize(credentials))
             print("✅ Google Sheets client authorized successfully")
             return client
         else:
@@ -123,11 +253,18 @@ def get_google_sheets_client():
         traceback.print_exc()
         return None
 
-@st.cache_data(ttl=20, show_spinner=False)  # Cache for 20 seconds to avoid stale data in Render
-def read_google_sheet(sheet_name, worksheet_name='Sheet1', max_retries=2):
-    """Read data from Google Sheet and return as DataFrame with retry logic"""
+def warn_user(message):
+    """Show a warning on the page when running on a script thread; background threads only log it"""
+    if get_script_run_ctx(suppress_warning=True) is not None:
+        st.warning(message)
+    else:
+        print(message)
+
+def _fetch_google_sheet(sheet_name, worksheet_name='Sheet1', max_retries=2):
+    """Download a Google Sheet as a DataFrame with retry logic (None if the download failed)"""
     import time
     print(f"📥 Loading from Google Sheets: {sheet_name}")
+    _sheets_request_context.quota_refused = False
     
     for attempt in range(max_retries):
         try:
@@ -160,10 +297,11 @@ def read_google_sheet(sheet_name, worksheet_name='Sheet1', max_retries=2):
                 else:
                     print(f"❌ Google Sheets error 500 after {max_retries} attempts")
             
-            # If quota exceeded, show warning
-            if "Quota exceeded" in error_str:
-                st.warning(f"⚠️ Google Sheets API limit reached. Please wait a moment and try again.")
-                return pd.DataFrame()
+            # Quota exhausted: the caller serves its last snapshot instead of an empty sheet
+            if _is_quota_error(e):
+                print(f"⏳ Google Sheets quota reached, not loading '{sheet_name}' now")
+                _sheets_request_context.quota_refused = True
+                return None
             
             # Don't show error for connection issues or common errors
             error_str_lower = error_str.lower()
@@ -176,12 +314,228 @@ def read_google_sheet(sheet_name, worksheet_name='Sheet1', max_retries=2):
             )
             
             if should_show_error and attempt == max_retries - 1:
-                st.warning(f"⚠️ Error temporal de Google Sheets. Intenta de nuevo en unos segundos.")
+                warn_user("⚠️ Error temporal de Google Sheets. Intenta de nuevo en unos segundos.")
             
-            # Return empty DataFrame to trigger fallback
+            # Signal the failure so the caller can fall back to the local store
+            return None
+    
+    return None
+
+DRIVE_FILES_API_URL = 'https://www.googleapis.com/drive/v3/files'
+
+@st.cache_resource(show_spinner=False)
+def _spreadsheet_ids():
+    """Process-wide cache of spreadsheet name -> id, so version checks skip client.open()"""
+    return {}
+
+def get_sheet_version(sheet_name):
+    """Cheap revision check: the spreadsheet's Drive modifiedTime (None if it can't be determined)"""
+    try:
+        client = get_google_sheets_client()
+        if client is None:
+            # Local Excel fallback: use the file modification time
+            excel_path = f'{sheet_name}.xlsx'
+            return str(os.path.getmtime(excel_path)) if os.path.exists(excel_path) else None
+        
+        spreadsheet_ids = _spreadsheet_ids()
+        if sheet_name not in spreadsheet_ids:
+            spreadsheet_ids[sheet_name] = client.open(sheet_name).id
+        
+        # gspread 6 moved raw requests to client.http_client
+        http = getattr(client, 'http_client', client)
+        response = http.request(
+            'get',
+            f"{DRIVE_FILES_API_URL}/{spreadsheet_ids[sheet_name]}",
+            params={'fields': 'modifiedTime', 'supportsAllDrives': True}
+        )
+        return response.json().get('modifiedTime')
+    except Exception as e:
+        print(f"⚠️ Could not check version of '{sheet_name}': {e}")
+        if not _is_quota_error(e):
+            _spreadsheet_ids().pop(sheet_name, None)
+        return None
+
+def _revalidate_local_sheet(sheet_name, worksheet_name='Sheet1', max_retries=2):
+    """Check Google Sheets for a newer revision and swap it into the local store: returns (generation, downloaded DataFrame or None)"""
+    table = _local_table_name(sheet_name, worksheet_name)
+    state = _local_sync_state(table)
+    
+    # Refreshing a copy we already have yields to saves; a first load waits for its turn
+    with sheets_priority('refresh' if state is not None else 'read'):
+        # Only download the sheet when its revision changed since the local copy was taken
+        version = get_sheet_version(sheet_name)
+        if state is not None and version is not None and version == state['version']:
+            _touch_local_sync_state(table)
+            return state['generation'], None
+        
+        df = _fetch_google_sheet(sheet_name, worksheet_name, max_retries)
+    if df is None:
+        if sheets_quota_exhausted():
+            error = "Google Sheets API limit reached"
+        else:
+            error = "Google Sheets no respondió"
+        if state is not None:
+            # Keep serving the last good copy; the failure is recorded for the page to show
+            print(f"⚠️ Serving local copy of '{sheet_name}': {error}")
+            _touch_local_sync_state(table, refresh_error=error)
+            return state['generation'], None
+        if sheets_quota_exhausted():
+            warn_user("⚠️ Google Sheets API limit reached. Please wait a moment and try again.")
+        return None, pd.DataFrame()
+    
+    try:
+        expected_generation = state['generation'] if state is not None else None
+        if not write_local_table(df, sheet_name, worksheet_name, version, expected_generation):
+            # A local save landed while downloading; keep it and revalidate on a later pass
+            print(f"⚠️ Local copy of '{sheet_name}' changed during refresh, keeping it")
+            return _local_sync_state(table)['generation'], None
+        return _local_sync_state(table)['generation'], df
+    except Exception as e:
+        print(f"❌ Error mirroring {sheet_name} to local store: {e}")
+        return None, df
+
+@st.cache_resource
+def _background_revalidations():
+    """Worker pool and in-flight set for stale-while-revalidate refreshes"""
+    return {
+        'pool': ThreadPoolExecutor(max_workers=BACKGROUND_REFRESH_WORKERS, thread_name_prefix='sheets-revalidate'),
+        'lock': threading.Lock(),
+        'running': set(),
+    }
+
+def revalidate_in_background(sheet_name, worksheet_name='Sheet1', max_retries=2):
+    """Refresh the local copy of a sheet off the request path (at most one refresh per sheet at a time)"""
+    revalidations = _background_revalidations()
+    table = _local_table_name(sheet_name, worksheet_name)
+    with revalidations['lock']:
+        if table in revalidations['running']:
+            return
+        revalidations['running'].add(table)
+    
+    def run():
+        try:
+            _revalidate_local_sheet(sheet_name, worksheet_name, max_retries)
+        except Exception as e:
+            print(f"❌ Error refreshing {sheet_name} in background: {e}")
+        finally:
+            with revalidations['lock']:
+                revalidations['running'].discard(table)
+    
+    revalidations['pool'].submit(run)
+
+def _refresh_local_sheet(sheet_name, worksheet_name='Sheet1', max_retries=2):
+    """Bring the local copy of a sheet up to date: returns (generation, downloaded DataFrame or None)"""
+    table = _local_table_name(sheet_name, worksheet_name)
+    try:
+        state = _local_sync_state(table)
+    except Exception as e:
+        print(f"❌ Error reading local store for {sheet_name}: {e}")
+        state = None
+    
+    if state is not None:
+        if state['refresh_error']:
+            # The last refresh (possibly a background one) failed: tell the scout the data may be outdated
+            warn_user(f"⚠️ Mostrando la copia local de '{sheet_name}' ({state['refresh_error']}). Se reintentará en unos segundos.")
+        age = time.time() - state['synced_at']
+        # Serve the local mirror while it is fresh or while local writes are still syncing
+        if age < LOCAL_STORE_REFRESH_SECONDS or state['pending'] > 0:
+            return state['generation'], None
+        # Stale-while-revalidate: serve the local copy now and refresh it in the background
+        if age < LOCAL_STORE_MAX_STALENESS_SECONDS:
+            revalidate_in_background(sheet_name, worksheet_name, max_retries)
+            return state['generation'], None
+    
+    # First load, explicit invalidation or too stale to serve: refresh in the foreground
+    return _revalidate_local_sheet(sheet_name, worksheet_name, max_retries)
+
+def refresh_sheet(sheet_name, worksheet_name='Sheet1'):
+    """Refresh the local copy of a sheet if needed and return its data generation (None if unavailable)"""
+    generation, _ = _refresh_local_sheet(sheet_name, worksheet_name)
+    return generation
+
+def read_google_sheet(sheet_name, worksheet_name='Sheet1', max_retries=2):
+    """Read a sheet from the local SQLite store; stale copies are served at once and refreshed in the background"""
+    generation, df = _refresh_local_sheet(sheet_name, worksheet_name, max_retries)
+    if df is not None:
+        return df
+    try:
+        df_local = read_local_table(sheet_name, worksheet_name)
+    except Exception as e:
+        print(f"❌ Error reading local store for {sheet_name}: {e}")
+        df_local = None
+    return df_local if df_local is not None else pd.DataFrame()
+
+def load_concurrently(loaders):
+    """Run {name: callable} loaders concurrently and return {name: result}"""
+    # Worker threads share the page's script context so warnings still reach the UI
+    script_ctx = get_script_run_ctx()
+    
+    def run_one(item):
+        name, loader = item
+        if script_ctx is not None:
+            add_script_run_ctx(threading.current_thread(), script_ctx)
+        try:
+            return loader()
+        except Exception as e:
+            print(f"❌ Error loading {name}: {e}")
             return pd.DataFrame()
     
-    return pd.DataFrame()
+    with ThreadPoolExecutor(max_workers=max(len(loaders), 1), thread_name_prefix='sheets-read') as pool:
+        results = list(pool.map(run_one, loaders.items()))
+    return dict(zip(loaders, results))
+
+def _prepare_sheet_dataframe(df):
+    """Convert a DataFrame to plain strings so gspread can serialize it"""
+    # Create a copy to avoid modifying original
+    df_clean = df.copy()
+    
+    # Convert datetime/timestamp columns to strings
+    for col in df_clean.columns:
+        if pd.api.types.is_datetime64_any_dtype(df_clean[col]):
+            df_clean[col] = df_clean[col].astype(str)
+    
+    # Replace NaN values with empty strings to avoid JSON errors
+    df_clean = df_clean.fillna('')
+    
+    # Convert all data to strings to ensure JSON compatibility
+    return df_clean.astype(str)
+
+def _open_worksheet(client, sheet_name, worksheet_name='Sheet1'):
+    """Open a worksheet, creating the spreadsheet and worksheet if they don't exist"""
+    # Open or create the sheet
+    try:
+        sheet = client.open(sheet_name)
+        print(f"✅ Opened Google Sheet: {sheet_name}")
+    except gspread.exceptions.SpreadsheetNotFound:
+        print(f"⚠️ Sheet '{sheet_name}' not found, creating new one...")
+        sheet = client.create(sheet_name)
+        # Share with everyone (or specific emails)
+        sheet.share('', perm_type='anyone', role='writer')
+    
+    # Get or create worksheet
+    try:
+        worksheet = sheet.worksheet(worksheet_name)
+    except gspread.exceptions.WorksheetNotFound:
+        worksheet = sheet.add_worksheet(title=worksheet_name, rows=1000, cols=20)
+    
+    return worksheet
+
+def _extend_sheet_header(worksheet, header, columns):
+    """Add any of `columns` missing from the header row and return the full header"""
+    new_columns = [str(col) for col in columns if str(col) not in header]
+    if not new_columns:
+        return header
+    
+    header = header + new_columns
+    if worksheet.col_count < len(header):
+        worksheet.add_cols(len(header) - worksheet.col_count)
+    
+    # Only the new header cells are written, existing columns are left untouched
+    start_cell = gspread.utils.rowcol_to_a1(1, len(header) - len(new_columns) + 1)
+    end_cell = gspread.utils.rowcol_to_a1(1, len(header))
+    worksheet.update(range_name=f"{start_cell}:{end_cell}", values=[new_columns])
+    print(f"➕ Added {len(new_columns)} new column(s) to the header")
+    return header
 
 def write_google_sheet(df, sheet_name, worksheet_name='Sheet1'):
     """Write DataFrame to Google Sheet"""
@@ -191,35 +545,8 @@ def write_google_sheet(df, sheet_name, worksheet_name='Sheet1'):
             print("❌ Google Sheets client is None - no credentials found")
             return False
         
-        # Create a copy to avoid modifying original
-        df_clean = df.copy()
-        
-        # Convert datetime/timestamp columns to strings
-        for col in df_clean.columns:
-            if pd.api.types.is_datetime64_any_dtype(df_clean[col]):
-                df_clean[col] = df_clean[col].astype(str)
-        
-        # Replace NaN values with empty strings to avoid JSON errors
-        df_clean = df_clean.fillna('')
-        
-        # Convert all data to strings to ensure JSON compatibility
-        df_clean = df_clean.astype(str)
-        
-        # Open or create the sheet
-        try:
-            sheet = client.open(sheet_name)
-            print(f"✅ Opened Google Sheet: {sheet_name}")
-        except gspread.exceptions.SpreadsheetNotFound:
-            print(f"⚠️ Sheet '{sheet_name}' not found, creating new one...")
-            sheet = client.create(sheet_name)
-            # Share with everyone (or specific emails)
-            sheet.share('', perm_type='anyone', role='writer')
-        
-        # Get or create worksheet
-        try:
-            worksheet = sheet.worksheet(worksheet_name)
-        except gspread.exceptions.WorksheetNotFound:
-            worksheet = sheet.add_worksheet(title=worksheet_name, rows=1000, cols=20)
+        df_clean = _prepare_sheet_dataframe(df)
+        worksheet = _open_worksheet(client, sheet_name, worksheet_name)
         
         # Clear existing data
         worksheet.clear()
@@ -236,94 +563,2221 @@ def write_google_sheet(df, sheet_name, worksheet_name='Sheet1'):
         traceback.print_exc()
         return False
 
-def append_to_google_sheet(df_new, sheet_name, worksheet_name='Sheet1'):
-    """Append new data to existing Google Sheet"""
-    try:
-        print(f"📝 Attempting to append {len(df_new)} rows to {sheet_name}...")
+def append_to_google_sheet(df_new, sheet_name, worksheet_name='Sheet1', dedupe_column=None):
+    """Append new rows to a Google Sheet without re-reading or clearing it
+    
+    With `dedupe_column`, rows whose id in that column is already in the sheet are skipped (safe retries).
+    """
+    try:
+        print(f"📝 Attempting to append {len(df_new)} rows to {sheet_name}...")
+        
+        if df_new.empty:
+            return True
+        
+        client = get_google_sheets_client()
+        if client is None:
+            print("❌ Google Sheets client is None - no credentials found")
+            return False
+        
+        worksheet = _open_worksheet(client, sheet_name, worksheet_name)
+        
+        # Only the header row is read, never the existing data
+        header = worksheet.row_values(1)
+        if not header:
+            print("📊 No existing data, creating new sheet...")
+        
+        if dedupe_column in header and dedupe_column in df_new.columns:
+            # A failed request may still have reached the sheet: only send rows that are not there yet
+            letter = _column_letter(header.index(dedupe_column) + 1)
+            column_range = worksheet.batch_get([f"{letter}2:{letter}"], major_dimension='COLUMNS')[0]
+            existing_ids = {str(cell).strip() for cell in (column_range[0] if column_range else [])}
+            df_new = df_new[~df_new[dedupe_column].astype(str).isin(existing_ids)]
+            if df_new.empty:
+                print(f"✅ Rows already in {sheet_name}, nothing to append")
+                return True
+        
+        # Align new rows to the sheet header, adding new position-item columns when needed
+        header = _extend_sheet_header(worksheet, header, df_new.columns)
+        df_aligned = df_new.reindex(columns=header)
+        rows = _prepare_sheet_dataframe(df_aligned).values.tolist()
+        
+        worksheet.append_rows(rows, value_input_option='RAW', table_range='A1')
+        
+        print(f"✅ Successfully appended {len(rows)} rows to {sheet_name}")
+        return True
+    except Exception as e:
+        print(f"❌ Error in append_to_google_sheet: {e}")
+        import traceback
+        traceback.print_exc()
+        return False
+
+def _column_letter(col_number):
+    """Convert a 1-based column number to its A1 letter (3 -> 'C')"""
+    return gspread.utils.rowcol_to_a1(1, col_number).rstrip('0123456789')
+
+def _sheet_cell_value(value):
+    """Convert a single value to the string written to Google Sheets"""
+    if value is None or (not isinstance(value, str) and pd.isna(value)):
+        return ''
+    return str(value)
+
+def _find_sheet_rows(worksheet, header, key):
+    """Return the 1-based sheet row numbers whose key columns match all values in `key`"""
+    if any(col not in header for col in key):
+        return []
+    
+    # Download only the key columns (one request), never the full sheet
+    ranges = []
+    for col in key:
+        letter = _column_letter(header.index(col) + 1)
+        ranges.append(f"{letter}2:{letter}")
+    columns = worksheet.batch_get(ranges, major_dimension='COLUMNS')
+    
+    matching_rows = None
+    for (col, value), column_range in zip(key.items(), columns):
+        column_values = column_range[0] if column_range else []
+        target = _sheet_cell_value(value).strip()
+        rows = {row_offset + 2 for row_offset, cell in enumerate(column_values) if str(cell).strip() == target}
+        matching_rows = rows if matching_rows is None else matching_rows & rows
+    
+    return sorted(matching_rows or [])
+
+class SheetRowsNotFound(Exception):
+    """No row of the sheet matches the key of an update, so retrying it cannot succeed"""
+
+def update_google_sheet_rows(sheet_name, key, updates, worksheet_name='Sheet1'):
+    """Update only the given cells of the rows matching `key` (e.g. Scout/Match/Player)
+    
+    Raises SheetRowsNotFound when no row matches; returns False on other failures.
+    """
+    try:
+        if not updates:
+            return True
+        
+        client = get_google_sheets_client()
+        if client is None:
+            print("❌ Google Sheets client is None - no credentials found")
+            return False
+        
+        worksheet = _open_worksheet(client, sheet_name, worksheet_name)
+        header = worksheet.row_values(1)
+        target_rows = _find_sheet_rows(worksheet, header, key)
+        if not target_rows:
+            raise SheetRowsNotFound(f"No rows in {sheet_name} match {key}")
+        
+        header = _extend_sheet_header(worksheet, header, updates.keys())
+        
+        # One batched request with just the changed cell ranges
+        cell_updates = []
+        for row_number in target_rows:
+            for col, value in updates.items():
+                cell = gspread.utils.rowcol_to_a1(row_number, header.index(str(col)) + 1)
+                cell_updates.append({'range': cell, 'values': [[_sheet_cell_value(value)]]})
+        worksheet.batch_update(cell_updates, value_input_option='RAW')
+        
+        print(f"✅ Updated {len(cell_updates)} cell(s) in {len(target_rows)} row(s) of {sheet_name}")
+        return True
+    except SheetRowsNotFound as e:
+        print(f"⚠️ {e}")
+        raise
+    except Exception as e:
+        print(f"❌ Error in update_google_sheet_rows: {e}")
+        import traceback
+        traceback.print_exc()
+        return False
+
+def delete_google_sheet_rows(sheet_name, key, worksheet_name='Sheet1'):
+    """Delete only the rows matching `key` (e.g. Scout/Match/Player) from a Google Sheet (True if none are left)"""
+    try:
+        client = get_google_sheets_client()
+        if client is None:
+            print("❌ Google Sheets client is None - no credentials found")
+            return False
+        
+        worksheet = _open_worksheet(client, sheet_name, worksheet_name)
+        header = worksheet.row_values(1)
+        target_rows = _find_sheet_rows(worksheet, header, key)
+        if not target_rows:
+            # Already gone (deleted by another scout or a repeated click): nothing left to do
+            print(f"ℹ️ No rows in {sheet_name} match {key}, nothing to delete")
+            return True
+        
+        # Contiguous matches become one range each, listed bottom-up so earlier ranges stay valid
+        ranges = []
+        for row_number in target_rows:
+            if ranges and ranges[-1][1] == row_number - 1:
+                ranges[-1][1] = row_number
+            else:
+                ranges.append([row_number, row_number])
+        requests = [
+            {'deleteDimension': {'range': {
+                'sheetId': worksheet.id,
+                'dimension': 'ROWS',
+                'startIndex': first_row - 1,
+                'endIndex': last_row
+            }}}
+            for first_row, last_row in reversed(ranges)
+        ]
+        
+        # One batch request computed from the single key read above, applied atomically by the API
+        worksheet.spreadsheet.batch_update({'requests': requests})
+        
+        print(f"✅ Deleted {len(target_rows)} row(s) from {sheet_name}")
+        return True
+    except Exception as e:
+        print(f"❌ Error in delete_google_sheet_rows: {e}")
+        import traceback
+        traceback.print_exc()
+        return False
+
+# Local SQLite store - write-through mirror of the three Google Sheets
+LOCAL_STORE_PATH = os.getenv('LOCAL_STORE_PATH', 'scouting_store.db')
+LOCAL_STORE_REFRESH_SECONDS = 20  # How long the local copy is served before checking Google Sheets for changes
+LOCAL_STORE_MAX_STALENESS_SECONDS = int(os.getenv('LOCAL_STORE_MAX_STALENESS_SECONDS', '600'))  # Older copies are refreshed before serving
+BACKGROUND_REFRESH_WORKERS = 2  # Sheets refreshed in the background at the same time
+LOCAL_STORE_INDEX_COLUMNS = ['PLAYER NAME', 'Player Name', 'Player', 'Team', 'Scout', 'Match']
+SYNC_COALESCE_SECONDS = 2  # Wait after a save so a burst of saves is flushed as one batch
+SYNC_IDLE_SECONDS = 30  # How often the sync worker re-checks the journal when nothing wakes it
+SYNC_RETRY_MAX_DELAY_SECONDS = 300  # Backoff cap for journal entries Google Sheets keeps rejecting
+SYNC_MAX_BATCH_ENTRIES = 50  # Pending appends to one sheet coalesced into a single API call
+SYNC_ID_COLUMN = 'Sync ID'  # Per-row id written with every appended row, so retried appends are never doubled
+SYNC_NO_CREDENTIALS_ERROR = 'sin credenciales de Google Sheets'
+SYNC_MAX_ATTEMPTS = 20  # Failed tries (about an hour and a half of backoff) before an entry is given up on
+SYNC_JOURNAL_KEEP_SECONDS = 24 * 3600  # How long synced and failed journal entries are kept for status display
+
+@st.cache_resource
+def get_local_store():
+    """Open the process-wide SQLite store that mirrors the Google Sheets"""
+    conn = sqlite3.connect(LOCAL_STORE_PATH, check_same_thread=False, isolation_level=None)
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.execute(
+        "CREATE TABLE IF NOT EXISTS sync_state ("
+        "table_name TEXT PRIMARY KEY, "
+        "synced_at REAL NOT NULL DEFAULT 0, "
+        "pending INTEGER NOT NULL DEFAULT 0)"
+    )
+    state_columns = [row[1] for row in conn.execute("PRAGMA table_info(sync_state)")]
+    if 'version' not in state_columns:
+        conn.execute("ALTER TABLE sync_state ADD COLUMN version TEXT")
+    if 'generation' not in state_columns:
+        conn.execute("ALTER TABLE sync_state ADD COLUMN generation INTEGER NOT NULL DEFAULT 0")
+    if 'refresh_error' not in state_columns:
+        conn.execute("ALTER TABLE sync_state ADD COLUMN refresh_error TEXT")
+    # Durable journal of local writes waiting to reach Google Sheets (survives restarts)
+    conn.execute(
+        "CREATE TABLE IF NOT EXISTS sync_journal ("
+        "id INTEGER PRIMARY KEY AUTOINCREMENT, "
+        "table_name TEXT NOT NULL, "
+        "sheet_name TEXT NOT NULL, "
+        "worksheet_name TEXT NOT NULL, "
+        "operation TEXT NOT NULL, "
+        "payload TEXT NOT NULL, "
+        "status TEXT NOT NULL DEFAULT 'pending', "
+        "attempts INTEGER NOT NULL DEFAULT 0, "
+        "next_attempt_at REAL NOT NULL DEFAULT 0, "
+        "last_error TEXT, "
+        "created_at REAL NOT NULL, "
+        "synced_at REAL)"
+    )
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_sync_journal_status ON sync_journal (status, table_name, id)")
+    print(f"✅ Local store ready: {LOCAL_STORE_PATH}")
+    return {'conn': conn, 'lock': threading.RLock()}
+
+@contextmanager
+def _local_transaction():
+    """Run a block of local store statements atomically"""
+    store = get_local_store()
+    with store['lock']:
+        conn = store['conn']
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            yield conn
+            conn.execute("COMMIT")
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+
+def _local_table_name(sheet_name, worksheet_name='Sheet1'):
+    """Name of the local table mirroring a worksheet"""
+    return re.sub(r'\W', '_', f"{sheet_name}__{worksheet_name}")
+
+def _quote_identifier(name):
+    """Quote a table or column name for SQLite"""
+    return '"' + str(name).replace('"', '""') + '"'
+
+def _local_value(value):
+    """Convert a single value to a type SQLite can store as-is (empty cells become '' like in Sheets)"""
+    if value is None or (not isinstance(value, str) and pd.isna(value)):
+        return ''
+    if isinstance(value, (bool, int, float, str)):
+        return value
+    if hasattr(value, 'item'):
+        # numpy scalars
+        return value.item()
+    return str(value)
+
+def _local_row_values(df):
+    """Convert DataFrame rows to tuples of SQLite-compatible values"""
+    return [tuple(_local_value(value) for value in row) for row in df.astype(object).itertuples(index=False, name=None)]
+
+def _local_table_columns(conn, table):
+    """Columns of a local table (empty list if the table doesn't exist)"""
+    return [row[1] for row in conn.execute(f"PRAGMA table_info({_quote_identifier(table)})")]
+
+def _ensure_local_columns(conn, table, columns):
+    """Create the local table or add the missing columns so `columns` can be written"""
+    if not columns:
+        return
+    existing = _local_table_columns(conn, table)
+    if not existing:
+        # Untyped columns keep numbers as numbers and text as text, like get_all_records
+        column_sql = ', '.join(f"{_quote_identifier(col)} DEFAULT ''" for col in columns)
+        conn.execute(f"CREATE TABLE {_quote_identifier(table)} ({column_sql})")
+    else:
+        existing_lower = {col.lower() for col in existing}
+        for col in columns:
+            if col.lower() not in existing_lower:
+                conn.execute(f"ALTER TABLE {_quote_identifier(table)} ADD COLUMN {_quote_identifier(col)} DEFAULT ''")
+                existing_lower.add(col.lower())
+    
+    # Indexes on player, team, scout and match for fast lookups
+    for col in columns:
+        if col in LOCAL_STORE_INDEX_COLUMNS:
+            index_name = _quote_identifier(_local_table_name(f"idx_{table}", col))
+            conn.execute(f"CREATE INDEX IF NOT EXISTS {index_name} ON {_quote_identifier(table)} ({_quote_identifier(col)})")
+
+def _insert_local_rows(conn, table, df):
+    """Insert DataFrame rows into a local table"""
+    columns = [str(col) for col in df.columns]
+    if not columns or df.empty:
+        return
+    column_sql = ', '.join(_quote_identifier(col) for col in columns)
+    placeholders = ', '.join('?' for _ in columns)
+    conn.executemany(
+        f"INSERT INTO {_quote_identifier(table)} ({column_sql}) VALUES ({placeholders})",
+        _local_row_values(df)
+    )
+
+def _local_sync_state(table):
+    """Sync bookkeeping for a local table: {'synced_at', 'pending', 'version', 'generation', 'refresh_error'} or None if never mirrored"""
+    store = get_local_store()
+    with store['lock']:
+        row = store['conn'].execute(
+            "SELECT synced_at, "
+            "(SELECT COUNT(*) FROM sync_journal WHERE table_name = sync_state.table_name AND status = 'pending'), "
+            "version, generation, refresh_error FROM sync_state WHERE table_name = ?", (table,)
+        ).fetchone()
+    if row is None:
+        return None
+    return {'synced_at': row[0], 'pending': row[1], 'version': row[2], 'generation': row[3], 'refresh_error': row[4]}
+
+def _touch_local_sync_state(table, conn=None, refresh_error=None):
+    """Mark a local table as just checked against Google Sheets, recording why the check failed (if it did)"""
+    statement = (
+        "INSERT INTO sync_state (table_name, synced_at, refresh_error) VALUES (?, ?, ?) "
+        "ON CONFLICT(table_name) DO UPDATE SET synced_at = excluded.synced_at, refresh_error = excluded.refresh_error"
+    )
+    if conn is not None:
+        conn.execute(statement, (table, time.time(), refresh_error))
+        return
+    store = get_local_store()
+    with store['lock']:
+        store['conn'].execute(statement, (table, time.time(), refresh_error))
+
+def _bump_local_generation(conn, table):
+    """Record that the local copy of a table changed, so snapshots built from it are rebuilt"""
+    conn.execute(
+        "INSERT INTO sync_state (table_name, synced_at, generation) VALUES (?, 0, 1) "
+        "ON CONFLICT(table_name) DO UPDATE SET generation = generation + 1",
+        (table,)
+    )
+
+def read_local_table(sheet_name, worksheet_name='Sheet1'):
+    """Read the local copy of a sheet (None if it has never been mirrored)"""
+    store = get_local_store()
+    table = _local_table_name(sheet_name, worksheet_name)
+    with store['lock']:
+        if not _local_table_columns(store['conn'], table):
+            return None if _local_sync_state(table) is None else pd.DataFrame()
+        return pd.read_sql_query(f"SELECT * FROM {_quote_identifier(table)} ORDER BY rowid", store['conn'])
+
+def write_local_table(df, sheet_name, worksheet_name='Sheet1', version=None, expected_generation=None):
+    """Atomically replace the local copy of a sheet with `df`, remembering the sheet version it came from
+    
+    With `expected_generation`, nothing is replaced (returns False) if the local copy changed meanwhile.
+    """
+    table = _local_table_name(sheet_name, worksheet_name)
+    with _local_transaction() as conn:
+        if expected_generation is not None:
+            current = conn.execute(
+                "SELECT generation, "
+                "(SELECT COUNT(*) FROM sync_journal WHERE table_name = ? AND status = 'pending') "
+                "FROM sync_state WHERE table_name = ?", (table, table)
+            ).fetchone()
+            if current is None or current[0] != expected_generation or current[1] > 0:
+                return False
+        conn.execute(f"DROP TABLE IF EXISTS {_quote_identifier(table)}")
+        _ensure_local_columns(conn, table, [str(col) for col in df.columns])
+        _insert_local_rows(conn, table, df)
+        _touch_local_sync_state(table, conn)
+        _bump_local_generation(conn, table)
+        conn.execute("UPDATE sync_state SET version = ? WHERE table_name = ?", (version, table))
+    return True
+
+def invalidate_local_store():
+    """Force every sheet to be re-read from Google Sheets on next access"""
+    store = get_local_store()
+    with store['lock']:
+        store['conn'].execute("UPDATE sync_state SET synced_at = 0, version = NULL")
+
+def _ensure_local_mirror(sheet_name, worksheet_name='Sheet1'):
+    """Load a sheet into the local store before the first local write to it"""
+    state = _local_sync_state(_local_table_name(sheet_name, worksheet_name))
+    if state is None or state['synced_at'] == 0:
+        read_google_sheet(sheet_name, worksheet_name)
+
+def _journal_write(conn, table, sheet_name, worksheet_name, operation, payload):
+    """Record a local write in the sync journal and return its id"""
+    cursor = conn.execute(
+        "INSERT INTO sync_journal (table_name, sheet_name, worksheet_name, operation, payload, created_at) "
+        "VALUES (?, ?, ?, ?, ?, ?)",
+        (table, sheet_name, worksheet_name, operation, json.dumps(payload), time.time())
+    )
+    return cursor.lastrowid
+
+def _next_sync_batch():
+    """Oldest due journal work: (entries, 0) or (None, seconds until something is due)
+    
+    Entries are flushed in order per sheet; a run of pending appends to the same sheet is one batch.
+    """
+    store = get_local_store()
+    now = time.time()
+    with store['lock']:
+        conn = store['conn']
+        heads = conn.execute(
+            "SELECT j.id, j.table_name, j.operation, j.next_attempt_at FROM sync_journal j "
+            "JOIN (SELECT MIN(id) AS id FROM sync_journal WHERE status = 'pending' GROUP BY table_name) h ON h.id = j.id "
+            "ORDER BY j.id"
+        ).fetchall()
+        due = [head for head in heads if head[3] <= now]
+        if not due:
+            wait_seconds = min((head[3] - now for head in heads), default=SYNC_IDLE_SECONDS)
+            return None, min(max(wait_seconds, 0.5), SYNC_IDLE_SECONDS)
+        
+        head_id, table, operation, _ = due[0]
+        columns = "id, sheet_name, worksheet_name, operation, payload, attempts"
+        if operation != 'append':
+            return conn.execute(f"SELECT {columns} FROM sync_journal WHERE id = ?", (head_id,)).fetchall(), 0
+        
+        # Coalesce the appends queued for this sheet up to the next update/delete
+        entries = []
+        for entry in conn.execute(
+            f"SELECT {columns} FROM sync_journal WHERE table_name = ? AND status = 'pending' ORDER BY id LIMIT ?",
+            (table, SYNC_MAX_BATCH_ENTRIES)
+        ):
+            if entry[3] != 'append':
+                break
+            entries.append(entry)
+        return entries, 0
+
+def _apply_sync_batch(entries):
+    """Send one batch of journal entries to Google Sheets (True if it was written)"""
+    _, sheet_name, worksheet_name, operation, _, _ = entries[0]
+    payloads = [json.loads(entry[4]) for entry in entries]
+    if operation == 'append':
+        df_batch = pd.concat(
+            [pd.DataFrame(payload['rows'], columns=payload['columns']) for payload in payloads],
+            ignore_index=True, sort=False
+        )
+        # Entries that were tried before may have been written already: skip the rows the sheet has
+        retrying = any(entry[5] > 0 for entry in entries)
+        return append_to_google_sheet(df_batch, sheet_name, worksheet_name, SYNC_ID_COLUMN if retrying else None)
+    if operation == 'update':
+        return update_google_sheet_rows(sheet_name, payloads[0]['key'], payloads[0]['updates'], worksheet_name)
+    if operation == 'delete':
+        return delete_google_sheet_rows(sheet_name, payloads[0]['key'], worksheet_name)
+    print(f"❌ Unknown sync operation: {operation}")
+    return True
+
+def _finish_sync_batch(entries, outcome, error=None):
+    """Record a batch outcome: 'synced', 'failed' (never retried) or 'retry' (exponential backoff)
+    
+    Failed entries stop counting as pending, so they no longer block the sheet's queue or its refreshes.
+    """
+    ids = [entry[0] for entry in entries]
+    placeholders = ', '.join('?' for _ in ids)
+    now = time.time()
+    error = error or 'Google Sheets rejected the write'
+    with _local_transaction() as conn:
+        if outcome == 'synced':
+            conn.execute(
+                f"UPDATE sync_journal SET status = 'synced', synced_at = ?, last_error = NULL WHERE id IN ({placeholders})",
+                [now] + ids
+            )
+            conn.execute(
+                "DELETE FROM sync_journal WHERE status != 'pending' AND COALESCE(synced_at, created_at) < ?",
+                (now - SYNC_JOURNAL_KEEP_SECONDS,)
+            )
+        elif outcome == 'failed':
+            conn.execute(
+                f"UPDATE sync_journal SET status = 'failed', attempts = attempts + 1, last_error = ? WHERE id IN ({placeholders})",
+                [error] + ids
+            )
+        else:
+            delay = min(2 ** max(entry[5] for entry in entries), SYNC_RETRY_MAX_DELAY_SECONDS)
+            conn.execute(
+                f"UPDATE sync_journal SET attempts = attempts + 1, next_attempt_at = ?, last_error = ? WHERE id IN ({placeholders})",
+                [now + delay, error] + ids
+            )
+            # Dead-letter entries that keep failing so later saves to the sheet can go through
+            conn.execute(
+                f"UPDATE sync_journal SET status = 'failed' WHERE id IN ({placeholders}) AND attempts >= ?",
+                ids + [SYNC_MAX_ATTEMPTS]
+            )
+
+def _sheets_sync_worker(wake_event):
+    """Flush the sync journal to Google Sheets in the background, in order per sheet"""
+    while True:
+        wake_event.clear()
+        try:
+            entries, wait_seconds = _next_sync_batch()
+        except Exception as e:
+            print(f"❌ Error reading sync journal: {e}")
+            entries, wait_seconds = None, SYNC_IDLE_SECONDS
+        
+        if not entries:
+            if wake_event.wait(wait_seconds):
+                # A save just happened: give the rest of the burst a moment to land in the journal
+                time.sleep(SYNC_COALESCE_SECONDS)
+            continue
+        
+        sheet_name, operation = entries[0][1], entries[0][3]
+        error = None
+        try:
+            with sheets_priority('save'):
+                outcome = 'synced' if _apply_sync_batch(entries) else 'retry'
+        except SheetRowsNotFound as e:
+            # The row was deleted or changed in the sheet: retrying can never succeed
+            outcome, error = 'failed', str(e)
+        except Exception as e:
+            outcome, error = 'retry', str(e)
+        if outcome == 'retry' and error is None and get_google_sheets_client() is None:
+            error = SYNC_NO_CREDENTIALS_ERROR
+        
+        if outcome == 'synced':
+            print(f"🔄 Synced {len(entries)} {operation}(s) to {sheet_name}")
+        elif outcome == 'failed':
+            print(f"❌ Could not sync {operation} to {sheet_name}: {error}")
+        else:
+            print(f"⚠️ Could not sync {operation} to {sheet_name}, retrying later")
+        try:
+            _finish_sync_batch(entries, outcome, error)
+        except Exception as e:
+            print(f"❌ Error updating sync journal: {e}")
+            time.sleep(SYNC_IDLE_SECONDS)
+
+@st.cache_resource
+def get_sheets_sync_worker():
+    """Start the background worker that flushes the sync journal; returns the event that wakes it"""
+    wake_event = threading.Event()
+    worker = threading.Thread(target=_sheets_sync_worker, args=(wake_event,), name='sheets-sync', daemon=True)
+    worker.start()
+    return wake_event
+
+def get_sync_status(journal_ids):
+    """Sync status of journal entries: {id: {'status', 'attempts', 'last_error'}} (pruned entries are synced)"""
+    if not journal_ids:
+        return {}
+    store = get_local_store()
+    placeholders = ', '.join('?' for _ in journal_ids)
+    with store['lock']:
+        rows = store['conn'].execute(
+            f"SELECT id, status, attempts, last_error FROM sync_journal WHERE id IN ({placeholders})",
+            list(journal_ids)
+        ).fetchall()
+    status = {journal_id: {'status': 'synced', 'attempts': 0, 'last_error': None} for journal_id in journal_ids}
+    for journal_id, entry_status, attempts, last_error in rows:
+        status[journal_id] = {'status': entry_status, 'attempts': attempts, 'last_error': last_error}
+    return status
+
+def save_sheet_rows(df_new, sheet_name, worksheet_name='Sheet1'):
+    """Save new rows to the local store now and append them to Google Sheets in the background (journal id, False on error)"""
+    try:
+        if df_new.empty:
+            return True
+        _ensure_local_mirror(sheet_name, worksheet_name)
+        table = _local_table_name(sheet_name, worksheet_name)
+        df_new = df_new.assign(**{SYNC_ID_COLUMN: [uuid.uuid4().hex for _ in range(len(df_new))]})
+        columns = [str(col) for col in df_new.columns]
+        with _local_transaction() as conn:
+            _ensure_local_columns(conn, table, columns)
+            _insert_local_rows(conn, table, df_new)
+            _bump_local_generation(conn, table)
+            journal_id = _journal_write(conn, table, sheet_name, worksheet_name, 'append', {
+                'columns': columns,
+                'rows': _local_row_values(df_new)
+            })
+        get_sheets_sync_worker().set()
+        print(f"💾 Saved {len(df_new)} rows locally, syncing to {sheet_name}...")
+        return journal_id
+    except Exception as e:
+        print(f"❌ Error in save_sheet_rows: {e}")
+        import traceback
+        traceback.print_exc()
+        return False
+
+def update_sheet_rows(sheet_name, key, updates, worksheet_name='Sheet1'):
+    """Update matching rows in the local store now and in Google Sheets in the background (journal id, False on error)"""
+    try:
+        if not updates:
+            return True
+        _ensure_local_mirror(sheet_name, worksheet_name)
+        table = _local_table_name(sheet_name, worksheet_name)
+        columns = [str(col) for col in list(key) + list(updates)]
+        with _local_transaction() as conn:
+            _ensure_local_columns(conn, table, columns)
+            set_sql = ', '.join(f"{_quote_identifier(col)} = ?" for col in updates)
+            where_sql = ' AND '.join(f"{_quote_identifier(col)} = ?" for col in key)
+            params = [_local_value(value) for value in updates.values()] + [_local_value(value) for value in key.values()]
+            conn.execute(f"UPDATE {_quote_identifier(table)} SET {set_sql} WHERE {where_sql}", params)
+            _bump_local_generation(conn, table)
+            journal_id = _journal_write(conn, table, sheet_name, worksheet_name, 'update', {
+                'key': {col: _local_value(value) for col, value in key.items()},
+                'updates': {col: _local_value(value) for col, value in updates.items()}
+            })
+        get_sheets_sync_worker().set()
+        return journal_id
+    except Exception as e:
+        print(f"❌ Error in update_sheet_rows: {e}")
+        import traceback
+        traceback.print_exc()
+        return False
+
+def delete_sheet_rows(sheet_name, key, worksheet_name='Sheet1'):
+    """Delete matching rows from the local store now and from Google Sheets in the background (journal id, False on error)"""
+    try:
+        _ensure_local_mirror(sheet_name, worksheet_name)
+        table = _local_table_name(sheet_name, worksheet_name)
+        with _local_transaction() as conn:
+            _ensure_local_columns(conn, table, [str(col) for col in key])
+            where_sql = ' AND '.join(f"{_quote_identifier(col)} = ?" for col in key)
+            conn.execute(f"DELETE FROM {_quote_identifier(table)} WHERE {where_sql}", [_local_value(value) for value in key.values()])
+            _bump_local_generation(conn, table)
+            journal_id = _journal_write(conn, table, sheet_name, worksheet_name, 'delete', {
+                'key': {col: _local_value(value) for col, value in key.items()}
+            })
+        get_sheets_sync_worker().set()
+        return journal_id
+    except Exception as e:
+        print(f"❌ Error in delete_sheet_rows: {e}")
+        import traceback
+        traceback.print_exc()
+        return False
+
+# Save status - the saves of this session and whether they reached Google Sheets
+RECENT_SAVES_SHOWN = 5
+
+def track_save(journal_id, label):
+    """Remember a save of this session so its sync status is shown in the sidebar"""
+    if isinstance(journal_id, bool):
+        return
+    recent_saves = st.session_state.setdefault('recent_saves', [])
+    recent_saves.append({'id': journal_id, 'label': label})
+    del recent_saves[:-RECENT_SAVES_SHOWN]
+
+def show_save_status():
+    """Sidebar list of this session's recent saves and their sync status"""
+    recent_saves = st.session_state.get('recent_saves', [])
+    if not recent_saves:
+        return
+    try:
+        status = get_sync_status([save['id'] for save in recent_saves])
+    except Exception as e:
+        print(f"❌ Error reading sync status: {e}")
+        return
+    
+    st.markdown("**🔄 Sincronización / Sync**")
+    local_only = get_google_sheets_client() is None
+    if local_only and any(entry['status'] == 'pending' for entry in status.values()):
+        st.warning("💾 Guardado solo en local: no hay credenciales de Google Sheets, los informes no se están sincronizando.")
+    for save in reversed(recent_saves):
+        entry = status[save['id']]
+        if entry['status'] == 'synced':
+            st.caption(f"✅ {save['label']}")
+        elif entry['status'] == 'pending' and local_only:
+            st.caption(f"💾 {save['label']} - guardado solo en local, sin sincronizar")
+        elif entry['status'] == 'failed':
+            st.caption(f"❌ {save['label']} - no se guardó en Google Sheets: {entry['last_error']}")
+        elif entry['attempts'] == 0:
+            st.caption(f"⏳ {save['label']} - en cola")
+        else:
+            st.caption(f"⚠️ {save['label']} - reintento {entry['attempts']}: {entry['last_error']}")
+
+# Player database snapshot - built once per data version and shared by every tab
+PLAYER_SHEET = 'WorldCupU17Data'
+PLAYER_FALLBACK_EXCEL = 'dbworldcup17.xlsx'
+PLAYER_CATEGORY_COLUMNS = ['Team', 'POS', 'CLUB']
+PLAYER_DERIVED_COLUMNS = ['player_key', 'Birth Year', 'pos_order']  # Added by the snapshot, not in the sheet
+POSITION_ORDER = {'GK': 1, 'RB': 2, 'CB': 3, 'LB': 4, 'DM': 5, 'CM': 6, 'CAM': 7, 'RW': 8, 'LW': 9, 'ST': 10}
+
+def normalize_player_name(name):
+    """Canonical player key: no accents, lower case, single spaces"""
+    if name is None or (not isinstance(name, str) and pd.isna(name)):
+        return ''
+    text = unicodedata.normalize('NFD', str(name))
+    text = ''.join(c for c in text if unicodedata.category(c) != 'Mn')
+    return ' '.join(text.lower().split())
+
+def _canonical_player_columns(columns):
+    """Map the player database's column names to the ones used across the app"""
+    rename = {}
+    
+    def find(canonical, matches):
+        if canonical in columns:
+            return
+        for col in columns:
+            if col not in rename and matches(str(col).lower()):
+                rename[col] = canonical
+                return
+    
+    find('PLAYER NAME', lambda col: 'player' in col or 'nombre' in col or col == 'name')
+    find('Team', lambda col: col in ['team', 'equipo', 'selección'])
+    find('POS', lambda col: col == 'pos' or 'position' in col or 'posición' in col)
+    find('CLUB', lambda col: col == 'club')
+    find('DOB', lambda col: col in ['dob', 'birth date', 'fecha de nacimiento'])
+    return rename
+
+@st.cache_resource(max_entries=2, show_spinner=False)
+def _build_player_snapshot(generation):
+    """Build the typed player snapshot for one generation of the local player table"""
+    df = None
+    if generation is not None:
+        df = read_local_table(PLAYER_SHEET)
+    if df is None or df.empty:
+        # Fallback to local Excel if Google Sheets has never been loaded
+        try:
+            df = pd.read_excel(PLAYER_FALLBACK_EXCEL)
+        except Exception as e:
+            print(f"❌ Error loading {PLAYER_FALLBACK_EXCEL}: {e}")
+            return pd.DataFrame()
+    
+    df = df.rename(columns=_canonical_player_columns(list(df.columns)))
+    if 'PLAYER NAME' in df.columns:
+        df['player_key'] = df['PLAYER NAME'].map(normalize_player_name)
+    birth_col = 'DOB' if 'DOB' in df.columns else 'Año' if 'Año' in df.columns else None
+    if birth_col:
+        birth_year = df[birth_col].astype(str).str.extract(r'(\d{4})', expand=False)
+        df['Birth Year'] = pd.to_numeric(birth_year, errors='coerce').astype('Int64')
+    if 'POS' in df.columns:
+        df['pos_order'] = df['POS'].astype(str).str.strip().map(POSITION_ORDER).fillna(99).astype(int)
+    for col in PLAYER_CATEGORY_COLUMNS:
+        if col in df.columns:
+            df[col] = df[col].astype('category')
+    print(f"✅ Player snapshot built: {len(df)} players (generation {generation})")
+    return df
+
+def get_player_snapshot():
+    """Shared player database (read-only: copy before modifying)"""
+    try:
+        return _build_player_snapshot(refresh_sheet(PLAYER_SHEET))
+    except Exception as e:
+        print(f"❌ Error loading player snapshot: {e}")
+        return pd.DataFrame()
+
+def _index_int(value):
+    """Integer value of a player database cell, or None"""
+    try:
+        return int(float(value)) if pd.notna(value) and str(value).strip() else None
+    except (TypeError, ValueError):
+        return None
+
+@st.cache_resource(max_entries=2, show_spinner=False)
+def _build_player_index(generation):
+    """Build the normalized name -> autofill record index for one generation of the player table"""
+    df = _build_player_snapshot(generation)
+    if df.empty or 'player_key' not in df.columns:
+        return {}
+    
+    index = {}
+    birth_years = df['Birth Year'] if 'Birth Year' in df.columns else pd.Series(pd.NA, index=df.index)
+    positions = df['POS'].astype(str) if 'POS' in df.columns else pd.Series('', index=df.index)
+    numbers = df['Num'] if 'Num' in df.columns else pd.Series('', index=df.index)
+    for key, birth_year, position, number in zip(df['player_key'], birth_years, positions, numbers):
+        # First occurrence wins, like the old table scan
+        if key and key not in index:
+            index[key] = {
+                'birth_year': None if pd.isna(birth_year) else int(birth_year),
+                'position': position.strip() if position.strip() and position != 'nan' else None,
+                'number': _index_int(number),
+            }
+    return index
+
+def lookup_player(player_name):
+    """Autofill record {'birth_year', 'position', 'number'} for a player name, or None if not in the database"""
+    try:
+        return _build_player_index(refresh_sheet(PLAYER_SHEET)).get(normalize_player_name(player_name))
+    except Exception as e:
+        print(f"❌ Error looking up {player_name}: {e}")
+        return None
+
+# Conclusions - parsed once into an ordered code, used for filters, badges and priorities
+CONCLUSION_CODES = ['other', 'B', 'B+', 'A']  # Worst to best
+CONCLUSION_FILTER_CODES = {
+    'A - Firmar': 'A', 'B+ - Seguir para Firmar': 'B+', 'B - Seguir': 'B',
+    'A - Firmar (Sign)': 'A', 'B+ - Seguir para Firmar (Follow to Sign)': 'B+', 'B - Seguir (Follow)': 'B',
+}
+CONCLUSION_STATUS_EMOJI = {4: "⭐️", 3: "🟢"}  # Anything else with a report gets ☑️
+CONCLUSION_BADGES = {
+    'A': ('#4CAF50', 'A - FIRMAR'),  # Green
+    'B+': ('#2196F3', 'B+ - SEGUIR PARA FIRMAR'),  # Blue
+    'B': ('#FF9800', 'B - SEGUIR'),  # Orange
+}
+CONCLUSION_BUTTON_CLASSES = {'A': '', 'B+': ' blue', 'B': ' orange'}  # Green is the default
+
+def classify_conclusions(conclusions):
+    """Parse a Series of conclusions into the ordered categorical code (NaN when empty)"""
+    text = conclusions.fillna('').astype(str).str.strip().str.upper()
+    codes = pd.Series(None, index=conclusions.index, dtype=object)
+    codes = codes.mask((text != '') & (text != 'NAN'), 'other')
+    codes = codes.mask(text.str.match(r'B[\s\-]'), 'B')
+    codes = codes.mask(text.str.contains(r'B ?\+', regex=True) | text.str.contains('SEGUIR PARA FIRMAR', regex=False), 'B+')
+    codes = codes.mask(text.str.match(r'A[\s\-]'), 'A')
+    return codes.astype(pd.CategoricalDtype(CONCLUSION_CODES, ordered=True))
+
+def add_conclusion_codes(df):
+    """Add the 'Conclusion Code' column to a reports DataFrame and return it"""
+    if not df.empty and 'Conclusion' in df.columns and 'Conclusion Code' not in df.columns:
+        df['Conclusion Code'] = classify_conclusions(df['Conclusion'])
+    return df
+
+def conclusion_priority(codes):
+    """Rank a Series of conclusion codes: 4=A, 3=B+, 2=B, 1=other, 0=empty"""
+    return pd.Series(codes.cat.codes.to_numpy() + 1, index=codes.index)
+
+def build_player_report_index(df_reports, df_individual_reports):
+    """Group match and individual reports by player key in one pass: {'match', 'individual', 'codes', 'best'}"""
+    index = {'match': {}, 'individual': {}, 'codes': pd.DataFrame(columns=['player_key', 'code']), 'best': {}}
+    codes = []
+    for kind, df, player_col in (('match', df_reports, 'Player Name'), ('individual', df_individual_reports, 'Player')):
+        if df is None or df.empty or player_col not in df.columns:
+            continue
+        keys = df[player_col].map(normalize_player_name)
+        # Row positions of each player's reports
+        index[kind] = keys.groupby(keys, sort=False).indices
+        if 'Conclusion Code' in df.columns:
+            codes.append(pd.DataFrame({'player_key': keys.to_numpy(), 'code': df['Conclusion Code'].to_numpy()}))
+    if codes:
+        index['codes'] = pd.concat(codes, ignore_index=True)
+        index['codes']['code'] = index['codes']['code'].astype(pd.CategoricalDtype(CONCLUSION_CODES, ordered=True))
+        priorities = conclusion_priority(index['codes']['code'])
+        index['best'] = priorities.groupby(index['codes']['player_key'].to_numpy()).max().to_dict()
+    return index
+
+def players_with_conclusion(report_index, code):
+    """Player keys with at least one report of the given conclusion code"""
+    report_codes = report_index['codes']
+    return report_codes.loc[report_codes['code'] == code, 'player_key'].unique().tolist()
+
+def player_reports_from_index(report_index, kind, df, player_key):
+    """A player's reports of one kind ('match' or 'individual') from the report index"""
+    rows = report_index[kind].get(player_key)
+    return df.iloc[rows] if rows is not None else pd.DataFrame()
+
+# Position rubrics - versioned registry with stable item codes; reports store the codes ("CB3"), not the texts
+POSITION_RUBRIC_VERSION = 1
+POSITION_RUBRIC_ITEMS = {
+    'GK1': 'Reflejos & 1v1. fiabilidad bajo palos',
+    'GK2': 'Juego aéreo. autoridad en centros y balones divididos',
+    'GK3': 'Juego con los pies. precisión en corto y largo',
+    'GK4': 'Mando y comunicación. organiza la defensa',
+    'GK5': 'Fiabilidad mental & seguridad. concentración, serenidad, transmitir confianza',
+    'GK6': 'Sentido del juego (posicionamiento & lectura). anticipación, sobriedad, elegir bien cuándo intervenir',
+    'CB1': 'Duelos defensivos (1v1 + potencia física)',
+    'CB2': 'Fiabilidad mental. concentración, serenidad bajo presión',
+    'CB3': 'Juego aéreo y defensa de área (Def)',
+    'CB4': 'Posicionamiento & Organización. orden en la línea defensiva',
+    'CB5': 'Salida de balón (corto, largo y conducción)',
+    'CB6': 'Anticipación & Coberturas. lectura de juego, intercepciones',
+    'CB7': 'Velocidad y capacidad de giro',
+    'FB1': 'Velocidad & Resistencia (ida/vuelta)',
+    'FB2': 'Fiabilidad mental. disciplina, concentración, equilibrio',
+    'FB3': '1v1 defensivo + tapar centros',
+    'FB4': 'Timing en incorporaciones. saber cuándo doblar y cuándo quedarse',
+    'FB5': 'Centros & pase interior',
+    'FB6': 'Posicionamiento defensivo (segundo palo)',
+    'DM1': 'Coberturas, 2das jugadas & posicionamiento. abarcar campo, equilibrio',
+    'DM2': 'Juego corto - largo',
+    'DM3': 'Recuperación & duelos. intercepciones, tackles',
+    'DM4': 'Mando & comunicación. liderazgo silencioso, ordenar bloque',
+    'DM5': 'Físico y mentalidad destacado',
+    'DM6': 'Juego aéreo',
+    'CM1': 'Creatividad & visión. pase vertical, asociación, generar ocasiones',
+    'CM2': 'Dinamismo. capacidad de girar, romper líneas, movilidad constante',
+    'CM3': 'Llegada & finalización. cifras, goles, asistencias',
+    'CM4': 'Trabajo defensivo. recuperación, balance ofensivo-defensivo',
+    'CM5': 'Duelos & presencia física',
+    'CM6': 'Personalidad competitiva - consistencia. liderazgo, carácter para asumir balón',
+    'CAM1': 'Creatividad, asociación & último pase',
+    'CAM2': 'Compromiso defensivo',
+    'CAM3': 'Movilidad entre líneas. espalda de pivotes',
+    'CAM4': 'Toma de decisión. diferencial por sí mismo',
+    'CAM5': 'Definición. gol + tiro media distancia',
+    'CAM6': '1v1 ofensivo. romper líneas con balón',
+    'CAM7': 'Llegada - desmarques',
+    'W1': 'Velocidad & aceleración',
+    'W2': '1v1 ofensivo. generar ocasiones por sí mismo',
+    'W3': 'Centros & calidad de servicio',
+    'W4': 'Gol & asistencias. volumen ofensivo',
+    'W5': 'Trabajo defensivo. retorno + pressing',
+    'W6': 'Personalidad, consistencia & toma de decisiones',
+    'W7': 'Juego asociativo',
+    'ST1': 'GOL. definición fuera y dentro del área (pie + cabeza)',
+    'ST2': 'Capacidad de generar ocasiones por sí mismo',
+    'ST3': 'Juego de espaldas & descargas. fijar centrales',
+    'ST4': 'Movilidad ofensiva. atacar espacios, dinámico',
+    'ST5': 'Juego aéreo ofensivo',
+    'ST6': 'Trabajo defensivo. primer defensor'
+}
+POSITION_RUBRICS = {
+    'GK': ['GK1', 'GK2', 'GK3', 'GK4', 'GK5', 'GK6'],
+    'CB': ['CB1', 'CB2', 'CB3', 'CB4', 'CB5', 'CB6', 'CB7'],
+    'RB': ['FB1', 'FB2', 'FB3', 'FB4', 'FB5', 'FB6'],
+    'LB': ['FB1', 'FB2', 'FB3', 'FB4', 'FB5', 'FB6'],
+    'DM': ['DM1', 'DM2', 'DM3', 'DM4', 'DM5', 'DM6'],
+    'CM': ['CM1', 'CM2', 'CM3', 'CM4', 'CM5', 'CM6'],
+    'CAM': ['CAM1', 'CAM2', 'CAM3', 'CAM4', 'CAM5', 'CAM6', 'CAM7'],
+    'RW': ['W1', 'W2', 'W3', 'W4', 'W5', 'W6', 'W7'],
+    'LW': ['W1', 'W2', 'W3', 'W4', 'W5', 'W6', 'W7'],
+    'ST': ['ST1', 'ST2', 'ST3', 'ST4', 'ST5', 'ST6']
+}
+# Item texts retired by rubric edits, kept so old report columns still migrate to their code
+POSITION_RUBRIC_ALIASES = {}
+
+# Spanish position names (individual reports) to position codes and display order
+POSITION_NAME_CODES = {
+    'Portero': 'GK',
+    'Defensa Central': 'CB',
+    'Lateral Derecho': 'RB',
+    'Lateral Izquierdo': 'LB',
+    'Pivote': 'DM',
+    'Mediocentro': 'CM',
+    'Mediocentro Ofensivo': 'CAM',
+    'Extremo Derecho': 'RW',
+    'Extremo Izquierdo': 'LW',
+    'Delantero Centro': 'ST'
+}
+POSITION_NAME_ORDER = {'Portero': 1, 'Lateral Derecho': 2, 'Lateral Izquierdo': 3, 'Defensa Central': 4,
+                       'Pivote': 5, 'Mediocentro': 6, 'Mediocentro Ofensivo': 7,
+                       'Extremo Derecho': 8, 'Extremo Izquierdo': 9, 'Delantero Centro': 10}
+
+@st.cache_resource
+def _rubric_column_codes():
+    """Item text (current and retired) -> item code, built once per process"""
+    column_codes = {text: code for code, text in POSITION_RUBRIC_ITEMS.items()}
+    column_codes.update(POSITION_RUBRIC_ALIASES)
+    return column_codes
+
+def rubric_items(position_code):
+    """(code, text) pairs of the rubric for a position code, empty if there is none"""
+    return [(code, POSITION_RUBRIC_ITEMS[code]) for code in POSITION_RUBRICS.get(position_code, [])]
+
+def migrate_rubric_columns(df):
+    """Fold report columns named after item texts into their item code columns"""
+    if df.empty:
+        return df
+    column_codes = _rubric_column_codes()
+    legacy_columns = [col for col in df.columns if col in column_codes]
+    if not legacy_columns:
+        return df
+    df = df.copy()
+    for col in legacy_columns:
+        code = column_codes[col]
+        legacy = df.pop(col).fillna('').astype(str)
+        if code in df.columns:
+            current = df[code].fillna('').astype(str)
+            df[code] = current.where(current != '', legacy)
+        else:
+            df[code] = legacy
+    return df
+
+def label_rubric_columns(df):
+    """Rename item code columns back to their item text, for exports people read"""
+    return df.rename(columns={col: POSITION_RUBRIC_ITEMS[col] for col in df.columns if col in POSITION_RUBRIC_ITEMS})
+
+# Player photos - one directory scan, keyed by normalized name
+PLAYER_PHOTOS_DIR = 'player_photos'
+PLAYER_PHOTO_EXTENSIONS = ['.jpg', '.png', '.jpeg']  # Preferred first (.jpg is the default save format)
+
+def photo_key(player_name):
+    """Photo lookup key: accent-folded, lower case, letters and digits only (Obed_Vargas.jpg == Obed Vargas)"""
+    return re.sub(r'[^a-z0-9]', '', normalize_player_name(player_name))
+
+def _scan_photo_directory():
+    """Build {photo_key: path} from a single scan of the photo directory"""
+    index = {}
+    with os.scandir(PLAYER_PHOTOS_DIR) as entries:
+        for entry in sorted(entries, key=lambda e: e.name):
+            stem, ext = os.path.splitext(entry.name)
+            ext = ext.lower()
+            if ext not in PLAYER_PHOTO_EXTENSIONS or not entry.is_file():
+                continue
+            key = photo_key(stem)
+            current = index.get(key)
+            if current is None or PLAYER_PHOTO_EXTENSIONS.index(ext) < PLAYER_PHOTO_EXTENSIONS.index(os.path.splitext(current)[1].lower()):
+                index[key] = os.path.join(PLAYER_PHOTOS_DIR, entry.name)
+    print(f"📸 Photo index built: {len(index)} photos")
+    return index
+
+@st.cache_resource
+def _photo_index_state():
+    """Process-wide photo index and the directory mtime it was built from"""
+    return {'lock': threading.Lock(), 'mtime': None, 'index': {}}
+
+def get_photo_index():
+    """{photo_key: path} for every player photo, rescanned only when the directory changes"""
+    state = _photo_index_state()
+    try:
+        mtime = os.stat(PLAYER_PHOTOS_DIR).st_mtime_ns
+    except OSError:
+        return {}
+    with state['lock']:
+        if state['mtime'] != mtime:
+            try:
+                state['index'] = _scan_photo_directory()
+                state['mtime'] = mtime
+            except OSError as e:
+                print(f"❌ Error scanning {PLAYER_PHOTOS_DIR}: {e}")
+        return state['index']
+
+def refresh_photo_index():
+    """Rebuild the photo index on next lookup (call after saving a photo)"""
+    state = _photo_index_state()
+    with state['lock']:
+        state['mtime'] = None
+
+def find_player_photo(player_name):
+    """Path of a player's photo from the photo index (one dict lookup by photo_key), or None"""
+    if not player_name:
+        return None
+    return get_photo_index().get(photo_key(player_name))
+
+# Static images - served by Streamlit from ./static under hashed names, so browsers cache them
+STATIC_IMAGE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'static', 'img')
+STATIC_IMAGE_URL = 'app/static/img'
+
+def encode_png(img):
+    """Encode a PIL image as PNG bytes (keeping transparency when it has any)"""
+    buffered = io.BytesIO()
+    if img.mode not in ('RGBA', 'LA', 'P'):
+        img = img.convert('RGB')
+    img.save(buffered, format="PNG")
+    return buffered.getvalue()
+
+def publish_static_image(png_bytes, name=None):
+    """Serve PNG bytes as a static file and return its URL (a data URI if it can't be written)"""
+    name = name or hashlib.sha256(png_bytes).hexdigest()[:24]
+    file_path = os.path.join(STATIC_IMAGE_DIR, f"{name}.png")
+    try:
+        if not os.path.exists(file_path):
+            os.makedirs(STATIC_IMAGE_DIR, exist_ok=True)
+            temp_path = f"{file_path}.{threading.get_ident()}.tmp"
+            with open(temp_path, 'wb') as f:
+                f.write(png_bytes)
+            os.replace(temp_path, file_path)
+        return f"{STATIC_IMAGE_URL}/{name}.png"
+    except OSError as e:
+        print(f"⚠️ Could not publish static image, embedding it instead: {e}")
+        return 'data:image/png;base64,' + base64.b64encode(png_bytes).decode()
+
+# Photo thumbnails - rendered once into static files, URLs kept in memory (LRU)
+PHOTO_THUMBNAIL_MEMORY_ITEMS = 512
+CARD_PHOTO_SIZE = (120, 120)  # DATABASE player cards
+REPORT_PHOTO_SIZE = (300, 300)  # Individual report cards (shown at 150px)
+
+@st.cache_resource
+def _thumbnail_memory_cache():
+    """Process-wide LRU of thumbnail URLs"""
+    return {'lock': threading.Lock(), 'items': OrderedDict()}
+
+def get_photo_thumbnail_src(path, size=CARD_PHOTO_SIZE):
+    """Image src of a local photo's thumbnail, keyed by path, mtime and size ('' if it can't be read)"""
+    try:
+        stat = os.stat(path)
+    except OSError:
+        return ''
+    key = f"{os.path.abspath(path)}|{stat.st_mtime_ns}|{stat.st_size}|{size[0]}x{size[1]}"
+    cache = _thumbnail_memory_cache()
+    with cache['lock']:
+        src = cache['items'].get(key)
+        if src is not None:
+            cache['items'].move_to_end(key)
+            return src
+    
+    # The static file name changes with the photo, so a file on disk is always current
+    name = 'thumb_' + hashlib.sha1(key.encode('utf-8')).hexdigest()[:24]
+    if os.path.exists(os.path.join(STATIC_IMAGE_DIR, f"{name}.png")):
+        src = f"{STATIC_IMAGE_URL}/{name}.png"
+    else:
+        try:
+            from PIL import Image
+            with Image.open(path) as img:
+                img.thumbnail(size, Image.Resampling.LANCZOS)
+                src = publish_static_image(encode_png(img), name)
+        except Exception as e:
+            print(f"❌ Error creating thumbnail for {path}: {e}")
+            return ''
+    
+    with cache['lock']:
+        cache['items'][key] = src
+        cache['items'].move_to_end(key)
+        while len(cache['items']) > PHOTO_THUMBNAIL_MEMORY_ITEMS:
+            cache['items'].popitem(last=False)
+    return src
+
+# Brand assets - logos and scout photos, published once per process in every size in use
+BRAND_ASSETS = {
+    'alnassr.png': [(30, 30), (40, 40), (50, 50), (60, 60), None],
+    'fwcu17.webp': [(40, 40)],
+    'juan.png': [(50, 50), (60, 60)],
+    'rafa.png': [(50, 50), (60, 60)],
+    'alvaro.png': [(50, 50), (60, 60)],
+}
+
+def _publish_brand_asset(path, size):
+    """Static URL of an image, thumbnailed to `size` (None keeps the original size)"""
+    from PIL import Image
+    with Image.open(path) as img:
+        img = img.copy()
+    if size:
+        img.thumbnail(size)
+    return publish_static_image(encode_png(img))
+
+@st.cache_resource
+def get_brand_assets():
+    """Preload every registered brand asset: {'lock', 'uris': {(path, size): URL}}"""
+    assets = {}
+    for path, sizes in BRAND_ASSETS.items():
+        for size in sizes:
+            try:
+                assets[(path, size)] = _publish_brand_asset(path, size)
+            except Exception as e:
+                print(f"⚠️ Could not load brand asset {path}: {e}")
+                assets[(path, size)] = ''
+    return {'lock': threading.Lock(), 'uris': assets}
+
+def brand_asset_uri(path, size=None):
+    """Cached URL of a brand asset ('' if the file can't be read)"""
+    assets = get_brand_assets()
+    key = (path, size)
+    with assets['lock']:
+        if key not in assets['uris']:
+            # Unregistered asset or size: publish once and keep it with the others
+            try:
+                assets['uris'][key] = _publish_brand_asset(path, size)
+            except Exception:
+                assets['uris'][key] = ''
+        return assets['uris'][key]
+
+# Photo uploads - decoded once, normalized, stored by content hash
+PLAYER_PHOTO_STORE_DIR = os.path.join(PLAYER_PHOTOS_DIR, 'store')  # {sha256 of upload}.jpg
+PLAYER_PHOTO_PDF_DIR = os.path.join(PLAYER_PHOTOS_DIR, 'pdf')  # Small copies for PDF reports
+PLAYER_PHOTO_MAX_SIZE = (1024, 1024)
+PDF_PHOTO_SIZE = (400, 400)
+
+def player_photo_filename(player_name):
+    """Path a player's photo is saved under (Obed Vargas -> player_photos/Obed_Vargas.jpg)"""
+    return os.path.join(PLAYER_PHOTOS_DIR, f"{player_name.replace(' ', '_')}.jpg")
+
+def pdf_photo_path(photo_path):
+    """Small PDF copy of a player photo when one was made at upload, else the photo itself"""
+    if not photo_path:
+        return photo_path
+    pdf_path = os.path.join(PLAYER_PHOTO_PDF_DIR, os.path.basename(photo_path))
+    return pdf_path if os.path.exists(pdf_path) else photo_path
+
+def _save_jpeg(img, path, quality=88):
+    """Write an RGB image as a metadata-free JPEG, atomically"""
+    temp_path = f"{path}.{threading.get_ident()}.tmp"
+    img.save(temp_path, format="JPEG", quality=quality, optimize=True)
+    os.replace(temp_path, path)
+
+def ingest_player_photo(upload_bytes, player_name):
+    """Normalize an uploaded photo and save it as the player's photo: {'path', 'digest', 'duplicate'} or None"""
+    digest = hashlib.sha256(upload_bytes).hexdigest()
+    stored_path = os.path.join(PLAYER_PHOTO_STORE_DIR, f"{digest}.jpg")
+    stored_pdf_path = os.path.join(PLAYER_PHOTO_STORE_DIR, f"{digest}_pdf.jpg")
+    photo_path = player_photo_filename(player_name)
+    pdf_path = os.path.join(PLAYER_PHOTO_PDF_DIR, os.path.basename(photo_path))
+    try:
+        os.makedirs(PLAYER_PHOTO_STORE_DIR, exist_ok=True)
+        os.makedirs(PLAYER_PHOTO_PDF_DIR, exist_ok=True)
+        duplicate = os.path.exists(stored_path) and os.path.exists(stored_pdf_path)
+        if not duplicate:
+            from PIL import Image, ImageOps
+            with Image.open(io.BytesIO(upload_bytes)) as upload:
+                # Apply the EXIF rotation, then drop EXIF/ICC metadata by re-encoding the pixels only
+                img = ImageOps.exif_transpose(upload)
+                if img.mode in ('RGBA', 'LA', 'P'):
+                    img = img.convert('RGBA')
+                    background = Image.new('RGB', img.size, (255, 255, 255))
+                    background.paste(img, mask=img.split()[-1])
+                    img = background
+                else:
+                    img = img.convert('RGB')
+            img.thumbnail(PLAYER_PHOTO_MAX_SIZE, Image.Resampling.LANCZOS)
+            _save_jpeg(img, stored_path)
+            img.thumbnail(PDF_PHOTO_SIZE, Image.Resampling.LANCZOS)
+            _save_jpeg(img, stored_pdf_path)
+        
+        for source, target in ((stored_path, photo_path), (stored_pdf_path, pdf_path)):
+            temp_path = f"{target}.{threading.get_ident()}.tmp"
+            shutil.copyfile(source, temp_path)
+            os.replace(temp_path, target)
+    except Exception as e:
+        print(f"❌ Error ingesting photo for {player_name}: {e}")
+        return None
+    
+    refresh_photo_index()
+    # Render the card and report thumbnails now instead of on the next page view
+    get_photo_thumbnail_src(photo_path, CARD_PHOTO_SIZE)
+    get_photo_thumbnail_src(photo_path, REPORT_PHOTO_SIZE)
+    print(f"📸 Saved photo for {player_name} ({'duplicate upload' if duplicate else digest[:12]})")
+    return {'path': photo_path, 'digest': digest, 'duplicate': duplicate}
+
+# Pagination - page number kept in session_state, reset when the filters change
+DATABASE_PAGE_SIZES = [25, 50, 100]
+
+def _set_session_value(key, value):
+    """Widget callback: store a value in session_state before the rerun"""
+    st.session_state[key] = value
+
+def paginate(total_rows, page_key, filter_signature, page_size_key, page_sizes=DATABASE_PAGE_SIZES, label="items"):
+    """Render page controls and return the (start, end) rows of the current page"""
+    signature_key = f"{page_key}_signature"
+    if st.session_state.get(signature_key) != filter_signature:
+        st.session_state[signature_key] = filter_signature
+        st.session_state[page_key] = 0
+    
+    col_size, col_prev, col_info, col_next = st.columns([2, 1, 3, 1])
+    with col_size:
+        page_size = st.selectbox("📄 Por página", page_sizes, key=page_size_key)
+    page_count = max(1, -(-total_rows // page_size))
+    page = min(max(st.session_state.get(page_key, 0), 0), page_count - 1)
+    start, end = page * page_size, min((page + 1) * page_size, total_rows)
+    with col_prev:
+        st.button("◀", key=f"{page_key}_prev", disabled=page == 0, on_click=_set_session_value, args=(page_key, page - 1))
+    with col_info:
+        st.markdown(f"<p style='text-align: center; color: #666; margin-top: 8px;'>{start + 1}–{end} de {total_rows} {label} · página {page + 1}/{page_count}</p>", unsafe_allow_html=True)
+    with col_next:
+        st.button("▶", key=f"{page_key}_next", disabled=page >= page_count - 1, on_click=_set_session_value, args=(page_key, page + 1))
+    return start, end
+
+def _toggle_session_member(key, member):
+    """Widget callback: add or remove a member of a set kept in session_state"""
+    members = st.session_state.setdefault(key, set())
+    members.symmetric_difference_update({member})
+
+def report_summary_labels(df_reports):
+    """One-line card headers for the individual reports, built column-wise"""
+    def column(name, default):
+        if name not in df_reports.columns:
+            return pd.Series(default, index=df_reports.index)
+        return df_reports[name].fillna(default).astype(str)
+    return ("👤 " + column('Player', '') + " (" + column('Team', '') + ") | " + column('Conclusion', '')
+            + " | 📅 " + column('Date', 'N/A') + " | 👤 Scout: " + column('Scout', 'Unknown'))
+
+def report_identities(df_reports):
+    """Stable Scout|Player|Date id per report (numbered when repeated), unaffected by row positions"""
+    def column(name):
+        if name not in df_reports.columns:
+            return pd.Series('', index=df_reports.index)
+        return df_reports[name].fillna('').astype(str).str.strip()
+    identity = column('Scout') + "|" + column('Player') + "|" + column('Date')
+    return identity + "|" + identity.groupby(identity, sort=False).cumcount().astype(str)
+
+def find_player_photo_github(player_name):
+    """Try to find player photo on GitHub with different name formats"""
+    import unicodedata
+    
+    # Remove accents from name
+    def remove_accents(text):
+        return ''.join(c for c in unicodedata.normalize('NFD', text) if unicodedata.category(c) != 'Mn')
+    
+    github_base = "https://raw.githubusercontent.com/alvarolopez8810/alnassrscoutingsystem/main/player_photos/"
+    
+    # Try different name formats
+    name_formats = [
+        player_name.replace(' ', '_'),              # Jordan_García
+        player_name.replace(' ', ''),               # JordanGarcía
+        remove_accents(player_name).replace(' ', '_'),  # Jordan_Garcia
+        remove_accents(player_name).replace(' ', ''),   # JordanGarcia
+    ]
+    
+    # Try different extensions
+    extensions = ['.jpg', '.png', '.jpeg', '.JPG', '.PNG', '.JPEG']
+    
+    # Return list of possible URLs to try
+    possible_urls = []
+    for name_format in name_formats:
+        for ext in extensions:
+            possible_urls.append(github_base + name_format + ext)
+    
+    return possible_urls
+
+# Remote photos - candidate URLs probed concurrently, hits and misses remembered on disk
+REMOTE_PHOTO_CACHE_DIR = os.getenv('REMOTE_PHOTO_CACHE_DIR', '.remote_photo_cache')
+REMOTE_PHOTO_MISS_TTL_SECONDS = 6 * 60 * 60  # How long a photo that every candidate answered 404 for is not probed again
+REMOTE_PHOTO_ERROR_TTL_SECONDS = 60  # How long to wait before re-probing after timeouts or server errors
+REMOTE_PHOTO_MISSING_STATUS = (404, 410)
+REMOTE_PHOTO_TIMEOUT = 5
+REMOTE_PHOTO_WAIT_SECONDS = 2  # Longest a page render waits for a remote photo before showing the placeholder
+REMOTE_PHOTO_WORKERS = 8
+
+@st.cache_resource
+def get_http_session():
+    """Process-wide pooled HTTP session for photo downloads"""
+    import requests
+    session = requests.Session()
+    adapter = requests.adapters.HTTPAdapter(pool_connections=4, pool_maxsize=REMOTE_PHOTO_WORKERS)
+    session.mount('https://', adapter)
+    session.mount('http://', adapter)
+    return session
+
+@st.cache_resource
+def get_photo_probe_pool():
+    """Process-wide worker pool for probing remote photo URLs"""
+    return ThreadPoolExecutor(max_workers=REMOTE_PHOTO_WORKERS, thread_name_prefix='photo-probe')
+
+def _fetch_photo_candidate(url):
+    """(image bytes or None, whether a miss is definitive) for the photo served at `url`"""
+    try:
+        response = get_http_session().get(url, timeout=REMOTE_PHOTO_TIMEOUT)
+    except Exception:
+        # Timeouts and connection errors say nothing about whether the photo exists
+        return None, False
+    if response.status_code != 200:
+        return None, response.status_code in REMOTE_PHOTO_MISSING_STATUS
+    try:
+        from PIL import Image
+        with Image.open(io.BytesIO(response.content)) as img:
+            img.verify()
+        return response.content, True
+    except Exception:
+        # Served, but not an image
+        return None, True
+
+def resolve_remote_photo(urls):
+    """Local copy of the first candidate URL that serves an image (None if none does)"""
+    if not urls:
+        return None
+    digest = hashlib.sha1('\n'.join(urls).encode('utf-8')).hexdigest()
+    photo_path = os.path.join(REMOTE_PHOTO_CACHE_DIR, f"{digest}.img")
+    miss_path = os.path.join(REMOTE_PHOTO_CACHE_DIR, f"{digest}.miss")
+    error_path = os.path.join(REMOTE_PHOTO_CACHE_DIR, f"{digest}.error")
+    if os.path.exists(photo_path):
+        return photo_path
+    for marker_path, ttl in ((miss_path, REMOTE_PHOTO_MISS_TTL_SECONDS), (error_path, REMOTE_PHOTO_ERROR_TTL_SECONDS)):
+        try:
+            if time.time() - os.path.getmtime(marker_path) < ttl:
+                return None
+        except OSError:
+            pass
+    
+    # Probe every candidate at once and keep the first one that answers with an image
+    futures = [get_photo_probe_pool().submit(_fetch_photo_candidate, url) for url in urls]
+    deadline = time.time() + REMOTE_PHOTO_WAIT_SECONDS
+    pending = set(futures)
+    while pending:
+        done, pending = wait(pending, timeout=max(deadline - time.time(), 0), return_when=FIRST_COMPLETED)
+        for future in done:
+            content, _ = future.result()
+            if content:
+                for other in pending:
+                    other.cancel()
+                return _cache_remote_photo(content, photo_path)
+        if not done:
+            break
+    
+    if not pending:
+        return _record_photo_probes(futures, photo_path, miss_path, error_path)
+    
+    # Out of time: show the placeholder now, the remaining probes record their outcome in the background
+    remaining = {'count': len(pending)}
+    remaining_lock = threading.Lock()
+    
+    def on_probe_done(_):
+        with remaining_lock:
+            remaining['count'] -= 1
+            finished = remaining['count'] == 0
+        if finished:
+            _record_photo_probes(futures, photo_path, miss_path, error_path)
+    
+    for future in pending:
+        future.add_done_callback(on_probe_done)
+    return None
+
+def _cache_remote_photo(content, photo_path):
+    """Write downloaded photo bytes to the remote photo cache and return the cached path (None on error)"""
+    try:
+        os.makedirs(REMOTE_PHOTO_CACHE_DIR, exist_ok=True)
+        temp_path = f"{photo_path}.{threading.get_ident()}.tmp"
+        with open(temp_path, 'wb') as f:
+            f.write(content)
+        os.replace(temp_path, photo_path)
+        return photo_path
+    except OSError as e:
+        print(f"❌ Error caching remote photo: {e}")
+        return None
+
+def _record_photo_probes(futures, photo_path, miss_path, error_path):
+    """Cache the outcome of a finished set of probes: the first image found, or a miss/error marker"""
+    results = [future.result() for future in futures]
+    content = next((content for content, _ in results if content), None)
+    if content:
+        return _cache_remote_photo(content, photo_path)
+    
+    # Only a 404 from every candidate is remembered for long; network errors are retried soon
+    definitive_miss = all(definitive for _, definitive in results)
+    try:
+        os.makedirs(REMOTE_PHOTO_CACHE_DIR, exist_ok=True)
+        with open(miss_path if definitive_miss else error_path, 'w'):
+            pass
+    except OSError as e:
+        print(f"❌ Error caching remote photo miss: {e}")
+    print(f"⚠️ No remote photo found ({len(futures)} candidates{'' if definitive_miss else ', some unreachable'})")
+    return None
+
+# Stylesheets - each one emitted once per page render, deduplicated by content hash
+# Global app styling
+APP_CSS = """
+.main { background-color: #f5f5f5; }
+
+/* Mejorar el selectbox para que sea más fácil de usar */
+.stSelectbox > div > div {
+    cursor: pointer;
+}
+
+/* Hacer el dropdown más grande y visible */
+[data-baseweb="select"] {
+    cursor: pointer;
+}
+
+/* Mejorar la visibilidad del input de búsqueda en el selectbox */
+[data-baseweb="popover"] {
+    z-index: 9999 !important;
+}
+
+/* Estilo para el input de búsqueda dentro del selectbox */
+[data-baseweb="select"] input {
+    font-size: 14px !important;
+    padding: 8px !important;
+}
+"""
+
+# Al Nassr form styling (CREATE MATCH REPORT)
+MATCH_FORM_CSS = """
+/* Al Nassr Form Styling */
+.stTextInput > div > div > input,
+.stDateInput > div > div > input,
+.stSelectbox > div > div > select {
+    background-color: #f5f5f5 !important;
+    border: 2px solid #e0e0e0 !important;
+    border-radius: 6px !important;
+    transition: all 0.3s ease !important;
+}
+
+.stTextInput > div > div > input:focus,
+.stDateInput > div > div > input:focus,
+.stSelectbox > div > div > select:focus {
+    border-color: #FFC60A !important;
+    box-shadow: 0 0 0 3px rgba(255,198,10,0.1) !important;
+}
+
+.alnassr-header {
+    background: #1a2332;
+    color: white;
+    padding: 15px 20px;
+    border-radius: 8px;
+    margin: 20px 0 15px 0;
+    font-size: 16px;
+    font-weight: 600;
+    display: flex;
+    align-items: center;
+    gap: 10px;
+}
+
+.alnassr-title {
+    display: flex;
+    align-items: center;
+    gap: 15px;
+    margin-bottom: 30px;
+}
+"""
+
+# Professional scouting card (VIEW INDIVIDUAL REPORTS)
+SCOUTING_CARD_CSS = """
+@import url('https://fonts.googleapis.com/css2?family=Inter:wght@400;600;700;900&display=swap');
+body { background-color: #fafafa; font-family: 'Inter', sans-serif; }
+
+.scouting-card-header {
+    background: linear-gradient(135deg, #1B2845 0%, #0d1421 100%);
+    color: white;
+    padding: 20px 30px;
+    border-radius: 8px 8px 0 0;
+    margin: -10px -10px 20px -10px;
+}
+.header-content {
+    display: flex;
+    justify-content: space-between;
+    align-items: center;
+    flex-wrap: wrap;
+    gap: 15px;
+    font-size: 15px;
+    font-weight: 600;
+}
+
+.player-photo-pro { 
+    width: 150px; 
+    height: 150px; 
+    border-radius: 50%; 
+    border: 4px solid #FFD700; 
+    object-fit: cover; 
+    margin: 0 auto 15px auto; 
+    display: block;
+    box-shadow: 0 4px 15px rgba(0,0,0,0.15);
+}
+.player-name-pro { 
+    font-size: 22px; 
+    font-weight: 700; 
+    color: #1a2332; 
+    text-align: center; 
+    margin: 10px 0 5px 0; 
+}
+.player-info-pro { 
+    font-size: 13px; 
+    color: #666; 
+    text-align: center;
+}
+
+.metric-card-pro { 
+    background: white; 
+    padding: 25px 15px; 
+    border-radius: 8px; 
+    box-shadow: 0 2px 10px rgba(0,0,0,0.08); 
+    text-align: center;
+    height: 100%;
+}
+.metric-value-pro { 
+    font-size: 56px; 
+    font-weight: 700; 
+    color: #1a2332; 
+    line-height: 1; 
+    margin-bottom: 10px;
+}
+.metric-label-pro { 
+    font-size: 11px; 
+    color: #999; 
+    text-transform: uppercase; 
+    letter-spacing: 2px; 
+    margin-bottom: 15px;
+    font-weight: 600;
+}
+.stars-pro { 
+    font-size: 22px; 
+    display: flex; 
+    justify-content: center; 
+    gap: 3px;
+}
+.profile-text-pro {
+    font-size: 16px;
+    font-weight: 600;
+    color: #1a2332;
+    margin-top: 10px;
+    line-height: 1.4;
+}
+.star-gold { color: #FFD700; }
+.star-gray { color: #e0e0e0; }
+
+.info-bar-pro {
+    background: white;
+    padding: 18px 20px;
+    border-radius: 0;
+    border-top: 1px solid #e0e0e0;
+    border-bottom: 1px solid #e0e0e0;
+    display: flex;
+    justify-content: space-around;
+    gap: 20px;
+    flex-wrap: wrap;
+    margin: 20px 0;
+}
+.info-bar-pro span {
+    font-size: 13px;
+    color: #495057;
+    font-weight: 500;
+}
+
+.report-box-pro {
+    background: #fffef0;
+    padding: 25px;
+    border-radius: 5px;
+    border-left: 5px solid #FFC107;
+    margin-bottom: 20px;
+}
+.report-text-pro {
+    font-style: italic;
+    color: #333;
+    font-size: 16px;
+    margin: 0;
+    line-height: 1.8;
+}
+
+.action-button-pro {
+    background: linear-gradient(135deg, #28a745 0%, #218838 100%);
+    color: white;
+    padding: 25px;
+    text-align: center;
+    border-radius: 8px;
+    box-shadow: 0 4px 15px rgba(40, 167, 69, 0.3);
+}
+.action-button-pro.orange {
+    background: linear-gradient(135deg, #ff8c00 0%, #e67e00 100%);
+    box-shadow: 0 4px 15px rgba(255, 140, 0, 0.3);
+}
+.action-button-pro.blue {
+    background: linear-gradient(135deg, #1B2845 0%, #0d1421 100%);
+    box-shadow: 0 4px 15px rgba(27, 40, 69, 0.3);
+}
+.action-text-pro {
+    font-size: 28px;
+    font-weight: 700;
+    text-transform: uppercase;
+    letter-spacing: 2px;
+    text-shadow: 0 2px 4px rgba(0,0,0,0.2);
+    margin: 0;
+}
+
+@keyframes fadeInUp {
+    from {
+        opacity: 0;
+        transform: translateY(20px);
+    }
+    to {
+        opacity: 1;
+        transform: translateY(0);
+    }
+}
+.animate-fade-in {
+    animation: fadeInUp 0.6s ease-out;
+}
+"""
+
+# Player cards (DATABASE)
+PLAYER_CARD_CSS = """
+.player-card {
+    background: linear-gradient(135deg, #667eea 0%, #764ba2 100%);
+    padding: 1rem;
+    border-radius: 10px;
+    color: white;
+    margin-bottom: 0.5rem;
+}
+.player-card-header {
+    font-size: 1.2rem;
+    font-weight: bold;
+}
+.player-badge {
+    display: inline-block;
+    background-color: rgba(255,255,255,0.2);
+    padding: 0.3rem 0.6rem;
+    border-radius: 15px;
+    margin-right: 0.5rem;
+    font-size: 0.9rem;
+}
+"""
+
+# Al Nassr match reports dashboard
+MATCH_DASHBOARD_CSS = """
+.stats-card {
+    background: white;
+    padding: 20px;
+    border-radius: 8px;
+    box-shadow: 0 2px 8px rgba(0,0,0,0.1);
+    text-align: center;
+    border-left: 4px solid #FFC60A;
+}
+.stats-number {
+    font-size: 36px;
+    font-weight: 700;
+    color: #1a2332;
+    margin: 10px 0;
+}
+.stats-label {
+    font-size: 12px;
+    color: #666;
+    text-transform: uppercase;
+    letter-spacing: 1px;
+    font-weight: 600;
+}
+.match-card {
+    background: white;
+    border-left: 4px solid #e0e0e0;
+    border-radius: 8px;
+    padding: 20px;
+    margin-bottom: 15px;
+    box-shadow: 0 2px 8px rgba(0,0,0,0.08);
+    transition: all 0.3s ease;
+    cursor: pointer;
+}
+.match-card:hover {
+    border-left-color: #FFC60A;
+    transform: translateX(5px);
+    box-shadow: 0 4px 12px rgba(255,198,10,0.3);
+}
+"""
+
+# Login page
+LOGIN_CSS = """
+.login-container {
+    max-width: 400px;
+    margin: 100px auto;
+    padding: 40px;
+    background: white;
+    border-radius: 15px;
+    box-shadow: 0 4px 20px rgba(0,0,0,0.1);
+}
+"""
+
+STYLESHEETS = {
+    'app': APP_CSS,
+    'match_form': MATCH_FORM_CSS,
+    'scouting_card': SCOUTING_CARD_CSS,
+    'player_cards': PLAYER_CARD_CSS,
+    'match_dashboard': MATCH_DASHBOARD_CSS,
+    'login': LOGIN_CSS
+}
+
+@st.cache_resource
+def _stylesheet_blocks():
+    """Name -> (content hash, <style> block), built once per process"""
+    return {
+        name: (hashlib.sha1(css.encode('utf-8')).hexdigest(), f"<style>\n{css}\n</style>")
+        for name, css in STYLESHEETS.items()
+    }
+
+def reset_stylesheets():
+    """Start a new page render: every stylesheet has to be emitted again"""
+    st.session_state['_emitted_stylesheets'] = set()
+
+def use_stylesheet(name):
+    """Emit a named stylesheet unless the same CSS is already on this page"""
+    digest, block = _stylesheet_blocks()[name]
+    emitted = st.session_state.setdefault('_emitted_stylesheets', set())
+    if digest in emitted:
+        return
+    emitted.add(digest)
+    st.markdown(block, unsafe_allow_html=True)
+
+# HTML templates - card markup normalized once per process, filled with str.format_map
+HTML_TEMPLATES = {
+    'scout_header': """
+        <div style="background: #1a2332; border-left: 6px solid #FFC60A; border-radius: 8px; padding: 15px; margin: 20px 0 15px 0; box-shadow: 0 4px 12px rgba(0,0,0,0.15);">
+            <div style="display: flex; align-items: center; gap: 15px;">
+                {scout_photo_html}
+                <div>
+                    <h3 style="color: #FFC60A; margin: 0; font-size: 20px; font-weight: 700;">{scout_display_name}</h3>
+                    <p style="color: white; margin: 3px 0 0 0; font-size: 11px; opacity: 0.9; letter-spacing: 1px;">SCOUT AL NASSR FC</p>
+                </div>
+            </div>
+        </div>
+    """,
+    'match_header': """
+        <div style="background: white; border-left: 4px solid #FFC60A; border-radius: 8px; padding: 18px; margin-bottom: 10px; box-shadow: 0 2px 8px rgba(0,0,0,0.08);">
+            <h4 style="color: #1a2332; margin: 0 0 8px 0; font-size: 18px; font-weight: 700;">{team1_flag_emoji} {team1} vs {team2_flag_emoji} {team2}</h4>
+            <p style="margin: 0; color: #666; font-size: 13px;">{match_date} | {match_phase}</p>
+        </div>
+    """,
+    'match_team_header': """
+        <div style="background: #f8f9fa; border-left: 4px solid #1a2332; padding: 12px 15px; margin: 15px 0 10px 0; border-radius: 6px;">
+            <h5 style="margin: 0; color: #1a2332; font-size: 16px; font-weight: 700;">{team_flag_emoji} {team_name}</h5>
+        </div>
+    """,
+    'match_player_card': """
+        <div style="background: white; border: 1px solid #e0e0e0; border-radius: 8px; padding: 15px; margin-bottom: 10px; display: flex; align-items: center; justify-content: space-between; flex-wrap: wrap; gap: 15px;">
+            <div style="flex: 1; min-width: 200px;">
+                <div style="font-size: 15px; font-weight: 700; color: #1a2332; margin-bottom: 2px;">{player_name}</div>
+                <div style="font-size: 11px; color: #999;">{birth_year_display}{player_position} • {player_number}</div>
+            </div>
+            <div style="display: flex; gap: 20px; align-items: center; flex-wrap: wrap;">
+                <div style="text-align: center; min-width: 85px;">
+                    <div style="font-size: 9px; color: #666; margin-bottom: 2px; text-transform: uppercase; font-weight: 600;">Rendimiento</div>
+                    <div style="font-size: 16px; font-weight: 700; color: #1a2332;">{performance}/6</div>
+                    <div style="background: #f0f0f0; border-radius: 3px; height: 5px; overflow: hidden; width: 65px; margin: 4px auto 0;">
+                        <div style="background: #ff4444; height: 100%; width: {perf_percent}%;"></div>
+                    </div>
+                </div>
+                <div style="text-align: center; min-width: 85px;">
+                    <div style="font-size: 9px; color: #666; margin-bottom: 2px; text-transform: uppercase; font-weight: 600;">Potencial</div>
+                    <div style="font-size: 16px; font-weight: 700; color: #1a2332;">{potential}/6</div>
+                    <div style="background: #f0f0f0; border-radius: 3px; height: 5px; overflow: hidden; width: 65px; margin: 4px auto 0;">
+                        <div style="background: #ff4444; height: 100%; width: {pot_percent}%;"></div>
+                    </div>
+                </div>
+                <div style="background: {conclusion_color}; color: white; padding: 8px 12px; border-radius: 6px; font-size: 10px; font-weight: 700; text-transform: uppercase; letter-spacing: 0.5px; box-shadow: 0 2px 4px rgba(0,0,0,0.2);">
+                    {conclusion_text}
+                </div>
+            </div>
+        </div>
+    """,
+    'match_report_box': """
+        <div style="background: #fffef0; border: 2px solid #FFC60A; border-radius: 8px; padding: 25px; margin-bottom: 15px;">
+            <h4 style="color: #1a2332; margin: 0 0 15px 0; font-size: 16px; border-bottom: 2px solid #FFC60A; padding-bottom: 10px;">📝 REPORT</h4>
+            <div style="font-size: 14px; color: #333; line-height: 1.8;">
+                {full_report_text}
+            </div>
+        </div>
+    """,
+    'report_card_header': """
+        <div class="scouting-card-header">
+            <div class="header-content">
+                <div><span style="font-size:18px; margin-right:8px;">{flag_emoji}</span><strong>{player_name}</strong> | {team}</div>
+                <div>📅 {report_date} | 👤 {scout_name}</div>
+            </div>
+        </div>
+    """,
+    'report_player_identity': """
+        {photo_html}
+        <p class="player-name-pro">{player_name}</p>
+        <p class="player-info-pro">{position} • {birth_year} • {flag_emoji} {team}</p>
+    """,
+    'report_metric_card': """
+        <div class="metric-card-pro animate-fade-in">
+            <div class="metric-value-pro">{value}</div>
+            <div class="metric-label-pro">{label}</div>
+            {detail_html}
+        </div>
+    """,
+    'report_details': """
+        <div class="info-bar-pro animate-fade-in">
+            <span><strong>FIN DE CONTRATO:</strong> {contract}</span>
+            <span><strong>💼 AGENTE:</strong> {agent}</span>
+            <span><strong>📞</strong> {phone}</span>
+            <span><strong>📅</strong> {report_date}</span>
+            <span><strong>👤</strong> {scout}</span>
+        </div>
+        <div class="report-box-pro animate-fade-in">
+            <p class="report-text-pro"{comment_style}>{tech_comment}</p>
+        </div>
+        <div class="action-button-pro{button_class} animate-fade-in">
+            <p class="action-text-pro">{conclusion}</p>
+        </div>
+        <br>
+    """,
+    'db_player_header': """
+        <div style="background: #1a2332; padding: 30px; border-radius: 8px; margin-bottom: 30px;">
+            <div style="display: flex; align-items: center; gap: 30px; flex-wrap: wrap;">
+                <div>{photo_html}</div>
+                <div style="flex: 1; min-width: 300px;">
+                    <div style="display: grid; grid-template-columns: repeat(auto-fit, minmax(150px, 1fr)); gap: 20px;">
+                        <div>
+                            <div style="color: #FFC60A; font-size: 12px; text-transform: uppercase; font-weight: 600; margin-bottom: 5px;">POSITION</div>
+                            <div style="color: white; font-size: 24px; font-weight: 600;">{player_position}</div>
+                        </div>
+                        <div>
+                            <div style="color: #FFC60A; font-size: 12px; text-transform: uppercase; font-weight: 600; margin-bottom: 5px;">NATIONAL TEAM</div>
+                            <div style="color: white; font-size: 20px; font-weight: 600;">{player_team}</div>
+                        </div>
+                        <div>
+                            <div style="color: #FFC60A; font-size: 12px; text-transform: uppercase; font-weight: 600; margin-bottom: 5px;">CLUB</div>
+                            <div style="color: white; font-size: 16px; font-weight: 500;">{player_club}</div>
+                        </div>
+                        <div>
+                            <div style="color: #FFC60A; font-size: 12px; text-transform: uppercase; font-weight: 600; margin-bottom: 5px;">DOB</div>
+                            <div style="color: white; font-size: 18px; font-weight: 600;">{player_age}</div>
+                        </div>
+                        <div>
+                            <div style="color: #FFC60A; font-size: 12px; text-transform: uppercase; font-weight: 600; margin-bottom: 5px;">YEAR</div>
+                            <div style="color: white; font-size: 24px; font-weight: 600;">{birth_year}</div>
+                        </div>
+                        <div>
+                            <div style="color: #FFC60A; font-size: 12px; text-transform: uppercase; font-weight: 600; margin-bottom: 5px;">CONTRACT</div>
+                            <div style="color: white; font-size: 24px; font-weight: 600;">{contract_date}</div>
+                        </div>
+                    </div>
+                </div>
+            </div>
+        </div>
+    """,
+    'db_team_header': """
+        <div style="background-color: #002B5B; color: white; padding: 1rem; border-radius: 8px; margin: 1rem 0; font-weight: bold; font-size: 1.2rem;"><span style="font-size:40px; margin-right:10px;">{flag_emoji}</span>{team} ({players} players | ⚽ {match} match reports | 📋 {individual} individual reports)</div>
+    """,
+}
+
+REPORT_PHOTO_PLACEHOLDER_HTML = '<div style="width:150px; height:150px; border-radius:50%; border:4px solid #FFD700; display:flex; align-items:center; justify-content:center; margin:0 auto; background:#f0f0f0; font-size:60px;">👤</div>'
+
+def _compile_template(template):
+    """Drop the source indentation and line breaks so each render only fills the placeholders"""
+    return ''.join(line.strip() for line in template.strip().splitlines())
+
+COMPILED_HTML_TEMPLATES = {name: _compile_template(template) for name, template in HTML_TEMPLATES.items()}
+
+def render_html(name, **fields):
+    """Fill a precompiled HTML template"""
+    return COMPILED_HTML_TEMPLATES[name].format_map(fields)
+
+def flush_html(html_parts):
+    """Render buffered HTML fragments as a single st.markdown call and empty the buffer"""
+    if html_parts:
+        st.markdown(''.join(html_parts), unsafe_allow_html=True)
+        html_parts.clear()
+
+# Country flags emoji mapping - FIFA U17 World Cup 2025 (48 teams)
+COUNTRY_FLAG_EMOJI = {
+    'Alemania': '🇩🇪',
+    'Germany': '🇩🇪',
+    'Arabia Saudita': '🇸🇦',
+    'Saudi Arabia': '🇸🇦',
+    'Argentina': '🇦🇷',
+    'Austria': '🇦🇹',
+    'Bélgica': '🇧🇪',
+    'Belgium': '🇧🇪',
+    'Bolivia': '🇧🇴',
+    'Brasil': '🇧🇷',
+    'Brazil': '🇧🇷',
+    'Burkina Faso': '🇧🇫',
+    'Canadá': '🇨🇦',
+    'Canada': '🇨🇦',
+    'Catar': '🇶🇦',
+    'Qatar': '🇶🇦',
+    'Chile': '🇨🇱',
+    'Colombia': '🇨🇴',
+    'Corea del Norte': '🇰🇵',
+    'Korea DPR': '🇰🇵',
+    'Corea del Sur': '🇰🇷',
+    'Korea Republic': '🇰🇷',
+    'South Korea': '🇰🇷',
+    'Costa de Marfil': '🇨🇮',
+    "Côte D'Ivoire": '🇨🇮',
+    'Ivory Coast': '🇨🇮',
+    'Costa Rica': '🇨🇷',
+    'Croacia': '🇭🇷',
+    'Croatia': '🇭🇷',
+    'Egipto': '🇪🇬',
+    'Egypt': '🇪🇬',
+    'El Salvador': '🇸🇻',
+    'Emiratos Árabes Unidos': '🇦🇪',
+    'United Arab Emirates': '🇦🇪',
+    'Estados Unidos': '🇺🇸',
+    'USA': '🇺🇸',
+    'United States': '🇺🇸',
+    'Fiyi': '🇫🇯',
+    'Fiji': '🇫🇯',
+    'Francia': '🇫🇷',
+    'France': '🇫🇷',
+    'Haití': '🇭🇹',
+    'Haiti': '🇭🇹',
+    'Honduras': '🇭🇳',
+    'Indonesia': '🇮🇩',
+    'Inglaterra': '🏴󠁧󠁢󠁥󠁮󠁧󠁿',
+    'England': '🏴󠁧󠁢󠁥󠁮󠁧󠁿',
+    'Irlanda': '🇮🇪',
+    'Republic Of Ireland': '🇮🇪',
+    'Ireland': '🇮🇪',
+    'Italia': '🇮🇹',
+    'Italy': '🇮🇹',
+    'Japón': '🇯🇵',
+    'Japan': '🇯🇵',
+    'Malí': '🇲🇱',
+    'Mali': '🇲🇱',
+    'Marruecos': '🇲🇦',
+    'Morocco': '🇲🇦',
+    'México': '🇲🇽',
+    'Mexico': '🇲🇽',
+    'Nueva Caledonia': '🇳🇨',
+    'New Caledonia': '🇳🇨',
+    'Nueva Zelanda': '🇳🇿',
+    'New Zealand': '🇳🇿',
+    'Panamá': '🇵🇦',
+    'Panama': '🇵🇦',
+    'Paraguay': '🇵🇾',
+    'Portugal': '🇵🇹',
+    'República Checa': '🇨🇿',
+    'Czechia': '🇨🇿',
+    'Czech Republic': '🇨🇿',
+    'Senegal': '🇸🇳',
+    'Sudáfrica': '🇿🇦',
+    'South Africa': '🇿🇦',
+    'Suiza': '🇨🇭',
+    'Switzerland': '🇨🇭',
+    'Tayikistán': '🇹🇯',
+    'Tajikistan': '🇹🇯',
+    'Túnez': '🇹🇳',
+    'Tunisia': '🇹🇳',
+    'Uganda': '🇺🇬',
+    'Uzbekistán': '🇺🇿',
+    'Uzbekistan': '🇺🇿',
+    'Venezuela': '🇻🇪',
+    'Zambia': '🇿🇲',
+}
+
+# Match report editor - each team column and each player block reruns on its own
+fragment = getattr(st, 'fragment', lambda func: func)
+
+def rerun_fragment():
+    """Rerun only the current fragment; full rerun outside a fragment run or on older Streamlit"""
+    try:
+        st.rerun(scope="fragment")
+    except (TypeError, StreamlitAPIException):
+        st.rerun()
+
+def new_match_player(player_id):
+    """Empty player entry for the match report editor"""
+    return {
+        'id': player_id,
+        'name': '',
+        'number': 1,
+        'position': '',
+        'starter': 'Sí',
+        'minutes': 90,
+        'performance': 1,
+        'report': ''
+    }
+
+@fragment
+def render_match_player(side, idx, team_players, player_positions):
+    """One player block of the match report editor"""
+    players_key = f"{side}_match_players"
+    if idx >= len(st.session_state[players_key]):
+        return
+    player_data = st.session_state[players_key][idx]
+    
+    # Get current name for display
+    current_name = player_data.get('name', 'Not selected')
+    display_name = current_name if current_name else 'Not selected'
+    
+    with st.expander(f"👤 Player {idx+1}: {display_name}", expanded=True):
+        # Check if we just autofilled this player
+        autofill_key = f"autofilled_{side}_{idx}"
+        just_autofilled = st.session_state.get(autofill_key, False)
+        if just_autofilled:
+            st.success(f"✅ Auto-filled data for {player_data.get('name', 'player')}")
+            st.session_state[autofill_key] = False  # Reset flag
         
-        # Read existing data
-        df_existing = read_google_sheet(sheet_name, worksheet_name)
+        col_name, col_btn = st.columns([5, 1])
         
-        # Combine with new data
-        if not df_existing.empty:
-            print(f"📊 Found {len(df_existing)} existing rows, combining...")
-            df_combined = pd.concat([df_existing, df_new], ignore_index=True)
-        else:
-            print("📊 No existing data, creating new sheet...")
-            df_combined = df_new
+        with col_name:
+            # Get current index
+            current_name = player_data.get('name', '')
+            if current_name and current_name in team_players:
+                current_index = team_players.index(current_name) + 1
+            else:
+                current_index = 0
+            
+            selected_player = st.selectbox(
+                "Player Name",
+                [""] + team_players,
+                index=current_index,
+                key=f"{side}_p_name_{idx}"
+            )
+            
+            # Auto-fill when player is selected
+            if selected_player and selected_player != player_data.get('name', ''):
+                player_data['name'] = selected_player
+                # Auto-fill from database
+                player_record = lookup_player(selected_player)
+                if player_record:
+                    for field, value in player_record.items():
+                        if value is not None:
+                            player_data[field] = value
+            elif selected_player:
+                player_data['name'] = selected_player
         
-        # Write back
-        result = write_google_sheet(df_combined, sheet_name, worksheet_name)
+        with col_btn:
+            st.markdown("<br>", unsafe_allow_html=True)
+            if st.button("🔄", key=f"{side}_autofill_{idx}", help="Autocompletar desde BD"):
+                if selected_player:
+                    player_record = lookup_player(selected_player)
+                    if player_record:
+                        labels = {'birth_year': "📅 Birth Year", 'position': "⚽ Position", 'number': "🔢 Number"}
+                        for field, value in player_record.items():
+                            if value is not None:
+                                player_data[field] = value
+                                st.info(f"{labels[field]} set to: {value}")
+                        
+                        # Set flag to show success message after rerun
+                        st.session_state[f"autofilled_{side}_{idx}"] = True
+                        rerun_fragment()
+                    else:
+                        st.warning(f"⚠️ Player {selected_player} not found in database")
+                else:
+                    st.warning("⚠️ Selecciona un jugador primero")
         
-        if result:
-            print(f"✅ Successfully appended data to {sheet_name}")
-        else:
-            print(f"❌ Failed to append data to {sheet_name}")
+        # Form mode: field edits stay in the browser until the player is applied
+        form_mode = st.session_state.get('match_form_mode', False)
+        with st.form(f"{side}_player_form_{idx}") if form_mode else st.container():
+            col2, col3 = st.columns([1, 2])
+            
+            with col2:
+                # Use dynamic key based on player name to force widget refresh
+                player_name_key = selected_player.replace(' ', '_') if selected_player else 'empty'
+                player_number = st.number_input(
+                    "#",
+                    min_value=1,
+                    max_value=99,
+                    value=player_data.get('number', 1),
+                    key=f"{side}_p_num_{idx}_{player_name_key}"
+                )
+                player_data['number'] = player_number
+            
+            with col3:
+                # Auto-fill position - include both general (GK, DF, MF, FW) and specific positions
+                default_pos = ""
+                position_index = 0
+                positions_list = ["", "GK", "DF", "MF", "FW", "RB", "CB", "LB", "DM", "CM", "CAM", "RW", "LW", "ST"]
+                
+                if selected_player:
+                    default_pos = player_positions.get(selected_player, "")
+                    if default_pos in positions_list:
+                        position_index = positions_list.index(default_pos)
+                    elif player_data.get('position') in positions_list:
+                        position_index = positions_list.index(player_data['position'])
+                
+                player_position = st.selectbox(
+                    "Position",
+                    positions_list,
+                    index=position_index,
+                    key=f"{side}_p_pos_{idx}_{player_name_key}"
+                )
+                player_data['position'] = player_position
+            
+            # Birth Year - use dynamic key
+            birth_year = st.number_input(
+                "🎂 AÑO (Birth Year)",
+                min_value=1990,
+                max_value=2015,
+                value=player_data.get('birth_year', 2005),
+                step=1,
+                key=f"{side}_p_year_{idx}_{player_name_key}"
+            )
+            player_data['birth_year'] = birth_year
+            
+            # Titular and Minutes
+            col_starter, col_minutes = st.columns(2)
+            
+            with col_starter:
+                starter = st.selectbox(
+                    "🎽 Titular",
+                    ["Sí", "No"],
+                    index=0 if player_data.get('starter', 'Sí') == 'Sí' else 1,
+                    key=f"{side}_p_starter_{idx}"
+                )
+                player_data['starter'] = starter
+            
+            with col_minutes:
+                minutes = st.number_input(
+                    "⏱️ Minutes",
+                    min_value=0,
+                    max_value=120,
+                    value=player_data.get('minutes', 90),
+                    key=f"{side}_p_minutes_{idx}"
+                )
+                player_data['minutes'] = minutes
+            
+            # PERFORMANCE and POTENTIAL
+            col_perf, col_pot = st.columns(2)
+            with col_perf:
+                performance = st.selectbox(
+                    "🎯 PERFORMANCE",
+                    [1, 2, 3, 4, 5, 6],
+                    index=player_data.get('performance', 1) - 1,
+                    key=f"{side}_p_perf_{idx}"
+                )
+                player_data['performance'] = performance
+            
+            with col_pot:
+                potential = st.selectbox(
+                    "⭐ POTENTIAL",
+                    [1, 2, 3, 4, 5, 6],
+                    index=player_data.get('potential', 1) - 1,
+                    key=f"{side}_p_pot_{idx}"
+                )
+                player_data['potential'] = potential
+            
+            # Get player position and show items
+            player_pos = player_data.get('position', '')
+            if player_pos in POSITION_RUBRICS:
+                st.markdown(f"**📊 Evaluación: {player_pos}**")
+                if 'items' not in player_data:
+                    player_data['items'] = {}
+                
+                for item_code, item in rubric_items(player_pos):
+                    col_item1, col_item2 = st.columns([4, 1])
+                    with col_item1:
+                        st.markdown(f"<small>{item}</small>", unsafe_allow_html=True)
+                    with col_item2:
+                        item_value = st.selectbox(
+                            "Val",
+                            ["", "Sí", "No"],
+                            index=0,
+                            key=f"{side}_item_{idx}_{item_code}",
+                            label_visibility="collapsed"
+                        )
+                        player_data['items'][item_code] = item_value
+            
+            # FIRMAR/CONCLUSION
+            conclusion_options = [
+                "A - Firmar (Sign)",
+                "B+ - Seguir para Firmar (Follow to Sign)",
+                "B - Seguir (Follow)"
+            ]
+            default_conclusion_idx = 0
+            if 'conclusion' in player_data and player_data['conclusion'] in conclusion_options:
+                default_conclusion_idx = conclusion_options.index(player_data['conclusion'])
+            
+            conclusion = st.selectbox(
+                "✅ FIRMAR/CONCLUSION",
+                conclusion_options,
+                index=default_conclusion_idx,
+                key=f"{side}_p_conclusion_{idx}"
+            )
+            player_data['conclusion'] = conclusion
+            
+            # Report text area (optional)
+            report_text = st.text_area(
+                "💬 REPORT (Opcional)",
+                value=player_data.get('report', ''),
+                height=100,
+                placeholder="Comentario técnico detallado (opcional)...",
+                key=f"{side}_p_report_{idx}"
+            )
+            player_data['report'] = report_text
+            
+            if form_mode:
+                st.form_submit_button("✅ Apply", use_container_width=True)
         
-        return result
-    except Exception as e:
-        print(f"❌ Error in append_to_google_sheet: {e}")
-        import traceback
-        traceback.print_exc()
-        return False
-
-def find_player_photo(player_name):
-    """Find player photo with different extensions and name formats"""
-    import unicodedata
-    
-    # Remove accents from name
-    def remove_accents(text):
-        return ''.join(c for c in unicodedata.normalize('NFD', text) if unicodedata.category(c) != 'Mn')
-    
-    # Try different name formats (prioritize underscore format used in Google Sheets)
-    name_formats = [
-        player_name.replace(' ', '_'),              # Obed_Vargas (PRIORITY - matches Google Sheets)
-        player_name.replace(' ', ''),               # ObedVargas (fallback)
-        remove_accents(player_name).replace(' ', '_'),  # Obed_Vargas (without accents)
-        remove_accents(player_name).replace(' ', ''),   # ObedVargas (without accents)
-        player_name,                                 # Obed Vargas (fallback)
-    ]
-    
-    # Try different extensions (prioritize .jpg as it's the default save format)
-    extensions = ['.jpg', '.png', '.jpeg', '.JPG', '.PNG', '.JPEG']
-    
-    for name_format in name_formats:
-        for ext in extensions:
-            photo_path = f"player_photos/{name_format}{ext}"
-            if os.path.exists(photo_path):
-                return photo_path
-    
-    # If not found, return None
-    return None
+        # Remove button
+        if st.button("🗑️ Remove", key=f"remove_{side}_{idx}"):
+            st.session_state[players_key].pop(idx)
+            st.rerun()
 
-def find_player_photo_github(player_name):
-    """Try to find player photo on GitHub with different name formats"""
-    import unicodedata
-    
-    # Remove accents from name
-    def remove_accents(text):
-        return ''.join(c for c in unicodedata.normalize('NFD', text) if unicodedata.category(c) != 'Mn')
+@fragment
+def render_match_lineup(side, team, team_players, player_positions):
+    """Team column of the match report editor: header, add button and one block per player"""
+    players_key = f"{side}_match_players"
     
-    github_base = "https://raw.githubusercontent.com/alvarolopez8810/alnassrscoutingsystem/main/player_photos/"
+    # Get team flag emoji
+    flag_emoji = COUNTRY_FLAG_EMOJI.get(team, '🏠' if side == 'home' else '✈️')
     
-    # Try different name formats
-    name_formats = [
-        player_name.replace(' ', '_'),              # Jordan_García
-        player_name.replace(' ', ''),               # JordanGarcía
-        remove_accents(player_name).replace(' ', '_'),  # Jordan_Garcia
-        remove_accents(player_name).replace(' ', ''),   # JordanGarcia
-    ]
+    st.markdown(f"### {flag_emoji} {team}")
     
-    # Try different extensions
-    extensions = ['.jpg', '.png', '.jpeg', '.JPG', '.PNG', '.JPEG']
+    # Button to add player
+    if st.button("➕ Add Player" if st.session_state.language == 'en' else "➕ إضافة لاعب", key=f"add_{side}_player"):
+        st.session_state[players_key].append(new_match_player(len(st.session_state[players_key])))
+        rerun_fragment()
     
-    # Return list of possible URLs to try
-    possible_urls = []
-    for name_format in name_formats:
-        for ext in extensions:
-            possible_urls.append(github_base + name_format + ext)
+    st.markdown("---")
     
-    return possible_urls
+    # Display added players
+    for idx in range(len(st.session_state[players_key])):
+        render_match_player(side, idx, team_players, player_positions)
 
 # Page configuration
 try:
@@ -344,6 +2798,12 @@ except:
     )
 
 def main():
+    # New page render - stylesheets are emitted again, once each
+    reset_stylesheets()
+    
+    # Make sure saves journaled by this or an earlier process keep syncing
+    get_sheets_sync_worker()
+    
     # Initialize authentication state
     if 'authenticated' not in st.session_state:
         st.session_state.authenticated = False
@@ -374,23 +2834,8 @@ def main():
     with st.sidebar:
         # User info at top
         if st.session_state.user_name:
-            try:
-                from PIL import Image
-                import io
-                import base64
-                
-                user_img = Image.open(st.session_state.user_photo)
-                user_img.thumbnail((60, 60))
-                buffered = io.BytesIO()
-                if user_img.mode in ('RGBA', 'LA', 'P'):
-                    user_img.save(buffered, format="PNG")
-                else:
-                    user_img = user_img.convert('RGB')
-                    user_img.save(buffered, format="PNG")
-                user_img_str = base64.b64encode(buffered.getvalue()).decode()
-                user_photo_html = f'<img src="data:image/png;base64,{user_img_str}" style="width: 50px; height: 50px; border-radius: 50%; border: 3px solid #FFC60A; object-fit: cover;">'
-            except:
-                user_photo_html = '👤'
+            user_img_uri = brand_asset_uri(st.session_state.user_photo, (60, 60))
+            user_photo_html = f'<img src="{user_img_uri}" style="width: 50px; height: 50px; border-radius: 50%; border: 3px solid #FFC60A; object-fit: cover;">' if user_img_uri else '👤'
             
             st.markdown(f"""
                 <div style="
@@ -416,6 +2861,9 @@ def main():
         
         st.markdown("---")
         
+        # Sync status of this session's saves
+        show_save_status()
+        
         # Navigation
         if st.session_state.page != 'home':
             if st.button("🏠 " + ("Home" if st.session_state.language == 'en' else "الرئيسية"), 
@@ -430,6 +2878,7 @@ def main():
         st.markdown("### 🔧 Debug Tools")
         if st.button("🔄 Clear Cache", key="btn_clear_cache", use_container_width=True, help="Clear cached data to force refresh from Google Sheets"):
             st.cache_data.clear()
+            invalidate_local_store()
             st.success("✅ Cache cleared! Data will refresh on next load.")
             st.rerun()
         
@@ -446,95 +2895,6 @@ def main():
 def show_fifa_u17_view():
     """Show FIFA U17 World Cup section with 5 tabs"""
     
-    # Country flags emoji mapping - FIFA U17 World Cup 2025 (48 teams)
-    COUNTRY_FLAG_EMOJI = {
-        'Alemania': '🇩🇪',
-        'Germany': '🇩🇪',
-        'Arabia Saudita': '🇸🇦',
-        'Saudi Arabia': '🇸🇦',
-        'Argentina': '🇦🇷',
-        'Austria': '🇦🇹',
-        'Bélgica': '🇧🇪',
-        'Belgium': '🇧🇪',
-        'Bolivia': '🇧🇴',
-        'Brasil': '🇧🇷',
-        'Brazil': '🇧🇷',
-        'Burkina Faso': '🇧🇫',
-        'Canadá': '🇨🇦',
-        'Canada': '🇨🇦',
-        'Catar': '🇶🇦',
-        'Qatar': '🇶🇦',
-        'Chile': '🇨🇱',
-        'Colombia': '🇨🇴',
-        'Corea del Norte': '🇰🇵',
-        'Korea DPR': '🇰🇵',
-        'Corea del Sur': '🇰🇷',
-        'Korea Republic': '🇰🇷',
-        'South Korea': '🇰🇷',
-        'Costa de Marfil': '🇨🇮',
-        "Côte D'Ivoire": '🇨🇮',
-        'Ivory Coast': '🇨🇮',
-        'Costa Rica': '🇨🇷',
-        'Croacia': '🇭🇷',
-        'Croatia': '🇭🇷',
-        'Egipto': '🇪🇬',
-        'Egypt': '🇪🇬',
-        'El Salvador': '🇸🇻',
-        'Emiratos Árabes Unidos': '🇦🇪',
-        'United Arab Emirates': '🇦🇪',
-        'Estados Unidos': '🇺🇸',
-        'USA': '🇺🇸',
-        'United States': '🇺🇸',
-        'Fiyi': '🇫🇯',
-        'Fiji': '🇫🇯',
-        'Francia': '🇫🇷',
-        'France': '🇫🇷',
-        'Haití': '🇭🇹',
-        'Haiti': '🇭🇹',
-        'Honduras': '🇭🇳',
-        'Indonesia': '🇮🇩',
-        'Inglaterra': '🏴󠁧󠁢󠁥󠁮󠁧󠁿',
-        'England': '🏴󠁧󠁢󠁥󠁮󠁧󠁿',
-        'Irlanda': '🇮🇪',
-        'Republic Of Ireland': '🇮🇪',
-        'Ireland': '🇮🇪',
-        'Italia': '🇮🇹',
-        'Italy': '🇮🇹',
-        'Japón': '🇯🇵',
-        'Japan': '🇯🇵',
-        'Malí': '🇲🇱',
-        'Mali': '🇲🇱',
-        'Marruecos': '🇲🇦',
-        'Morocco': '🇲🇦',
-        'México': '🇲🇽',
-        'Mexico': '🇲🇽',
-        'Nueva Caledonia': '🇳🇨',
-        'New Caledonia': '🇳🇨',
-        'Nueva Zelanda': '🇳🇿',
-        'New Zealand': '🇳🇿',
-        'Panamá': '🇵🇦',
-        'Panama': '🇵🇦',
-        'Paraguay': '🇵🇾',
-        'Portugal': '🇵🇹',
-        'República Checa': '🇨🇿',
-        'Czechia': '🇨🇿',
-        'Czech Republic': '🇨🇿',
-        'Senegal': '🇸🇳',
-        'Sudáfrica': '🇿🇦',
-        'South Africa': '🇿🇦',
-        'Suiza': '🇨🇭',
-        'Switzerland': '🇨🇭',
-        'Tayikistán': '🇹🇯',
-        'Tajikistan': '🇹🇯',
-        'Túnez': '🇹🇳',
-        'Tunisia': '🇹🇳',
-        'Uganda': '🇺🇬',
-        'Uzbekistán': '🇺🇿',
-        'Uzbekistan': '🇺🇿',
-        'Venezuela': '🇻🇪',
-        'Zambia': '🇿🇲',
-    }
-    
     # Keep old COUNTRY_FLAGS for backwards compatibility
     COUNTRY_FLAGS = {
         'Arabia Saudita': 'saff.png',
@@ -575,26 +2935,8 @@ def show_fifa_u17_view():
     
     with col_title:
         # Load FIFA U17 icon
-        try:
-            from PIL import Image
-            import io
-            
-            icon_img = Image.open('fwcu17.webp')
-            icon_img.thumbnail((40, 40))  # Resize icon
-            buffered = io.BytesIO()
-            
-            # Convert to PNG for better compatibility
-            if icon_img.mode in ('RGBA', 'LA', 'P'):
-                icon_img.save(buffered, format="PNG")
-            else:
-                icon_img = icon_img.convert('RGB')
-                icon_img.save(buffered, format="PNG")
-            
-            icon_str = base64.b64encode(buffered.getvalue()).decode()
-            icon_html = f'<img src="data:image/png;base64,{icon_str}" style="height:35px; vertical-align:middle; margin-right:10px;">'
-        except Exception as e:
-            print(f"Error loading FIFA U17 icon: {e}")
-            icon_html = '⚽ '  # Fallback to emoji if image fails
+        icon_uri = brand_asset_uri('fwcu17.webp', (40, 40))
+        icon_html = f'<img src="{icon_uri}" style="height:35px; vertical-align:middle; margin-right:10px;">' if icon_uri else '⚽ '  # Fallback to emoji if image fails
         
         if st.session_state.language == 'en':
             st.markdown(f"<h2 style='color: #002B5B;'>{icon_html}FIFA WORLD CUP U17</h2>", unsafe_allow_html=True)
@@ -624,63 +2966,11 @@ def show_fifa_u17_view():
     # Tab 0: CREATE MATCH REPORT
     with tabs[0]:
         # Al Nassr Custom CSS for Form
-        st.markdown("""
-            <style>
-            /* Al Nassr Form Styling */
-            .stTextInput > div > div > input,
-            .stDateInput > div > div > input,
-            .stSelectbox > div > div > select {
-                background-color: #f5f5f5 !important;
-                border: 2px solid #e0e0e0 !important;
-                border-radius: 6px !important;
-                transition: all 0.3s ease !important;
-            }
-            
-            .stTextInput > div > div > input:focus,
-            .stDateInput > div > div > input:focus,
-            .stSelectbox > div > div > select:focus {
-                border-color: #FFC60A !important;
-                box-shadow: 0 0 0 3px rgba(255,198,10,0.1) !important;
-            }
-            
-            .alnassr-header {
-                background: #1a2332;
-                color: white;
-                padding: 15px 20px;
-                border-radius: 8px;
-                margin: 20px 0 15px 0;
-                font-size: 16px;
-                font-weight: 600;
-                display: flex;
-                align-items: center;
-                gap: 10px;
-            }
-            
-            .alnassr-title {
-                display: flex;
-                align-items: center;
-                gap: 15px;
-                margin-bottom: 30px;
-            }
-            </style>
-        """, unsafe_allow_html=True)
+        use_stylesheet('match_form')
         
         # Load Al Nassr Logo
-        try:
-            from PIL import Image
-            import io
-            logo_img = Image.open('alnassr.png')
-            logo_img.thumbnail((50, 50))
-            buffered = io.BytesIO()
-            if logo_img.mode in ('RGBA', 'LA', 'P'):
-                logo_img.save(buffered, format="PNG")
-            else:
-                logo_img = logo_img.convert('RGB')
-                logo_img.save(buffered, format="PNG")
-            logo_str = base64.b64encode(buffered.getvalue()).decode()
-            logo_html = f'<img src="data:image/png;base64,{logo_str}" style="height:50px; vertical-align:middle;">'
-        except:
-            logo_html = '🦅'
+        logo_uri = brand_asset_uri('alnassr.png', (50, 50))
+        logo_html = f'<img src="{logo_uri}" style="height:50px; vertical-align:middle;">' if logo_uri else '🦅'
         
         # Page Title with Logo
         st.markdown(f"""
@@ -695,14 +2985,7 @@ def show_fifa_u17_view():
         
         # Load teams dynamically from WorldCupU17Data (Team column for national teams)
         try:
-            df_teams = read_google_sheet('WorldCupU17Data', 'Sheet1')
-            # Fallback to local Excel if Google Sheets fails
-            if df_teams is None or df_teams.empty:
-                try:
-                    df_teams = pd.read_excel('dbworldcup17.xlsx')
-                except:
-                    df_teams = pd.DataFrame()
-            
+            df_teams = get_player_snapshot()
             if not df_teams.empty and 'Team' in df_teams.columns:
                 TEAMS_U17 = sorted(df_teams['Team'].dropna().unique().tolist())
             else:
@@ -795,823 +3078,60 @@ def show_fifa_u17_view():
             try:
                 # Always use Google Sheets
                 with st.spinner('🔄 Cargando base de datos de jugadores...'):
-                    df_players = read_google_sheet('WorldCupU17Data', 'Sheet1')
-                    if df_players is None or df_players.empty:
+                    df_players = get_player_snapshot()
+                    if df_players.empty:
                         st.error("❌ No se pudo cargar la base de datos desde Google Sheets")
-                        df_players = pd.DataFrame()
-                    else:
-                        st.success(f"✅ {len(df_players)} jugadores cargados")
-                
-                # Use correct column names from WorldCupU17Data Google Sheet
-                # Columns: # POS PLAYER NAME ... Team CLUB Nationality
-                team_col_match = 'Team'
-                position_col_match = 'POS'
-                name_col_match = 'PLAYER NAME'
-                
-                # Verify columns exist
-                if not df_players.empty:
-                    if 'Team' not in df_players.columns:
-                        for col in df_players.columns:
-                            if col.lower() in ['team', 'equipo', 'selección']:
-                                team_col_match = col
-                                break
-                    
-                    if 'POS' not in df_players.columns:
-                        for col in df_players.columns:
-                            if 'pos' in col.lower() or 'position' in col.lower():
-                                position_col_match = col
-                                break
-                    
-                    if 'PLAYER NAME' not in df_players.columns:
-                        for col in df_players.columns:
-                            if 'player' in col.lower() or 'name' in col.lower() or 'nombre' in col.lower():
-                                name_col_match = col
-                                break
-                
-                # Position order for sorting
-                POSITION_ORDER = {'GK': 1, 'RB': 2, 'CB': 3, 'LB': 4, 'DM': 5, 'CM': 6, 'CAM': 7, 'RW': 8, 'LW': 9, 'ST': 10}
-                
-                # Get players for home team sorted by position (filter by Team)
-                home_team_df = df_players[df_players[team_col_match] == home_team].copy()
-                home_team_df['pos_order'] = home_team_df[position_col_match].map(POSITION_ORDER).fillna(99)
-                home_team_df = home_team_df.sort_values('pos_order')
-                home_players = home_team_df[name_col_match].tolist()
-                
-                # Get players for away team sorted by position (filter by Team)
-                away_team_df = df_players[df_players[team_col_match] == away_team].copy()
-                away_team_df['pos_order'] = away_team_df[position_col_match].map(POSITION_ORDER).fillna(99)
-                away_team_df = away_team_df.sort_values('pos_order')
-                away_players = away_team_df[name_col_match].tolist()
-                
-                # Create player-to-position mapping
-                home_player_positions = dict(zip(home_team_df[name_col_match], home_team_df[position_col_match]))
-                away_player_positions = dict(zip(away_team_df[name_col_match], away_team_df[position_col_match]))
-                
-                st.markdown("---")
-                
-                # Initialize session state for players if not exists
-                if 'home_match_players' not in st.session_state:
-                    st.session_state.home_match_players = []
-                if 'away_match_players' not in st.session_state:
-                    st.session_state.away_match_players = []
-                
-                # Players Section
-                col_lineup_home, col_lineup_away = st.columns(2)
-                
-                # HOME TEAM PLAYERS
-                with col_lineup_home:
-                    # Get home team flag emoji
-                    home_flag_emoji = COUNTRY_FLAG_EMOJI.get(home_team, '🏠')
-                    
-                    st.markdown(f"### {home_flag_emoji} {home_team}")
-                    
-                    # Button to add player
-                    if st.button("➕ Add Player" if st.session_state.language == 'en' else "➕ إضافة لاعب", key="add_home_player"):
-                        st.session_state.home_match_players.append({
-                            'id': len(st.session_state.home_match_players),
-                            'name': '',
-                            'number': 1,
-                            'position': '',
-                            'starter': 'Sí',
-                            'minutes': 90,
-                            'performance': 1,
-                            'report': ''
-                        })
-                        st.rerun()
-                    
-                    st.markdown("---")
-                    
-                    # Display added players
-                    for idx, player_data in enumerate(st.session_state.home_match_players):
-                        # Get current name for display
-                        current_name = player_data.get('name', 'Not selected')
-                        display_name = current_name if current_name else 'Not selected'
-                        
-                        with st.expander(f"👤 Player {idx+1}: {display_name}", expanded=True):
-                            # Check if we just autofilled this player
-                            autofill_key = f"autofilled_home_{idx}"
-                            just_autofilled = st.session_state.get(autofill_key, False)
-                            if just_autofilled:
-                                st.success(f"✅ Auto-filled data for {player_data.get('name', 'player')}")
-                                st.session_state[autofill_key] = False  # Reset flag
-                            
-                            col1, col2, col3 = st.columns([3, 1, 2])
-                            
-                            with col1:
-                                col_name, col_btn = st.columns([4, 1])
-                                with col_name:
-                                    # Get current index
-                                    current_name = player_data.get('name', '')
-                                    if current_name and current_name in home_players:
-                                        current_index = home_players.index(current_name) + 1
-                                    else:
-                                        current_index = 0
-                                    
-                                    selected_player = st.selectbox(
-                                        "Player Name",
-                                        [""] + home_players,
-                                        index=current_index,
-                                        key=f"home_p_name_{idx}"
-                                    )
-                                    
-                                    # Auto-fill when player is selected
-                                    if selected_player and selected_player != player_data.get('name', ''):
-                                        st.session_state.home_match_players[idx]['name'] = selected_player
-                                        # Auto-fill from database
-                                        try:
-                                            df_players_db = read_google_sheet('WorldCupU17Data', 'Sheet1')
-                                            if df_players_db is not None and not df_players_db.empty:
-                                                name_col = 'PLAYER NAME' if 'PLAYER NAME' in df_players_db.columns else 'Player Name'
-                                                player_db = df_players_db[df_players_db[name_col].str.strip().str.lower() == selected_player.strip().lower()]
-                                                
-                                                if not player_db.empty:
-                                                    # Auto-fill DOB -> birth_year
-                                                    dob = player_db.iloc[0].get('DOB', '')
-                                                    if pd.notna(dob) and str(dob).strip():
-                                                        year = str(dob).split('/')[-1] if '/' in str(dob) else str(dob)[:4]
-                                                        try:
-                                                            year_int = int(year)
-                                                            st.session_state.home_match_players[idx]['birth_year'] = year_int
-                                                        except:
-                                                            pass
-                                                    
-                                                    # Auto-fill Position
-                                                    pos = player_db.iloc[0].get('POS', '')
-                                                    if pd.notna(pos) and str(pos).strip():
-                                                        st.session_state.home_match_players[idx]['position'] = str(pos).strip()
-                                                    
-                                                    # Auto-fill Number
-                                                    num = player_db.iloc[0].get('Num', '')
-                                                    if pd.notna(num) and str(num).strip():
-                                                        try:
-                                                            st.session_state.home_match_players[idx]['number'] = int(num)
-                                                        except:
-                                                            pass
-                                        except:
-                                            pass
-                                    elif selected_player:
-                                        st.session_state.home_match_players[idx]['name'] = selected_player
-                                
-                                with col_btn:
-                                    st.markdown("<br>", unsafe_allow_html=True)
-                                    if st.button("🔄", key=f"home_autofill_{idx}", help="Autocompletar desde BD"):
-                                        if selected_player:
-                                            with st.spinner(f"🔍 Loading data for {selected_player}..."):
-                                                try:
-                                                    # Always use Google Sheets
-                                                    df_players_db = read_google_sheet('WorldCupU17Data', 'Sheet1')
-                                                    
-                                                    if df_players_db is not None and not df_players_db.empty:
-                                                        name_col = 'PLAYER NAME' if 'PLAYER NAME' in df_players_db.columns else 'Player Name'
-                                                        player_db = df_players_db[df_players_db[name_col].str.strip().str.lower() == selected_player.strip().lower()]
-                                                        
-                                                        if not player_db.empty:
-                                                            # DOB -> birth_year
-                                                            dob = player_db.iloc[0].get('DOB', '')
-                                                            if pd.notna(dob) and str(dob).strip():
-                                                                year = str(dob).split('/')[-1] if '/' in str(dob) else str(dob)[:4]
-                                                                try:
-                                                                    year_int = int(year)
-                                                                    st.session_state.home_match_players[idx]['birth_year'] = year_int
-                                                                    st.info(f"📅 Birth Year set to: {year_int}")
-                                                                except:
-                                                                    pass
-                                                            
-                                                            # Position
-                                                            pos = player_db.iloc[0].get('Position', '')
-                                                            if pd.notna(pos) and str(pos).strip():
-                                                                pos_str = str(pos).strip()
-                                                                st.session_state.home_match_players[idx]['position'] = pos_str
-                                                                st.info(f"⚽ Position set to: {pos_str}")
-                                                            
-                                                            # Num -> number
-                                                            num = player_db.iloc[0].get('Num', '')
-                                                            if pd.notna(num) and str(num).strip():
-                                                                try:
-                                                                    num_int = int(float(num))
-                                                                    st.session_state.home_match_players[idx]['number'] = num_int
-                                                                    st.info(f"🔢 Number set to: {num_int}")
-                                                                except:
-                                                                    pass
-                                                            
-                                                            # Set flag to show success message after rerun
-                                                            st.session_state[f"autofilled_home_{idx}"] = True
-                                                            st.rerun()
-                                                        else:
-                                                            st.warning(f"⚠️ Player {selected_player} not found in database")
-                                                    else:
-                                                        st.error("❌ WorldCupU17Data is empty or not loaded")
-                                                except Exception as e:
-                                                    st.error(f"❌ Error loading player data: {str(e)}")
-                                        else:
-                                            st.warning("⚠️ Selecciona un jugador primero")
-                            
-                            with col2:
-                                # Use dynamic key based on player name to force widget refresh
-                                player_name_key = selected_player.replace(' ', '_') if selected_player else 'empty'
-                                player_number = st.number_input(
-                                    "#",
-                                    min_value=1,
-                                    max_value=99,
-                                    value=st.session_state.home_match_players[idx].get('number', 1),
-                                    key=f"home_p_num_{idx}_{player_name_key}"
-                                )
-                                st.session_state.home_match_players[idx]['number'] = player_number
-                            
-                            with col3:
-                                # Auto-fill position - include both general (GK, DF, MF, FW) and specific positions
-                                default_pos = ""
-                                position_index = 0
-                                positions_list = ["", "GK", "DF", "MF", "FW", "RB", "CB", "LB", "DM", "CM", "CAM", "RW", "LW", "ST"]
-                                
-                                if selected_player:
-                                    default_pos = home_player_positions.get(selected_player, "")
-                                    if default_pos in positions_list:
-                                        position_index = positions_list.index(default_pos)
-                                    elif st.session_state.home_match_players[idx].get('position') in positions_list:
-                                        position_index = positions_list.index(st.session_state.home_match_players[idx]['position'])
-                                
-                                player_position = st.selectbox(
-                                    "Position",
-                                    positions_list,
-                                    index=position_index,
-                                    key=f"home_p_pos_{idx}_{player_name_key}"
-                                )
-                                st.session_state.home_match_players[idx]['position'] = player_position
-                            
-                            # Birth Year - use dynamic key
-                            birth_year = st.number_input(
-                                "🎂 AÑO (Birth Year)",
-                                min_value=1990,
-                                max_value=2015,
-                                value=st.session_state.home_match_players[idx].get('birth_year', 2005),
-                                step=1,
-                                key=f"home_p_year_{idx}_{player_name_key}"
-                            )
-                            st.session_state.home_match_players[idx]['birth_year'] = birth_year
-                            
-                            # Titular and Minutes
-                            col_starter, col_minutes = st.columns(2)
-                            
-                            with col_starter:
-                                starter = st.selectbox(
-                                    "🎽 Titular",
-                                    ["Sí", "No"],
-                                    index=0 if player_data.get('starter', 'Sí') == 'Sí' else 1,
-                                    key=f"home_p_starter_{idx}"
-                                )
-                                st.session_state.home_match_players[idx]['starter'] = starter
-                            
-                            with col_minutes:
-                                minutes = st.number_input(
-                                    "⏱️ Minutes",
-                                    min_value=0,
-                                    max_value=120,
-                                    value=player_data.get('minutes', 90),
-                                    key=f"home_p_minutes_{idx}"
-                                )
-                                st.session_state.home_match_players[idx]['minutes'] = minutes
-                            
-                            # PERFORMANCE and POTENTIAL
-                            col_perf, col_pot = st.columns(2)
-                            with col_perf:
-                                performance = st.selectbox(
-                                    "🎯 PERFORMANCE",
-                                    [1, 2, 3, 4, 5, 6],
-                                    index=player_data.get('performance', 1) - 1,
-                                    key=f"home_p_perf_{idx}"
-                                )
-                                st.session_state.home_match_players[idx]['performance'] = performance
-                            
-                            with col_pot:
-                                potential = st.selectbox(
-                                    "⭐ POTENTIAL",
-                                    [1, 2, 3, 4, 5, 6],
-                                    index=player_data.get('potential', 1) - 1,
-                                    key=f"home_p_pot_{idx}"
-                                )
-                                st.session_state.home_match_players[idx]['potential'] = potential
-                            
-                            # Position-specific items
-                            POSITION_ITEMS = {
-                                'GK': [
-                                    'Reflejos & 1v1. fiabilidad bajo palos',
-                                    'Juego aéreo. autoridad en centros y balones divididos',
-                                    'Juego con los pies. precisión en corto y largo',
-                                    'Mando y comunicación. organiza la defensa',
-                                    'Fiabilidad mental & seguridad. concentración, serenidad, transmitir confianza',
-                                    'Sentido del juego (posicionamiento & lectura). anticipación, sobriedad, elegir bien cuándo intervenir'
-                                ],
-                                'CB': [
-                                    'Duelos defensivos (1v1 + potencia física)',
-                                    'Fiabilidad mental. concentración, serenidad bajo presión',
-                                    'Juego aéreo y defensa de área (Def)',
-                                    'Posicionamiento & Organización. orden en la línea defensiva',
-                                    'Salida de balón (corto, largo y conducción)',
-                                    'Anticipación & Coberturas. lectura de juego, intercepciones',
-                                    'Velocidad y capacidad de giro'
-                                ],
-                                'RB': [
-                                    'Velocidad & Resistencia (ida/vuelta)',
-                                    'Fiabilidad mental. disciplina, concentración, equilibrio',
-                                    '1v1 defensivo + tapar centros',
-                                    'Timing en incorporaciones. saber cuándo doblar y cuándo quedarse',
-                                    'Centros & pase interior',
-                                    'Posicionamiento defensivo (segundo palo)'
-                                ],
-                                'LB': [
-                                    'Velocidad & Resistencia (ida/vuelta)',
-                                    'Fiabilidad mental. disciplina, concentración, equilibrio',
-                                    '1v1 defensivo + tapar centros',
-                                    'Timing en incorporaciones. saber cuándo doblar y cuándo quedarse',
-                                    'Centros & pase interior',
-                                    'Posicionamiento defensivo (segundo palo)'
-                                ],
-                                'DM': [
-                                    'Coberturas, 2das jugadas & posicionamiento. abarcar campo, equilibrio',
-                                    'Juego corto - largo',
-                                    'Recuperación & duelos. intercepciones, tackles',
-                                    'Mando & comunicación. liderazgo silencioso, ordenar bloque',
-                                    'Físico y mentalidad destacado',
-                                    'Juego aéreo'
-                                ],
-                                'CM': [
-                                    'Creatividad & visión. pase vertical, asociación, generar ocasiones',
-                                    'Dinamismo. capacidad de girar, romper líneas, movilidad constante',
-                                    'Llegada & finalización. cifras, goles, asistencias',
-                                    'Trabajo defensivo. recuperación, balance ofensivo-defensivo',
-                                    'Duelos & presencia física',
-                                    'Personalidad competitiva - consistencia. liderazgo, carácter para asumir balón'
-                                ],
-                                'CAM': [
-                                    'Creatividad, asociación & último pase',
-                                    'Compromiso defensivo',
-                                    'Movilidad entre líneas. espalda de pivotes',
-                                    'Toma de decisión. diferencial por sí mismo',
-                                    'Definición. gol + tiro media distancia',
-                                    '1v1 ofensivo. romper líneas con balón',
-                                    'Llegada - desmarques'
-                                ],
-                                'RW': [
-                                    'Velocidad & aceleración',
-                                    '1v1 ofensivo. generar ocasiones por sí mismo',
-                                    'Centros & calidad de servicio',
-                                    'Gol & asistencias. volumen ofensivo',
-                                    'Trabajo defensivo. retorno + pressing',
-                                    'Personalidad, consistencia & toma de decisiones',
-                                    'Juego asociativo'
-                                ],
-                                'LW': [
-                                    'Velocidad & aceleración',
-                                    '1v1 ofensivo. generar ocasiones por sí mismo',
-                                    'Centros & calidad de servicio',
-                                    'Gol & asistencias. volumen ofensivo',
-                                    'Trabajo defensivo. retorno + pressing',
-                                    'Personalidad, consistencia & toma de decisiones',
-                                    'Juego asociativo'
-                                ],
-                                'ST': [
-                                    'GOL. definición fuera y dentro del área (pie + cabeza)',
-                                    'Capacidad de generar ocasiones por sí mismo',
-                                    'Juego de espaldas & descargas. fijar centrales',
-                                    'Movilidad ofensiva. atacar espacios, dinámico',
-                                    'Juego aéreo ofensivo',
-                                    'Trabajo defensivo. primer defensor'
-                                ]
-                            }
-                            
-                            # Get player position and show items
-                            player_pos = player_data.get('position', '')
-                            if player_pos in POSITION_ITEMS:
-                                st.markdown(f"**📊 Evaluación: {player_pos}**")
-                                if 'items' not in st.session_state.home_match_players[idx]:
-                                    st.session_state.home_match_players[idx]['items'] = {}
-                                
-                                for item_idx, item in enumerate(POSITION_ITEMS[player_pos]):
-                                    col_item1, col_item2 = st.columns([4, 1])
-                                    with col_item1:
-                                        st.markdown(f"<small>{item}</small>", unsafe_allow_html=True)
-                                    with col_item2:
-                                        item_value = st.selectbox(
-                                            "Val",
-                                            ["", "Sí", "No"],
-                                            index=0,
-                                            key=f"home_item_{idx}_{item_idx}",
-                                            label_visibility="collapsed"
-                                        )
-                                        st.session_state.home_match_players[idx]['items'][item] = item_value
-                            
-                            # FIRMAR/CONCLUSION
-                            conclusion_options = [
-                                "A - Firmar (Sign)",
-                                "B+ - Seguir para Firmar (Follow to Sign)",
-                                "B - Seguir (Follow)"
-                            ]
-                            default_conclusion_idx = 0
-                            if 'conclusion' in player_data and player_data['conclusion'] in conclusion_options:
-                                default_conclusion_idx = conclusion_options.index(player_data['conclusion'])
-                            
-                            conclusion = st.selectbox(
-                                "✅ FIRMAR/CONCLUSION",
-                                conclusion_options,
-                                index=default_conclusion_idx,
-                                key=f"home_p_conclusion_{idx}"
-                            )
-                            st.session_state.home_match_players[idx]['conclusion'] = conclusion
-                            
-                            # Report text area (optional)
-                            report_text = st.text_area(
-                                "💬 REPORT (Opcional)",
-                                value=player_data.get('report', ''),
-                                height=100,
-                                placeholder="Comentario técnico detallado (opcional)...",
-                                key=f"home_p_report_{idx}"
-                            )
-                            st.session_state.home_match_players[idx]['report'] = report_text
-                            
-                            # Remove button
-                            if st.button("🗑️ Remove", key=f"remove_home_{idx}"):
-                                st.session_state.home_match_players.pop(idx)
-                                st.rerun()
-                
-                # AWAY TEAM PLAYERS
-                with col_lineup_away:
-                    # Get away team flag emoji
-                    away_flag_emoji = COUNTRY_FLAG_EMOJI.get(away_team, '✈️')
-                    
-                    st.markdown(f"### {away_flag_emoji} {away_team}")
-                    
-                    # Button to add player
-                    if st.button("➕ Add Player" if st.session_state.language == 'en' else "➕ إضافة لاعب", key="add_away_player"):
-                        st.session_state.away_match_players.append({
-                            'id': len(st.session_state.away_match_players),
-                            'name': '',
-                            'number': 1,
-                            'position': '',
-                            'starter': 'Sí',
-                            'minutes': 90,
-                            'performance': 1,
-                            'report': ''
-                        })
-                        st.rerun()
-                    
-                    st.markdown("---")
-                    
-                    # Display added players
-                    for idx, player_data in enumerate(st.session_state.away_match_players):
-                        # Get current name for display
-                        current_name = player_data.get('name', 'Not selected')
-                        display_name = current_name if current_name else 'Not selected'
-                        
-                        with st.expander(f"👤 Player {idx+1}: {display_name}", expanded=True):
-                            # Check if we just autofilled this player
-                            autofill_key = f"autofilled_away_{idx}"
-                            just_autofilled = st.session_state.get(autofill_key, False)
-                            if just_autofilled:
-                                st.success(f"✅ Auto-filled data for {player_data.get('name', 'player')}")
-                                st.session_state[autofill_key] = False  # Reset flag
-                            
-                            col1, col2, col3 = st.columns([3, 1, 2])
-                            
-                            with col1:
-                                col_name, col_btn = st.columns([4, 1])
-                                with col_name:
-                                    # Get current index
-                                    current_name = player_data.get('name', '')
-                                    if current_name and current_name in away_players:
-                                        current_index = away_players.index(current_name) + 1
-                                    else:
-                                        current_index = 0
-                                    
-                                    selected_player = st.selectbox(
-                                        "Player Name",
-                                        [""] + away_players,
-                                        index=current_index,
-                                        key=f"away_p_name_{idx}"
-                                    )
-                                    
-                                    # Auto-fill when player is selected
-                                    if selected_player and selected_player != player_data.get('name', ''):
-                                        st.session_state.away_match_players[idx]['name'] = selected_player
-                                        # Auto-fill from database
-                                        try:
-                                            df_players_db = read_google_sheet('WorldCupU17Data', 'Sheet1')
-                                            if df_players_db is not None and not df_players_db.empty:
-                                                name_col = 'PLAYER NAME' if 'PLAYER NAME' in df_players_db.columns else 'Player Name'
-                                                player_db = df_players_db[df_players_db[name_col].str.strip().str.lower() == selected_player.strip().lower()]
-                                                
-                                                if not player_db.empty:
-                                                    # Auto-fill DOB -> birth_year
-                                                    dob = player_db.iloc[0].get('DOB', '')
-                                                    if pd.notna(dob) and str(dob).strip():
-                                                        year = str(dob).split('/')[-1] if '/' in str(dob) else str(dob)[:4]
-                                                        try:
-                                                            year_int = int(year)
-                                                            st.session_state.away_match_players[idx]['birth_year'] = year_int
-                                                        except:
-                                                            pass
-                                                    
-                                                    # Auto-fill Position
-                                                    pos = player_db.iloc[0].get('POS', '')
-                                                    if pd.notna(pos) and str(pos).strip():
-                                                        st.session_state.away_match_players[idx]['position'] = str(pos).strip()
-                                                    
-                                                    # Auto-fill Number
-                                                    num = player_db.iloc[0].get('Num', '')
-                                                    if pd.notna(num) and str(num).strip():
-                                                        try:
-                                                            st.session_state.away_match_players[idx]['number'] = int(num)
-                                                        except:
-                                                            pass
-                                        except:
-                                            pass
-                                    elif selected_player:
-                                        st.session_state.away_match_players[idx]['name'] = selected_player
-                                
-                                with col_btn:
-                                    st.markdown("<br>", unsafe_allow_html=True)
-                                    if st.button("🔄", key=f"away_autofill_{idx}", help="Autocompletar desde BD"):
-                                        if selected_player:
-                                            with st.spinner(f"🔍 Loading data for {selected_player}..."):
-                                                try:
-                                                    # Always use Google Sheets
-                                                    df_players_db = read_google_sheet('WorldCupU17Data', 'Sheet1')
-                                                    
-                                                    if df_players_db is not None and not df_players_db.empty:
-                                                        name_col = 'PLAYER NAME' if 'PLAYER NAME' in df_players_db.columns else 'Player Name'
-                                                        player_db = df_players_db[df_players_db[name_col].str.strip().str.lower() == selected_player.strip().lower()]
-                                                        
-                                                        if not player_db.empty:
-                                                            # DOB -> birth_year
-                                                            dob = player_db.iloc[0].get('DOB', '')
-                                                            if pd.notna(dob) and str(dob).strip():
-                                                                year = str(dob).split('/')[-1] if '/' in str(dob) else str(dob)[:4]
-                                                                try:
-                                                                    year_int = int(year)
-                                                                    st.session_state.away_match_players[idx]['birth_year'] = year_int
-                                                                    st.info(f"📅 Birth Year set to: {year_int}")
-                                                                except:
-                                                                    pass
-                                                            
-                                                            # Position
-                                                            pos = player_db.iloc[0].get('Position', '')
-                                                            if pd.notna(pos) and str(pos).strip():
-                                                                pos_str = str(pos).strip()
-                                                                st.session_state.away_match_players[idx]['position'] = pos_str
-                                                                st.info(f"⚽ Position set to: {pos_str}")
-                                                            
-                                                            # Num -> number
-                                                            num = player_db.iloc[0].get('Num', '')
-                                                            if pd.notna(num) and str(num).strip():
-                                                                try:
-                                                                    num_int = int(float(num))
-                                                                    st.session_state.away_match_players[idx]['number'] = num_int
-                                                                    st.info(f"🔢 Number set to: {num_int}")
-                                                                except:
-                                                                    pass
-                                                            
-                                                            # Set flag to show success message after rerun
-                                                            st.session_state[f"autofilled_away_{idx}"] = True
-                                                            st.rerun()
-                                                        else:
-                                                            st.warning(f"⚠️ Player {selected_player} not found in database")
-                                                    else:
-                                                        st.error("❌ WorldCupU17Data is empty or not loaded")
-                                                except Exception as e:
-                                                    st.error(f"❌ Error loading player data: {str(e)}")
-                                        else:
-                                            st.warning("⚠️ Selecciona un jugador primero")
-                            
-                            with col2:
-                                # Use dynamic key based on player name to force widget refresh
-                                player_name_key = selected_player.replace(' ', '_') if selected_player else 'empty'
-                                player_number = st.number_input(
-                                    "#",
-                                    min_value=1,
-                                    max_value=99,
-                                    value=st.session_state.away_match_players[idx].get('number', 1),
-                                    key=f"away_p_num_{idx}_{player_name_key}"
-                                )
-                                st.session_state.away_match_players[idx]['number'] = player_number
-                            
-                            with col3:
-                                # Auto-fill position - include both general (GK, DF, MF, FW) and specific positions
-                                default_pos = ""
-                                position_index = 0
-                                positions_list = ["", "GK", "DF", "MF", "FW", "RB", "CB", "LB", "DM", "CM", "CAM", "RW", "LW", "ST"]
-                                
-                                if selected_player:
-                                    default_pos = away_player_positions.get(selected_player, "")
-                                    if default_pos in positions_list:
-                                        position_index = positions_list.index(default_pos)
-                                    elif st.session_state.away_match_players[idx].get('position') in positions_list:
-                                        position_index = positions_list.index(st.session_state.away_match_players[idx]['position'])
-                                
-                                player_position = st.selectbox(
-                                    "Position",
-                                    positions_list,
-                                    index=position_index,
-                                    key=f"away_p_pos_{idx}_{player_name_key}"
-                                )
-                                st.session_state.away_match_players[idx]['position'] = player_position
-                            
-                            # Birth Year - use dynamic key
-                            birth_year_away = st.number_input(
-                                "🎂 AÑO (Birth Year)",
-                                min_value=1990,
-                                max_value=2015,
-                                value=st.session_state.away_match_players[idx].get('birth_year', 2005),
-                                step=1,
-                                key=f"away_p_year_{idx}_{player_name_key}"
-                            )
-                            st.session_state.away_match_players[idx]['birth_year'] = birth_year_away
-                            
-                            # Titular and Minutes
-                            col_starter, col_minutes = st.columns(2)
-                            
-                            with col_starter:
-                                starter = st.selectbox(
-                                    "🎽 Titular",
-                                    ["Sí", "No"],
-                                    index=0 if player_data.get('starter', 'Sí') == 'Sí' else 1,
-                                    key=f"away_p_starter_{idx}"
-                                )
-                                st.session_state.away_match_players[idx]['starter'] = starter
-                            
-                            with col_minutes:
-                                minutes = st.number_input(
-                                    "⏱️ Minutes",
-                                    min_value=0,
-                                    max_value=120,
-                                    value=player_data.get('minutes', 90),
-                                    key=f"away_p_minutes_{idx}"
-                                )
-                                st.session_state.away_match_players[idx]['minutes'] = minutes
-                            
-                            # PERFORMANCE and POTENTIAL
-                            col_perf, col_pot = st.columns(2)
-                            with col_perf:
-                                performance = st.selectbox(
-                                    "🎯 PERFORMANCE",
-                                    [1, 2, 3, 4, 5, 6],
-                                    index=player_data.get('performance', 1) - 1,
-                                    key=f"away_p_perf_{idx}"
-                                )
-                                st.session_state.away_match_players[idx]['performance'] = performance
-                            
-                            with col_pot:
-                                potential = st.selectbox(
-                                    "⭐ POTENTIAL",
-                                    [1, 2, 3, 4, 5, 6],
-                                    index=player_data.get('potential', 1) - 1,
-                                    key=f"away_p_pot_{idx}"
-                                )
-                                st.session_state.away_match_players[idx]['potential'] = potential
-                            
-                            # Position-specific items
-                            POSITION_ITEMS = {
-                                'GK': [
-                                    'Reflejos & 1v1. fiabilidad bajo palos',
-                                    'Juego aéreo. autoridad en centros y balones divididos',
-                                    'Juego con los pies. precisión en corto y largo',
-                                    'Mando y comunicación. organiza la defensa',
-                                    'Fiabilidad mental & seguridad. concentración, serenidad, transmitir confianza',
-                                    'Sentido del juego (posicionamiento & lectura). anticipación, sobriedad, elegir bien cuándo intervenir'
-                                ],
-                                'CB': [
-                                    'Duelos defensivos (1v1 + potencia física)',
-                                    'Fiabilidad mental. concentración, serenidad bajo presión',
-                                    'Juego aéreo y defensa de área (Def)',
-                                    'Posicionamiento & Organización. orden en la línea defensiva',
-                                    'Salida de balón (corto, largo y conducción)',
-                                    'Anticipación & Coberturas. lectura de juego, intercepciones',
-                                    'Velocidad y capacidad de giro'
-                                ],
-                                'RB': [
-                                    'Velocidad & Resistencia (ida/vuelta)',
-                                    'Fiabilidad mental. disciplina, concentración, equilibrio',
-                                    '1v1 defensivo + tapar centros',
-                                    'Timing en incorporaciones. saber cuándo doblar y cuándo quedarse',
-                                    'Centros & pase interior',
-                                    'Posicionamiento defensivo (segundo palo)'
-                                ],
-                                'LB': [
-                                    'Velocidad & Resistencia (ida/vuelta)',
-                                    'Fiabilidad mental. disciplina, concentración, equilibrio',
-                                    '1v1 defensivo + tapar centros',
-                                    'Timing en incorporaciones. saber cuándo doblar y cuándo quedarse',
-                                    'Centros & pase interior',
-                                    'Posicionamiento defensivo (segundo palo)'
-                                ],
-                                'DM': [
-                                    'Coberturas, 2das jugadas & posicionamiento. abarcar campo, equilibrio',
-                                    'Juego corto - largo',
-                                    'Recuperación & duelos. intercepciones, tackles',
-                                    'Mando & comunicación. liderazgo silencioso, ordenar bloque',
-                                    'Físico y mentalidad destacado',
-                                    'Juego aéreo'
-                                ],
-                                'CM': [
-                                    'Creatividad & visión. pase vertical, asociación, generar ocasiones',
-                                    'Dinamismo. capacidad de girar, romper líneas, movilidad constante',
-                                    'Llegada & finalización. cifras, goles, asistencias',
-                                    'Trabajo defensivo. recuperación, balance ofensivo-defensivo',
-                                    'Duelos & presencia física',
-                                    'Personalidad competitiva - consistencia. liderazgo, carácter para asumir balón'
-                                ],
-                                'CAM': [
-                                    'Creatividad, asociación & último pase',
-                                    'Compromiso defensivo',
-                                    'Movilidad entre líneas. espalda de pivotes',
-                                    'Toma de decisión. diferencial por sí mismo',
-                                    'Definición. gol + tiro media distancia',
-                                    '1v1 ofensivo. romper líneas con balón',
-                                    'Llegada - desmarques'
-                                ],
-                                'RW': [
-                                    'Velocidad & aceleración',
-                                    '1v1 ofensivo. generar ocasiones por sí mismo',
-                                    'Centros & calidad de servicio',
-                                    'Gol & asistencias. volumen ofensivo',
-                                    'Trabajo defensivo. retorno + pressing',
-                                    'Personalidad, consistencia & toma de decisiones',
-                                    'Juego asociativo'
-                                ],
-                                'LW': [
-                                    'Velocidad & aceleración',
-                                    '1v1 ofensivo. generar ocasiones por sí mismo',
-                                    'Centros & calidad de servicio',
-                                    'Gol & asistencias. volumen ofensivo',
-                                    'Trabajo defensivo. retorno + pressing',
-                                    'Personalidad, consistencia & toma de decisiones',
-                                    'Juego asociativo'
-                                ],
-                                'ST': [
-                                    'GOL. definición fuera y dentro del área (pie + cabeza)',
-                                    'Capacidad de generar ocasiones por sí mismo',
-                                    'Juego de espaldas & descargas. fijar centrales',
-                                    'Movilidad ofensiva. atacar espacios, dinámico',
-                                    'Juego aéreo ofensivo',
-                                    'Trabajo defensivo. primer defensor'
-                                ]
-                            }
-                            
-                            # Get player position and show items
-                            player_pos = player_data.get('position', '')
-                            if player_pos in POSITION_ITEMS:
-                                st.markdown(f"**📊 Evaluación: {player_pos}**")
-                                if 'items' not in st.session_state.away_match_players[idx]:
-                                    st.session_state.away_match_players[idx]['items'] = {}
-                                
-                                for item_idx, item in enumerate(POSITION_ITEMS[player_pos]):
-                                    col_item1, col_item2 = st.columns([4, 1])
-                                    with col_item1:
-                                        st.markdown(f"<small>{item}</small>", unsafe_allow_html=True)
-                                    with col_item2:
-                                        item_value = st.selectbox(
-                                            "Val",
-                                            ["", "Sí", "No"],
-                                            index=0,
-                                            key=f"away_item_{idx}_{item_idx}",
-                                            label_visibility="collapsed"
-                                        )
-                                        st.session_state.away_match_players[idx]['items'][item] = item_value
-                            
-                            # FIRMAR/CONCLUSION
-                            conclusion_options_away = [
-                                "A - Firmar (Sign)",
-                                "B+ - Seguir para Firmar (Follow to Sign)",
-                                "B - Seguir (Follow)"
-                            ]
-                            default_conclusion_idx_away = 0
-                            if 'conclusion' in player_data and player_data['conclusion'] in conclusion_options_away:
-                                default_conclusion_idx_away = conclusion_options_away.index(player_data['conclusion'])
-                            
-                            conclusion_away = st.selectbox(
-                                "✅ FIRMAR/CONCLUSION",
-                                conclusion_options_away,
-                                index=default_conclusion_idx_away,
-                                key=f"away_p_conclusion_{idx}"
-                            )
-                            st.session_state.away_match_players[idx]['conclusion'] = conclusion_away
-                            
-                            # Report text area (optional)
-                            report_text = st.text_area(
-                                "💬 REPORT (Opcional)",
-                                value=player_data.get('report', ''),
-                                height=100,
-                                placeholder="Comentario técnico detallado (opcional)...",
-                                key=f"away_p_report_{idx}"
-                            )
-                            st.session_state.away_match_players[idx]['report'] = report_text
-                            
-                            # Remove button
-                            if st.button("🗑️ Remove", key=f"remove_away_{idx}"):
-                                st.session_state.away_match_players.pop(idx)
-                                st.rerun()
+                    else:
+                        st.success(f"✅ {len(df_players)} jugadores cargados")
+                
+                # The snapshot already uses the canonical column names
+                team_col_match = 'Team'
+                position_col_match = 'POS'
+                name_col_match = 'PLAYER NAME'
+                
+                # Get players for home team sorted by position (filter by Team)
+                home_team_df = df_players[df_players[team_col_match] == home_team].sort_values('pos_order', kind='stable')
+                home_players = home_team_df[name_col_match].tolist()
+                
+                # Get players for away team sorted by position (filter by Team)
+                away_team_df = df_players[df_players[team_col_match] == away_team].sort_values('pos_order', kind='stable')
+                away_players = away_team_df[name_col_match].tolist()
+                
+                # Create player-to-position mapping
+                home_player_positions = dict(zip(home_team_df[name_col_match], home_team_df[position_col_match]))
+                away_player_positions = dict(zip(away_team_df[name_col_match], away_team_df[position_col_match]))
+                
+                st.markdown("---")
+                
+                # Initialize session state for players if not exists
+                if 'home_match_players' not in st.session_state:
+                    st.session_state.home_match_players = []
+                if 'away_match_players' not in st.session_state:
+                    st.session_state.away_match_players = []
+                
+                # Form mode batches each player's edits into a single "Apply" (one request per player)
+                st.toggle(
+                    "📝 Form mode" if st.session_state.language == 'en' else "📝 وضع النموذج",
+                    key="match_form_mode",
+                    help="Edits are sent when you press ✅ Apply on each player - useful on slow connections"
+                )
+                
+                # Players Section
+                col_lineup_home, col_lineup_away = st.columns(2)
+                
+                # HOME TEAM PLAYERS
+                with col_lineup_home:
+                    render_match_lineup('home', home_team, home_players, home_player_positions)
+                
+                # AWAY TEAM PLAYERS
+                with col_lineup_away:
+                    render_match_lineup('away', away_team, away_players, away_player_positions)
                 
                 st.markdown("---")
                 
+                if st.session_state.get('match_form_mode', False):
+                    st.caption("ℹ️ Press ✅ Apply on each player before saving - edits that were not applied are not saved")
+                
                 # Save button
                 if st.button("💾 Save Match Report" if st.session_state.language == 'en' else "💾 حفظ تقرير المباراة", type="primary"):
                     if not scout_name or not match_phase:
@@ -1643,10 +3163,10 @@ def show_fifa_u17_view():
                                     'Report': player['report']
                                 }
                                 
-                                # Add position-specific items
-                                if 'items' in player:
-                                    for item, value in player['items'].items():
-                                        report_dict[item] = value
+                                # Add position-specific items, keyed by item code
+                                if player.get('items'):
+                                    report_dict.update(player['items'])
+                                    report_dict['Rubric Version'] = POSITION_RUBRIC_VERSION
                                 
                                 player_reports_list.append(report_dict)
                         
@@ -1671,22 +3191,23 @@ def show_fifa_u17_view():
                                     'Report': player['report']
                                 }
                                 
-                                # Add position-specific items
-                                if 'items' in player:
-                                    for item, value in player['items'].items():
-                                        report_dict[item] = value
+                                # Add position-specific items, keyed by item code
+                                if player.get('items'):
+                                    report_dict.update(player['items'])
+                                    report_dict['Rubric Version'] = POSITION_RUBRIC_VERSION
                                 
                                 player_reports_list.append(report_dict)
                         
                         if player_reports_list:
-                            # Save to Google Sheets (with local Excel fallback)
+                            # Save to the local store (synced to Google Sheets in the background)
                             try:
                                 df_new_reports = pd.DataFrame(player_reports_list)
                                 
-                                # Append to Google Sheet
-                                result = append_to_google_sheet(df_new_reports, 'fifa_u17_match_reports', 'Sheet1')
+                                # Append to the match reports sheet
+                                result = save_sheet_rows(df_new_reports, 'fifa_u17_match_reports', 'Sheet1')
                                 
                                 if result:
+                                    track_save(result, f"Match: {home_team} vs {away_team}")
                                     st.success(f"✅ Match report saved! {len(player_reports_list)} player reports added." if st.session_state.language == 'en' else f"✅ تم حفظ تقرير المباراة! تم إضافة {len(player_reports_list)} تقرير لاعب.")
                                     st.balloons()
                                     
@@ -1716,48 +3237,26 @@ def show_fifa_u17_view():
     # Tab 1: CREATE INDIVIDUAL REPORT
     with tabs[1]:
         # Load Al Nassr logo for title
-        try:
-            from PIL import Image
-            import io
-            logo_ind = Image.open('alnassr.png')
-            logo_ind.thumbnail((30, 30))
-            buffered_ind = io.BytesIO()
-            if logo_ind.mode in ('RGBA', 'LA', 'P'):
-                logo_ind.save(buffered_ind, format="PNG")
-            else:
-                logo_ind = logo_ind.convert('RGB')
-                logo_ind.save(buffered_ind, format="PNG")
-            logo_ind_str = base64.b64encode(buffered_ind.getvalue()).decode()
-            logo_ind_html = f'<img src="data:image/png;base64,{logo_ind_str}" style="height:24px; vertical-align:middle; margin-right:8px;">'
-        except:
-            logo_ind_html = '👤'
+        logo_ind_uri = brand_asset_uri('alnassr.png', (30, 30))
+        logo_ind_html = f'<img src="{logo_ind_uri}" style="height:24px; vertical-align:middle; margin-right:8px;">' if logo_ind_uri else '👤'
         
         st.markdown(f"### {logo_ind_html} Create Individual Player Report", unsafe_allow_html=True)
         
+        # A photo that could not be stored on the last save (the save itself reruns the page)
+        if st.session_state.get('individual_photo_warning'):
+            st.warning(st.session_state.pop('individual_photo_warning'))
+        
         # Load player database
         try:
-            df_players = read_google_sheet('WorldCupU17Data', 'Sheet1')
+            df_players = get_player_snapshot()
             if df_players.empty:
                 df_players = pd.read_excel('WorldCupU17Data.xlsx')
+                df_players = df_players.rename(columns=_canonical_player_columns(list(df_players.columns)))
             
-            # Detectar nombres de columnas
-            country_col_ind = None
-            for col in df_players.columns:
-                if col.lower() in ['país', 'pais', 'country', 'equipo', 'team']:
-                    country_col_ind = col
-                    break
-            
-            position_col_ind = None
-            for col in df_players.columns:
-                if 'position' in col.lower() or 'posición' in col.lower():
-                    position_col_ind = col
-                    break
-            
-            name_col_ind = None
-            for col in df_players.columns:
-                if col.lower() in ['nombre', 'name', 'player']:
-                    name_col_ind = col
-                    break
+            # Canonical column names from the player snapshot
+            country_col_ind = 'Team'
+            position_col_ind = 'POS'
+            name_col_ind = 'PLAYER NAME'
             
             # Team selection
             st.markdown("---")
@@ -1773,11 +3272,11 @@ def show_fifa_u17_view():
                 team_players = df_players[df_players[country_col_ind] == selected_team].copy()
                 
                 # Sort by position order (GK first, ST last)
-                position_order = {'Portero': 1, 'Lateral Derecho': 2, 'Lateral Izquierdo': 3, 'Defensa Central': 4, 
-                                'Pivote': 5, 'Mediocentro': 6, 'Mediocentro Ofensivo': 7, 
-                                'Extremo Derecho': 8, 'Extremo Izquierdo': 9, 'Delantero Centro': 10}
-                team_players['pos_order'] = team_players[position_col_ind].map(position_order).fillna(99)
-                team_players = team_players.sort_values('pos_order')
+                pos_order = team_players[position_col_ind].astype(str).map(POSITION_NAME_ORDER)
+                if 'pos_order' in team_players.columns:
+                    pos_order = pos_order.fillna(team_players['pos_order'])
+                team_players['pos_order'] = pos_order.fillna(99)
+                team_players = team_players.sort_values('pos_order', kind='stable')
                 
                 player_names = team_players[name_col_ind].tolist()
                 
@@ -1884,113 +3383,9 @@ def show_fifa_u17_view():
                         else:
                             return "#FFA500"  # Orange
                     
-                    # Map position codes to items
-                    POSITION_ITEMS = {
-                        'GK': [
-                            'Reflejos & 1v1. fiabilidad bajo palos',
-                            'Juego aéreo. autoridad en centros y balones divididos',
-                            'Juego con los pies. precisión en corto y largo',
-                            'Mando y comunicación. organiza la defensa',
-                            'Fiabilidad mental & seguridad. concentración, serenidad, transmitir confianza',
-                            'Sentido del juego (posicionamiento & lectura). anticipación, sobriedad, elegir bien cuándo intervenir'
-                        ],
-                        'CB': [
-                            'Duelos defensivos (1v1 + potencia física)',
-                            'Fiabilidad mental. concentración, serenidad bajo presión',
-                            'Juego aéreo y defensa de área (Def)',
-                            'Posicionamiento & Organización. orden en la línea defensiva',
-                            'Salida de balón (corto, largo y conducción)',
-                            'Anticipación & Coberturas. lectura de juego, intercepciones',
-                            'Velocidad y capacidad de giro'
-                        ],
-                        'RB': [
-                            'Velocidad & Resistencia (ida/vuelta)',
-                            'Fiabilidad mental. disciplina, concentración, equilibrio',
-                            '1v1 defensivo + tapar centros',
-                            'Timing en incorporaciones. saber cuándo doblar y cuándo quedarse',
-                            'Centros & pase interior',
-                            'Posicionamiento defensivo (segundo palo)'
-                        ],
-                        'LB': [
-                            'Velocidad & Resistencia (ida/vuelta)',
-                            'Fiabilidad mental. disciplina, concentración, equilibrio',
-                            '1v1 defensivo + tapar centros',
-                            'Timing en incorporaciones. saber cuándo doblar y cuándo quedarse',
-                            'Centros & pase interior',
-                            'Posicionamiento defensivo (segundo palo)'
-                        ],
-                        'DM': [
-                            'Coberturas, 2das jugadas & posicionamiento. abarcar campo, equilibrio',
-                            'Juego corto - largo',
-                            'Recuperación & duelos. intercepciones, tackles',
-                            'Mando & comunicación. liderazgo silencioso, ordenar bloque',
-                            'Físico y mentalidad destacado',
-                            'Juego aéreo'
-                        ],
-                        'CM': [
-                            'Creatividad & visión. pase vertical, asociación, generar ocasiones',
-                            'Dinamismo. capacidad de girar, romper líneas, movilidad constante',
-                            'Llegada & finalización. cifras, goles, asistencias',
-                            'Trabajo defensivo. recuperación, balance ofensivo-defensivo',
-                            'Duelos & presencia física',
-                            'Personalidad competitiva - consistencia. liderazgo, carácter para asumir balón'
-                        ],
-                        'CAM': [
-                            'Creatividad, asociación & último pase',
-                            'Compromiso defensivo',
-                            'Movilidad entre líneas. espalda de pivotes',
-                            'Toma de decisión. diferencial por sí mismo',
-                            'Definición. gol + tiro media distancia',
-                            '1v1 ofensivo. romper líneas con balón',
-                            'Llegada - desmarques'
-                        ],
-                        'RW': [
-                            'Velocidad & aceleración',
-                            '1v1 ofensivo. generar ocasiones por sí mismo',
-                            'Centros & calidad de servicio',
-                            'Gol & asistencias. volumen ofensivo',
-                            'Trabajo defensivo. retorno + pressing',
-                            'Personalidad, consistencia & toma de decisiones',
-                            'Juego asociativo'
-                        ],
-                        'LW': [
-                            'Velocidad & aceleración',
-                            '1v1 ofensivo. generar ocasiones por sí mismo',
-                            'Centros & calidad de servicio',
-                            'Gol & asistencias. volumen ofensivo',
-                            'Trabajo defensivo. retorno + pressing',
-                            'Personalidad, consistencia & toma de decisiones',
-                            'Juego asociativo'
-                        ],
-                        'ST': [
-                            'GOL. definición fuera y dentro del área (pie + cabeza)',
-                            'Capacidad de generar ocasiones por sí mismo',
-                            'Juego de espaldas & descargas. fijar centrales',
-                            'Movilidad ofensiva. atacar espacios, dinámico',
-                            'Juego aéreo ofensivo',
-                            'Trabajo defensivo. primer defensor'
-                        ]
-                    }
-                    
                     # Get player position code (extract from position name)
                     player_position_full = player_data.get(position_col_ind, '')
-                    position_code = None
-                    
-                    # Map Spanish position names to codes
-                    position_mapping = {
-                        'Portero': 'GK',
-                        'Defensa Central': 'CB',
-                        'Lateral Derecho': 'RB',
-                        'Lateral Izquierdo': 'LB',
-                        'Pivote': 'DM',
-                        'Mediocentro': 'CM',
-                        'Mediocentro Ofensivo': 'CAM',
-                        'Extremo Derecho': 'RW',
-                        'Extremo Izquierdo': 'LW',
-                        'Delantero Centro': 'ST'
-                    }
-                    
-                    position_code = position_mapping.get(player_position_full)
+                    position_code = POSITION_NAME_CODES.get(player_position_full)
                     
                     # PERFORMANCE and POTENTIAL
                     col_eval1, col_eval2 = st.columns(2)
@@ -2028,11 +3423,11 @@ def show_fifa_u17_view():
                     st.markdown("---")
                     
                     # Position-specific items
-                    if position_code and position_code in POSITION_ITEMS:
+                    if position_code in POSITION_RUBRICS:
                         st.markdown(f"### 📊 Evaluación por Posición: {player_position_full} ({position_code})")
                         
                         items_data = {}
-                        for idx, item in enumerate(POSITION_ITEMS[position_code]):
+                        for item_code, item in rubric_items(position_code):
                             col_item1, col_item2 = st.columns([4, 1])
                             with col_item1:
                                 st.markdown(f"**{item}**")
@@ -2040,10 +3435,10 @@ def show_fifa_u17_view():
                                 item_value = st.selectbox(
                                     "Valoración",
                                     ["", "Sí", "No"],
-                                    key=f"item_{position_code}_{idx}",
+                                    key=f"item_{position_code}_{item_code}",
                                     label_visibility="collapsed"
                                 )
-                                items_data[item] = item_value
+                                items_data[item_code] = item_value
                         
                         st.markdown("---")
                     else:
@@ -2088,42 +3483,40 @@ def show_fifa_u17_view():
                             'Conclusion': conclusion
                         }
                         
-                        # Add position-specific items to report data
-                        if position_code and position_code in POSITION_ITEMS:
-                            for item, value in items_data.items():
-                                # Use item text as column name
-                                report_data[item] = value
+                        # Add position-specific items to report data, keyed by item code
+                        if items_data:
+                            report_data.update(items_data)
+                            report_data['Rubric Version'] = POSITION_RUBRIC_VERSION
                         
                         # Save photo: use new uploaded photo, or keep existing one
                         if uploaded_photo:
-                            # Create directory if it doesn't exist
-                            import os
-                            os.makedirs('player_photos', exist_ok=True)
-                            
-                            # Save photo to disk
-                            photo_filename = f"player_photos/{selected_player.replace(' ', '_')}.jpg"
-                            with open(photo_filename, 'wb') as f:
-                                f.write(uploaded_photo.getbuffer())
-                            report_data['Photo'] = photo_filename
+                            # Normalize and save the photo (duplicates are detected by content)
+                            saved_photo = ingest_player_photo(uploaded_photo.getvalue(), selected_player)
+                            report_data['Photo'] = saved_photo['path'] if saved_photo else (existing_photo_path or '')
+                            if saved_photo is None:
+                                photo_warning = (
+                                    f"⚠️ No se pudo guardar la foto de {selected_player}; el informe se guardó "
+                                    + ("con la foto anterior." if existing_photo_path else "sin foto.")
+                                )
+                                st.warning(photo_warning)
+                                st.session_state.individual_photo_warning = photo_warning
                         elif existing_photo_path:
                             # Use existing photo from previous report
                             report_data['Photo'] = existing_photo_path
                         else:
                             report_data['Photo'] = ''
                         
-                        # Save to Google Sheets (with local Excel fallback)
+                        # Save to the local store (synced to Google Sheets in the background)
                         try:
                             df_individual = pd.DataFrame([report_data])
                             
-                            # Append to Google Sheet
-                            result = append_to_google_sheet(df_individual, 'fifa_u17_individual_reports', 'Sheet1')
+                            # Append to the individual reports sheet
+                            result = save_sheet_rows(df_individual, 'fifa_u17_individual_reports', 'Sheet1')
                             
                             if result:
+                                track_save(result, f"Individual: {selected_player}")
                                 st.success("✅ Individual report saved successfully!")
                                 st.balloons()
-                                # Clear cache to show new data immediately
-                                st.cache_data.clear()
-                                time.sleep(1)
                                 st.rerun()
                             else:
                                 st.error("❌ Error: No se pudo guardar el informe en Google Sheets")
@@ -2142,27 +3535,14 @@ def show_fifa_u17_view():
     # Tab 3: VIEW INDIVIDUAL REPORTS (content from old tab 2)
     with tabs[3]:
         # Load Al Nassr logo for title
-        try:
-            from PIL import Image
-            import io
-            logo_img = Image.open('alnassr.png')
-            logo_img.thumbnail((40, 40))
-            buffered = io.BytesIO()
-            if logo_img.mode in ('RGBA', 'LA', 'P'):
-                logo_img.save(buffered, format="PNG")
-            else:
-                logo_img = logo_img.convert('RGB')
-                logo_img.save(buffered, format="PNG")
-            logo_str = base64.b64encode(buffered.getvalue()).decode()
-            logo_html = f'<img src="data:image/png;base64,{logo_str}" style="height:32px; vertical-align:middle; margin-right:10px;">'
-        except:
-            logo_html = '📋'  # Fallback to emoji if logo not found
+        logo_uri = brand_asset_uri('alnassr.png', (40, 40))
+        logo_html = f'<img src="{logo_uri}" style="height:32px; vertical-align:middle; margin-right:10px;">' if logo_uri else '📋'  # Fallback to emoji if logo not found
         
         st.markdown(f"<h2 style='text-align: center; color: #002B5B;'>{logo_html} INDIVIDUAL REPORTS</h2>", unsafe_allow_html=True)
         
         try:
             # Load individual reports
-            df_individual_reports = read_google_sheet('fifa_u17_individual_reports', 'Sheet1')
+            df_individual_reports = add_conclusion_codes(migrate_rubric_columns(read_google_sheet('fifa_u17_individual_reports', 'Sheet1')))
             
             # Check if navigated from player database
             filter_player_name = st.session_state.get('filter_player', None)
@@ -2224,7 +3604,7 @@ def show_fifa_u17_view():
                 # Download buttons for Individual Reports
                 st.markdown("### 📥 Descargar Datos / Download Data")
                 create_download_buttons(
-                    filtered_reports, 
+                    filtered_reports.drop(columns=['Conclusion Code'], errors='ignore'), 
                     filename_base="fifa_u17_individual_reports",
                     label_prefix="Descargar / Download"
                 )
@@ -2277,177 +3657,34 @@ def show_fifa_u17_view():
                 else:
                     st.markdown(f"### 📊 {len(filtered_reports)} Individual Report(s)")
                 
-                # Display reports
-                for idx, report in filtered_reports.iterrows():
-                    # Get scout name if available
-                    scout_name = report.get('Scout', 'Unknown')
-                    player_name = report['Player']
-                    team = report['Team']
-                    conclusion = report.get('Conclusion', '')
-                    report_date = report.get('Date', 'N/A')
+                # Display reports - header lines only, a card body is built when it is opened
+                if 'open_individual_reports' not in st.session_state:
+                    st.session_state.open_individual_reports = set()
+                open_reports = st.session_state.open_individual_reports
+                report_labels = report_summary_labels(filtered_reports)
+                report_ids = report_identities(filtered_reports)
+                
+                for idx, report_label in report_labels.items():
+                    report_id = report_ids[idx]
+                    is_open = report_id in open_reports
+                    st.button(
+                        f"{'▼' if is_open else '▶'} {report_label}",
+                        key=f"toggle_ind_report_{report_id}",
+                        use_container_width=True,
+                        on_click=_toggle_session_member,
+                        args=('open_individual_reports', report_id)
+                    )
                     
-                    with st.expander(
-                        f"👤 {player_name} ({team}) | {conclusion} | 📅 {report_date} | 👤 Scout: {scout_name}",
-                        expanded=False
-                    ):
-                        # === PROFESSIONAL SCOUTING CARD CSS ===
-                        st.markdown("""
-                            <style>
-                            @import url('https://fonts.googleapis.com/css2?family=Inter:wght@400;600;700;900&display=swap');
-                            body { background-color: #fafafa; font-family: 'Inter', sans-serif; }
-                            
-                            .scouting-card-header {
-                                background: linear-gradient(135deg, #1B2845 0%, #0d1421 100%);
-                                color: white;
-                                padding: 20px 30px;
-                                border-radius: 8px 8px 0 0;
-                                margin: -10px -10px 20px -10px;
-                            }
-                            .header-content {
-                                display: flex;
-                                justify-content: space-between;
-                                align-items: center;
-                                flex-wrap: wrap;
-                                gap: 15px;
-                                font-size: 15px;
-                                font-weight: 600;
-                            }
-                            
-                            .player-photo-pro { 
-                                width: 150px; 
-                                height: 150px; 
-                                border-radius: 50%; 
-                                border: 4px solid #FFD700; 
-                                object-fit: cover; 
-                                margin: 0 auto 15px auto; 
-                                display: block;
-                                box-shadow: 0 4px 15px rgba(0,0,0,0.15);
-                            }
-                            .player-name-pro { 
-                                font-size: 22px; 
-                                font-weight: 700; 
-                                color: #1a2332; 
-                                text-align: center; 
-                                margin: 10px 0 5px 0; 
-                            }
-                            .player-info-pro { 
-                                font-size: 13px; 
-                                color: #666; 
-                                text-align: center;
-                            }
-                            
-                            .metric-card-pro { 
-                                background: white; 
-                                padding: 25px 15px; 
-                                border-radius: 8px; 
-                                box-shadow: 0 2px 10px rgba(0,0,0,0.08); 
-                                text-align: center;
-                                height: 100%;
-                            }
-                            .metric-value-pro { 
-                                font-size: 56px; 
-                                font-weight: 700; 
-                                color: #1a2332; 
-                                line-height: 1; 
-                                margin-bottom: 10px;
-                            }
-                            .metric-label-pro { 
-                                font-size: 11px; 
-                                color: #999; 
-                                text-transform: uppercase; 
-                                letter-spacing: 2px; 
-                                margin-bottom: 15px;
-                                font-weight: 600;
-                            }
-                            .stars-pro { 
-                                font-size: 22px; 
-                                display: flex; 
-                                justify-content: center; 
-                                gap: 3px;
-                            }
-                            .profile-text-pro {
-                                font-size: 16px;
-                                font-weight: 600;
-                                color: #1a2332;
-                                margin-top: 10px;
-                                line-height: 1.4;
-                            }
-                            .star-gold { color: #FFD700; }
-                            .star-gray { color: #e0e0e0; }
-                            
-                            .info-bar-pro {
-                                background: white;
-                                padding: 18px 20px;
-                                border-radius: 0;
-                                border-top: 1px solid #e0e0e0;
-                                border-bottom: 1px solid #e0e0e0;
-                                display: flex;
-                                justify-content: space-around;
-                                gap: 20px;
-                                flex-wrap: wrap;
-                                margin: 20px 0;
-                            }
-                            .info-bar-pro span {
-                                font-size: 13px;
-                                color: #495057;
-                                font-weight: 500;
-                            }
-                            
-                            .report-box-pro {
-                                background: #fffef0;
-                                padding: 25px;
-                                border-radius: 5px;
-                                border-left: 5px solid #FFC107;
-                                margin-bottom: 20px;
-                            }
-                            .report-text-pro {
-                                font-style: italic;
-                                color: #333;
-                                font-size: 16px;
-                                margin: 0;
-                                line-height: 1.8;
-                            }
-                            
-                            .action-button-pro {
-                                background: linear-gradient(135deg, #28a745 0%, #218838 100%);
-                                color: white;
-                                padding: 25px;
-                                text-align: center;
-                                border-radius: 8px;
-                                box-shadow: 0 4px 15px rgba(40, 167, 69, 0.3);
-                            }
-                            .action-button-pro.orange {
-                                background: linear-gradient(135deg, #ff8c00 0%, #e67e00 100%);
-                                box-shadow: 0 4px 15px rgba(255, 140, 0, 0.3);
-                            }
-                            .action-button-pro.blue {
-                                background: linear-gradient(135deg, #1B2845 0%, #0d1421 100%);
-                                box-shadow: 0 4px 15px rgba(27, 40, 69, 0.3);
-                            }
-                            .action-text-pro {
-                                font-size: 28px;
-                                font-weight: 700;
-                                text-transform: uppercase;
-                                letter-spacing: 2px;
-                                text-shadow: 0 2px 4px rgba(0,0,0,0.2);
-                                margin: 0;
-                            }
-                            
-                            @keyframes fadeInUp {
-                                from {
-                                    opacity: 0;
-                                    transform: translateY(20px);
-                                }
-                                to {
-                                    opacity: 1;
-                                    transform: translateY(0);
-                                }
-                            }
-                            .animate-fade-in {
-                                animation: fadeInUp 0.6s ease-out;
-                            }
-                            </style>
-                        """, unsafe_allow_html=True)
+                    if is_open:
+                        report = filtered_reports.loc[idx]
+                        # Get scout name if available
+                        scout_name = report.get('Scout', 'Unknown')
+                        player_name = report['Player']
+                        team = report['Team']
+                        report_date = report.get('Date', 'N/A')
+                        
+                        # Professional scouting card CSS (emitted once per page)
+                        use_stylesheet('scouting_card')
                         
                         # Get data for the report
                         birth_year = str(report['Birth Date'])[:4] if report.get('Birth Date') else 'N/A'
@@ -2459,17 +3696,16 @@ def show_fifa_u17_view():
                         
                         # Get flag emoji
                         flag_emoji = COUNTRY_FLAG_EMOJI.get(team, '🏴')
-                        flag_html = f'<span style="font-size:18px; margin-right:8px;">{flag_emoji}</span>'
                         
                         # === RED HEADER ===
-                        st.markdown(f"""
-                            <div class="scouting-card-header">
-                                <div class="header-content">
-                                    <div>{flag_html}<strong>{player_name}</strong> | {team}</div>
-                                    <div>📅 {report_date} | 👤 {scout_name}</div>
-                                </div>
-                            </div>
-                        """, unsafe_allow_html=True)
+                        st.markdown(render_html(
+                            'report_card_header',
+                            flag_emoji=flag_emoji,
+                            player_name=player_name,
+                            team=team,
+                            report_date=report_date,
+                            scout_name=scout_name
+                        ), unsafe_allow_html=True)
                         
                         # === 4 COLUMNS SECTION ===
                         col1, col2, col3, col4 = st.columns([1.2, 1, 1, 1.3])
@@ -2533,112 +3769,65 @@ def show_fifa_u17_view():
                                     photo_path = None
                             
                             # Display photo or fallback
+                            photo_html = REPORT_PHOTO_PLACEHOLDER_HTML
                             if photo_path:
                                 photo_loaded = False
-                                from PIL import Image
-                                import io
                                 
                                 # Check if photo_path is a URL or local file
                                 if photo_path.startswith('http'):
-                                    # Try to download from URL
-                                    import requests
-                                    
-                                    # Get all possible URLs to try
+                                    # URL: try it, other extensions and the name variants on GitHub
                                     urls_to_try = [photo_path]
                                     
                                     # Also try different extensions for the same base URL
-                                    import os.path as osp
-                                    base_url = osp.splitext(photo_path)[0]
+                                    base_url = os.path.splitext(photo_path)[0]
                                     extensions = ['.png', '.jpg', '.jpeg', '.PNG', '.JPG', '.JPEG']
                                     for ext in extensions:
                                         test_url = base_url + ext
                                         if test_url not in urls_to_try:
                                             urls_to_try.append(test_url)
                                     
-                                    # If first URL fails, try other variations based on player name
-                                    if not photo_loaded:
-                                        possible_urls = find_player_photo_github(player_name)
-                                        urls_to_try.extend([url for url in possible_urls if url not in urls_to_try])
+                                    possible_urls = find_player_photo_github(player_name)
+                                    urls_to_try.extend([url for url in possible_urls if url not in urls_to_try])
                                     
-                                    for url in urls_to_try:
-                                        try:
-                                            response = requests.get(url, timeout=5)
-                                            if response.status_code == 200:
-                                                img = Image.open(io.BytesIO(response.content))
-                                                buffered = io.BytesIO()
-                                                if img.mode in ('RGBA', 'LA', 'P'):
-                                                    img.save(buffered, format="PNG")
-                                                else:
-                                                    img = img.convert('RGB')
-                                                    img.save(buffered, format="PNG")
-                                                img_str = base64.b64encode(buffered.getvalue()).decode()
-                                                st.markdown(f'<img src="data:image/png;base64,{img_str}" class="player-photo-pro">', unsafe_allow_html=True)
-                                                photo_loaded = True
-                                                break
-                                        except:
-                                            continue
+                                    remote_photo = resolve_remote_photo(urls_to_try)
+                                    if remote_photo:
+                                        img_src = get_photo_thumbnail_src(remote_photo, REPORT_PHOTO_SIZE)
+                                        if img_src:
+                                            photo_html = f'<img src="{img_src}" class="player-photo-pro">'
+                                            photo_loaded = True
                                 else:
-                                    # Try to open local file
-                                    try:
-                                        img = Image.open(photo_path)
-                                        buffered = io.BytesIO()
-                                        if img.mode in ('RGBA', 'LA', 'P'):
-                                            img.save(buffered, format="PNG")
-                                        else:
-                                            img = img.convert('RGB')
-                                            img.save(buffered, format="PNG")
-                                        img_str = base64.b64encode(buffered.getvalue()).decode()
-                                        st.markdown(f'<img src="data:image/png;base64,{img_str}" class="player-photo-pro">', unsafe_allow_html=True)
+                                    # Local file: cached thumbnail, no decoding after the first render
+                                    img_src = get_photo_thumbnail_src(photo_path, REPORT_PHOTO_SIZE)
+                                    if img_src:
+                                        photo_html = f'<img src="{img_src}" class="player-photo-pro">'
                                         photo_loaded = True
-                                    except:
-                                        pass
                                 
                                 # If photo still not loaded, show fallback
                                 if not photo_loaded:
                                     # Fallback to Al Nassr logo
-                                    try:
-                                        from PIL import Image
-                                        import io
-                                        logo_img = Image.open('alnassr.png')
-                                        buffered = io.BytesIO()
-                                        if logo_img.mode in ('RGBA', 'LA', 'P'):
-                                            logo_img.save(buffered, format="PNG")
-                                        else:
-                                            logo_img = logo_img.convert('RGB')
-                                            logo_img.save(buffered, format="PNG")
-                                        logo_str = base64.b64encode(buffered.getvalue()).decode()
-                                        st.markdown(f'<img src="data:image/png;base64,{logo_str}" class="player-photo-pro">', unsafe_allow_html=True)
-                                    except:
-                                        st.markdown('<div style="width:150px; height:150px; border-radius:50%; border:4px solid #FFD700; display:flex; align-items:center; justify-content:center; margin:0 auto; background:#f0f0f0; font-size:60px;">👤</div>', unsafe_allow_html=True)
+                                    logo_uri = brand_asset_uri('alnassr.png')
+                                    if logo_uri:
+                                        photo_html = f'<img src="{logo_uri}" class="player-photo-pro">'
+                                    else:
+                                        photo_html = REPORT_PHOTO_PLACEHOLDER_HTML
                             else:
                                 # No photo found, use Al Nassr logo
-                                try:
-                                    from PIL import Image
-                                    import io
-                                    logo_img = Image.open('alnassr.png')
-                                    buffered = io.BytesIO()
-                                    if logo_img.mode in ('RGBA', 'LA', 'P'):
-                                        logo_img.save(buffered, format="PNG")
-                                    else:
-                                        logo_img = logo_img.convert('RGB')
-                                        logo_img.save(buffered, format="PNG")
-                                    logo_str = base64.b64encode(buffered.getvalue()).decode()
-                                    st.markdown(f'<img src="data:image/png;base64,{logo_str}" class="player-photo-pro">', unsafe_allow_html=True)
-                                except:
-                                    st.markdown('<div style="width:150px; height:150px; border-radius:50%; border:4px solid #FFD700; display:flex; align-items:center; justify-content:center; margin:0 auto; background:#f0f0f0; font-size:60px;">👤</div>', unsafe_allow_html=True)
-                            
-                            # Nombre
-                            st.markdown(f'<p class="player-name-pro">{report["Player"]}</p>', unsafe_allow_html=True)
-                            
-                            # Subtítulo con posición, año, país y bandera
-                            birth_year = str(report['Birth Date'])[:4] if report.get('Birth Date') else 'N/A'
-                            position = report.get('Position', 'N/A')
-                            team = report['Team']
-                            
-                            # Get country flag emoji
-                            flag_emoji = COUNTRY_FLAG_EMOJI.get(team, '🏴')
+                                logo_uri = brand_asset_uri('alnassr.png')
+                                if logo_uri:
+                                    photo_html = f'<img src="{logo_uri}" class="player-photo-pro">'
+                                else:
+                                    photo_html = REPORT_PHOTO_PLACEHOLDER_HTML
                             
-                            st.markdown(f'<p class="player-info-pro">{position} • {birth_year} • {flag_emoji} {team}</p>', unsafe_allow_html=True)
+                            # Photo, name and subtitle (position, year, country and flag) in one block
+                            st.markdown(render_html(
+                                'report_player_identity',
+                                photo_html=photo_html,
+                                player_name=report['Player'],
+                                position=position,
+                                birth_year=birth_year,
+                                flag_emoji=flag_emoji,
+                                team=team
+                            ), unsafe_allow_html=True)
                         
                         # COLUMN 2: Performance
                         with col2:
@@ -2647,13 +3836,12 @@ def show_fifa_u17_view():
                             except (ValueError, TypeError):
                                 rendimiento = 0
                             stars_html = ''.join([f'<span class="star-gold">⭐</span>' for _ in range(rendimiento)]) + ''.join([f'<span class="star-gray">☆</span>' for _ in range(6 - rendimiento)])
-                            st.markdown(f"""
-                                <div class="metric-card-pro animate-fade-in">
-                                    <div class="metric-value-pro">{rendimiento if rendimiento > 0 else '-'}</div>
-                                    <div class="metric-label-pro">Rendimiento</div>
-                                    <div class="stars-pro">{stars_html}</div>
-                                </div>
-                            """, unsafe_allow_html=True)
+                            st.markdown(render_html(
+                                'report_metric_card',
+                                value=rendimiento if rendimiento > 0 else '-',
+                                label="Rendimiento",
+                                detail_html=f'<div class="stars-pro">{stars_html}</div>'
+                            ), unsafe_allow_html=True)
                         
                         # COLUMN 3: Potential
                         with col3:
@@ -2662,13 +3850,12 @@ def show_fifa_u17_view():
                             except (ValueError, TypeError):
                                 potencial = 0
                             stars_html = ''.join([f'<span class="star-gold">⭐</span>' for _ in range(potencial)]) + ''.join([f'<span class="star-gray">☆</span>' for _ in range(6 - potencial)])
-                            st.markdown(f"""
-                                <div class="metric-card-pro animate-fade-in">
-                                    <div class="metric-value-pro">{potencial if potencial > 0 else '-'}</div>
-                                    <div class="metric-label-pro">Potencial</div>
-                                    <div class="stars-pro">{stars_html}</div>
-                                </div>
-                            """, unsafe_allow_html=True)
+                            st.markdown(render_html(
+                                'report_metric_card',
+                                value=potencial if potencial > 0 else '-',
+                                label="Potencial",
+                                detail_html=f'<div class="stars-pro">{stars_html}</div>'
+                            ), unsafe_allow_html=True)
                         
                         # COLUMN 4: Profile (TEXT ONLY, NO STARS)
                         with col4:
@@ -2684,13 +3871,12 @@ def show_fifa_u17_view():
                                 perfil_num = 0
                                 perfil_text = "-"
                             
-                            st.markdown(f"""
-                                <div class="metric-card-pro animate-fade-in">
-                                    <div class="metric-value-pro">{perfil_num if perfil_num > 0 else '-'}</div>
-                                    <div class="metric-label-pro">Profile</div>
-                                    <div class="profile-text-pro">{perfil_text}</div>
-                                </div>
-                            """, unsafe_allow_html=True)
+                            st.markdown(render_html(
+                                'report_metric_card',
+                                value=perfil_num if perfil_num > 0 else '-',
+                                label="Profile",
+                                detail_html=f'<div class="profile-text-pro">{perfil_text}</div>'
+                            ), unsafe_allow_html=True)
                         
                         # === INFORMACIÓN SECUNDARIA ===
                         contract = report.get('Contract', 'N/A')
@@ -2699,104 +3885,44 @@ def show_fifa_u17_view():
                         report_date = report.get('Date', 'N/A')
                         scout = report.get('Scout', 'N/A')
                         
-                        st.markdown(f"""
-                            <div class="info-bar-pro animate-fade-in">
-                                <span><strong>FIN DE CONTRATO:</strong> {contract}</span>
-                                <span><strong>💼 AGENTE:</strong> {agent}</span>
-                                <span><strong>📞</strong> {phone}</span>
-                                <span><strong>📅</strong> {report_date}</span>
-                                <span><strong>👤</strong> {scout}</span>
-                            </div>
-                        """, unsafe_allow_html=True)
-                        
                         # === SECCIÓN INFERIOR: COMENTARIO TÉCNICO Y CONCLUSIÓN (VERTICAL) ===
                         # Comentario técnico
                         tech_comment = report.get('Technical Comment', None)
-                        if tech_comment and str(tech_comment) != 'nan' and str(tech_comment).strip():
-                            st.markdown(f"""
-                                <div class="report-box-pro animate-fade-in">
-                                    <p class="report-text-pro">{tech_comment}</p>
-                                </div>
-                            """, unsafe_allow_html=True)
-                        else:
-                            st.markdown("""
-                                <div class="report-box-pro animate-fade-in">
-                                    <p class="report-text-pro" style="color: #999;">No technical comment available.</p>
-                                </div>
-                            """, unsafe_allow_html=True)
+                        has_tech_comment = bool(tech_comment and str(tech_comment) != 'nan' and str(tech_comment).strip())
                         
                         # Conclusión (debajo del comentario)
                         conclusion = report.get('Conclusion', '')
                         
                         # Determinar clase de color según conclusión
-                        if conclusion.startswith('A'):
-                            button_class = ''  # Green (default)
-                        elif conclusion.startswith('B+'):
-                            button_class = ' blue'
-                        elif conclusion.startswith('B') and not conclusion.startswith('B+'):
-                            button_class = ' orange'
-                        else:
-                            button_class = ' blue'  # Default
+                        button_class = CONCLUSION_BUTTON_CLASSES.get(report.get('Conclusion Code'), ' blue')
                         
-                        st.markdown(f"""
-                            <div class="action-button-pro{button_class} animate-fade-in">
-                                <p class="action-text-pro">{conclusion}</p>
-                            </div>
-                        """, unsafe_allow_html=True)
+                        # Info bar, comment and conclusion in a single block
+                        st.markdown(render_html(
+                            'report_details',
+                            contract=contract,
+                            agent=agent,
+                            phone=phone,
+                            report_date=report_date,
+                            scout=scout,
+                            tech_comment=tech_comment if has_tech_comment else "No technical comment available.",
+                            comment_style='' if has_tech_comment else ' style="color: #999;"',
+                            button_class=button_class,
+                            conclusion=conclusion
+                        ), unsafe_allow_html=True)
                         
                         # === BOTÓN GENERAR PDF ===
-                        st.markdown("<br>", unsafe_allow_html=True)
-                        
                         col_pdf1, col_pdf2, col_pdf3 = st.columns([1, 2, 1])
                         with col_pdf2:
-                            if st.button(f"📄 Generar PDF", key=f"pdf_{idx}", type="primary", use_container_width=True):
+                            if st.button(f"📄 Generar PDF", key=f"pdf_{report_id}", type="primary", use_container_width=True):
                                 try:
                                     # Preparar datos para el PDF
                                     player_name = report['Player']
                                     
                                     # Buscar foto del jugador
-                                    import os
-                                    import unicodedata
-                                    
-                                    def remove_accents(text):
-                                        """Quitar acentos de un texto"""
-                                        return ''.join(c for c in unicodedata.normalize('NFD', text) if unicodedata.category(c) != 'Mn')
-                                    
-                                    photo_path = None
-                                    base_dir = os.path.dirname(os.path.abspath(__file__))
-                                    
-                                    # Versión sin acentos del nombre
-                                    player_name_no_accents = remove_accents(player_name)
-                                    
-                                    # También reemplazar puntos por guiones bajos (G. Yassine -> G_Yassine)
-                                    player_name_clean = player_name.replace('.', '_').replace(' ', '_')
-                                    player_name_no_accents_clean = player_name_no_accents.replace('.', '_').replace(' ', '_')
-                                    
-                                    possible_photos = [
-                                        # Con puntos reemplazados
-                                        os.path.join(base_dir, 'player_photos', f"{player_name_clean}.png"),
-                                        os.path.join(base_dir, 'player_photos', f"{player_name_no_accents_clean}.png"),
-                                        # Con acentos
-                                        os.path.join(base_dir, 'player_photos', f"{player_name.replace(' ', '_')}.png"),
-                                        os.path.join(base_dir, 'player_photos', f"{player_name.replace(' ', '')}.png"),
-                                        os.path.join(base_dir, 'player_photos', f"{player_name}.png"),
-                                        # Sin acentos
-                                        os.path.join(base_dir, 'player_photos', f"{player_name_no_accents.replace(' ', '_')}.png"),
-                                        os.path.join(base_dir, 'player_photos', f"{player_name_no_accents.replace(' ', '')}.png"),
-                                        os.path.join(base_dir, 'player_photos', f"{player_name_no_accents}.png"),
-                                        # JPG
-                                        os.path.join(base_dir, 'player_photos', f"{player_name_clean}.jpg"),
-                                        os.path.join(base_dir, 'player_photos', f"{player_name.replace(' ', '_')}.jpg"),
-                                        os.path.join(base_dir, 'player_photos', f"{player_name_no_accents.replace(' ', '_')}.jpg"),
-                                    ]
-                                    
-                                    for path in possible_photos:
-                                        if os.path.exists(path):
-                                            photo_path = path
-                                            st.info(f"✅ Foto encontrada: {os.path.basename(path)}")
-                                            break
-                                    
-                                    if not photo_path:
+                                    photo_path = pdf_photo_path(find_player_photo(player_name))
+                                    if photo_path:
+                                        st.info(f"✅ Foto encontrada: {os.path.basename(photo_path)}")
+                                    else:
                                         st.warning(f"⚠️ No se encontró foto para {player_name}")
                                     
                                     pdf_data = {
@@ -2849,21 +3975,8 @@ def show_fifa_u17_view():
     # Tab 4: DATABASE (content from old tab 3)
     with tabs[4]:
         # Load Al Nassr logo for title
-        try:
-            from PIL import Image
-            import io
-            logo_title = Image.open('alnassr.png')
-            logo_title.thumbnail((30, 30))
-            buffered_title = io.BytesIO()
-            if logo_title.mode in ('RGBA', 'LA', 'P'):
-                logo_title.save(buffered_title, format="PNG")
-            else:
-                logo_title = logo_title.convert('RGB')
-                logo_title.save(buffered_title, format="PNG")
-            logo_title_str = base64.b64encode(buffered_title.getvalue()).decode()
-            logo_title_html = f'<img src="data:image/png;base64,{logo_title_str}" style="height:24px; vertical-align:middle; margin-right:8px;">'
-        except:
-            logo_title_html = '🗄️'
+        logo_title_uri = brand_asset_uri('alnassr.png', (30, 30))
+        logo_title_html = f'<img src="{logo_title_uri}" style="height:24px; vertical-align:middle; margin-right:8px;">' if logo_title_uri else '🗄️'
         
         if st.session_state.language == 'en':
             st.markdown(f"<h3>{logo_title_html} Player Database - FIFA U17 World Cup</h3>", unsafe_allow_html=True)
@@ -2871,29 +3984,7 @@ def show_fifa_u17_view():
             st.markdown(f"<h3>{logo_title_html} قاعدة بيانات اللاعبين - كأس العالم تحت 17</h3>", unsafe_allow_html=True)
         
         # Custom CSS for player cards
-        st.markdown("""
-        <style>
-            .player-card {
-                background: linear-gradient(135deg, #667eea 0%, #764ba2 100%);
-                padding: 1rem;
-                border-radius: 10px;
-                color: white;
-                margin-bottom: 0.5rem;
-            }
-            .player-card-header {
-                font-size: 1.2rem;
-                font-weight: bold;
-            }
-            .player-badge {
-                display: inline-block;
-                background-color: rgba(255,255,255,0.2);
-                padding: 0.3rem 0.6rem;
-                border-radius: 15px;
-                margin-right: 0.5rem;
-                font-size: 0.9rem;
-            }
-        </style>
-        """, unsafe_allow_html=True)
+        use_stylesheet('player_cards')
         
         # Load player data from Google Sheets (WorldCupU17Data)
         # Columns: # POS PLAYER NAME ... Team CLUB Nationality
@@ -2903,51 +3994,28 @@ def show_fifa_u17_view():
         position_col = 'POS'
         name_col = 'PLAYER NAME'
         
-        try:
-            # Try Google Sheets first
-            df_players = read_google_sheet('WorldCupU17Data', 'Sheet1')
-            
-            # If Google Sheets fails, try local Excel file
-            if df_players is None or df_players.empty:
-                try:
-                    df_players = pd.read_excel('dbworldcup17.xlsx')
-                    if not df_players.empty:
-                        st.info(f"📊 {len(df_players)} jugadores cargados")
-                except Exception as excel_error:
-                    st.error(f"❌ Error al cargar datos: {str(excel_error)}")
-                    df_players = pd.DataFrame()
-            else:
-                st.info(f"📊 {len(df_players)} jugadores cargados")
-            
-            # Verificar columnas
-            if not df_players.empty:
-                if 'Team' in df_players.columns:
-                    team_col = 'Team'
-                if 'CLUB' in df_players.columns:
-                    club_col = 'CLUB'
-                if 'POS' in df_players.columns:
-                    position_col = 'POS'
-                if 'PLAYER NAME' in df_players.columns:
-                    name_col = 'PLAYER NAME'
+        # Load the player snapshot and both report sheets of this tab concurrently
+        db_sheets = load_concurrently({
+            'players': get_player_snapshot,
+            'fifa_u17_match_reports': lambda: read_google_sheet('fifa_u17_match_reports', 'Sheet1'),
+            'fifa_u17_individual_reports': lambda: read_google_sheet('fifa_u17_individual_reports', 'Sheet1'),
+        })
         
-        except Exception as e:
-            st.error(f"❌ Error: {str(e)}")
-            
-        # Load match reports from Google Sheets
-        try:
-            df_reports = read_google_sheet('fifa_u17_match_reports', 'Sheet1')
-        except FileNotFoundError:
-            df_reports = pd.DataFrame()
-        except Exception as e:
-            st.error(f"Error loading reports: {e}")
+        # Shared snapshot (Google Sheets, or local Excel if Sheets has never loaded) - filters below never modify it
+        df_players = db_sheets['players']
+        if df_players.empty:
+            st.error("❌ Error al cargar datos de jugadores")
+        else:
+            st.info(f"📊 {len(df_players)} jugadores cargados")
         
-        # Try to load individual reports (silently fail if empty)
-        try:
-            df_individual_reports = read_google_sheet('fifa_u17_individual_reports', 'Sheet1')
-            if df_individual_reports is None:
-                df_individual_reports = pd.DataFrame()
-        except:
-            df_individual_reports = pd.DataFrame()
+        # Match reports and individual reports (already loaded above)
+        df_reports = add_conclusion_codes(migrate_rubric_columns(db_sheets['fifa_u17_match_reports']))
+        df_individual_reports = add_conclusion_codes(migrate_rubric_columns(db_sheets['fifa_u17_individual_reports']))
+        
+        # Group both report tables by player once, instead of filtering them for every player card
+        report_index = build_player_report_index(df_reports, df_individual_reports)
+        players_with_match_reports_keys = list(report_index['match'])
+        players_with_individual_reports_keys = list(report_index['individual'])
         
         # Control para mostrar todos los jugadores
         if 'show_all_players' not in st.session_state:
@@ -2991,7 +4059,7 @@ def show_fifa_u17_view():
         with col_filter3:
             # Team filter (Team column - national teams)
             if not base_df_for_filters_db.empty and team_col in base_df_for_filters_db.columns:
-                all_teams = ['All Teams'] + sorted(base_df_for_filters_db[team_col].unique().tolist())
+                all_teams = ['All Teams'] + sorted(base_df_for_filters_db[team_col].dropna().unique().tolist())
             else:
                 all_teams = ['All Teams']
             selected_team = st.selectbox(
@@ -3018,8 +4086,8 @@ def show_fifa_u17_view():
                 key="only_with_reports_filter"
             )
         
-        # Filter dataframe
-        filtered_df = df_players.copy()
+        # Filter dataframe (filters return new frames, the shared snapshot is never modified)
+        filtered_df = df_players
         
         if selected_team != 'All Teams':
             filtered_df = filtered_df[filtered_df[team_col] == selected_team]
@@ -3032,69 +4100,21 @@ def show_fifa_u17_view():
         
         # Filtrar por jugadores con informe
         if only_with_reports:
-            players_with_any_report = []
-            
-            # Añadir jugadores con match reports
-            if not df_reports.empty:
-                players_with_any_report.extend(df_reports['Player Name'].unique().tolist())
-            
-            # Añadir jugadores con individual reports
-            if not df_individual_reports.empty:
-                players_with_any_report.extend(df_individual_reports['Player'].unique().tolist())
+            players_with_any_report = players_with_match_reports_keys + players_with_individual_reports_keys
             
             # Filtrar solo jugadores con informe
             if players_with_any_report:
-                filtered_df = filtered_df[filtered_df[name_col].isin(players_with_any_report)]
+                filtered_df = filtered_df[filtered_df['player_key'].isin(players_with_any_report)]
             else:
                 filtered_df = pd.DataFrame()  # No hay jugadores con informe
         
-        # Filtrar por conclusión
+        # Filtrar por conclusión (códigos ya calculados en el índice de informes)
         if selected_conclusion != 'Todas':
-            players_with_conclusion = []
-            
-            # Buscar en match reports
-            if not df_reports.empty and 'Conclusion' in df_reports.columns:
-                if selected_conclusion == 'A - Firmar':
-                    # Buscar A al inicio de la conclusión
-                    conclusion_reports = df_reports[df_reports['Conclusion'].astype(str).str.strip().str.upper().str.match(r'^A[\s\-]')]
-                elif selected_conclusion == 'B+ - Seguir para Firmar':
-                    # Buscar específicamente B+
-                    conclusion_reports = df_reports[df_reports['Conclusion'].astype(str).str.contains(r'B\+', case=False, na=False, regex=True)]
-                elif selected_conclusion == 'B - Seguir':
-                    # Buscar B pero NO B+
-                    conclusion_reports = df_reports[
-                        (df_reports['Conclusion'].astype(str).str.strip().str.upper().str.match(r'^B[\s\-]')) &
-                        (~df_reports['Conclusion'].astype(str).str.contains(r'B\+', case=False, na=False, regex=True))
-                    ]
-                else:
-                    conclusion_reports = pd.DataFrame()
-                
-                if not conclusion_reports.empty:
-                    players_with_conclusion.extend(conclusion_reports['Player Name'].unique().tolist())
-            
-            # Buscar en individual reports
-            if not df_individual_reports.empty and 'Conclusion' in df_individual_reports.columns:
-                if selected_conclusion == 'A - Firmar':
-                    # Buscar A al inicio de la conclusión
-                    conclusion_ind_reports = df_individual_reports[df_individual_reports['Conclusion'].astype(str).str.strip().str.upper().str.match(r'^A[\s\-]')]
-                elif selected_conclusion == 'B+ - Seguir para Firmar':
-                    # Buscar específicamente B+
-                    conclusion_ind_reports = df_individual_reports[df_individual_reports['Conclusion'].astype(str).str.contains(r'B\+', case=False, na=False, regex=True)]
-                elif selected_conclusion == 'B - Seguir':
-                    # Buscar B pero NO B+
-                    conclusion_ind_reports = df_individual_reports[
-                        (df_individual_reports['Conclusion'].astype(str).str.strip().str.upper().str.match(r'^B[\s\-]')) &
-                        (~df_individual_reports['Conclusion'].astype(str).str.contains(r'B\+', case=False, na=False, regex=True))
-                    ]
-                else:
-                    conclusion_ind_reports = pd.DataFrame()
-                
-                if not conclusion_ind_reports.empty:
-                    players_with_conclusion.extend(conclusion_ind_reports['Player'].unique().tolist())
+            conclusion_players = players_with_conclusion(report_index, CONCLUSION_FILTER_CODES[selected_conclusion])
             
             # Filtrar solo jugadores con esa conclusión
-            if players_with_conclusion:
-                filtered_df = filtered_df[filtered_df[name_col].isin(players_with_conclusion)]
+            if conclusion_players:
+                filtered_df = filtered_df[filtered_df['player_key'].isin(conclusion_players)]
             else:
                 filtered_df = pd.DataFrame()  # No hay jugadores con esa conclusión
         
@@ -3121,14 +4141,14 @@ def show_fifa_u17_view():
         with col_stat3:
             # Count players with match reports
             if not df_reports.empty and not filtered_df.empty:
-                players_with_match_reports = filtered_df[name_col].isin(df_reports['Player Name']).sum()
+                players_with_match_reports = filtered_df['player_key'].isin(players_with_match_reports_keys).sum()
                 st.metric("⚽ Match Reports", players_with_match_reports)
             else:
                 st.metric("⚽ Match Reports", 0)
         with col_stat4:
             # Count players with individual reports
             if not df_individual_reports.empty and not filtered_df.empty:
-                players_with_individual_reports = filtered_df[name_col].isin(df_individual_reports['Player']).sum()
+                players_with_individual_reports = filtered_df['player_key'].isin(players_with_individual_reports_keys).sum()
                 st.metric("📋 Individual Reports", players_with_individual_reports)
             else:
                 st.metric("📋 Individual Reports", 0)
@@ -3139,7 +4159,7 @@ def show_fifa_u17_view():
         if not filtered_df.empty:
             st.markdown("### 📥 Descargar Datos / Download Data")
             create_download_buttons(
-                filtered_df, 
+                filtered_df.drop(columns=PLAYER_DERIVED_COLUMNS, errors='ignore'), 
                 filename_base="fifa_u17_player_database",
                 label_prefix="Descargar / Download"
             )
@@ -3151,29 +4171,36 @@ def show_fifa_u17_view():
             else:
                 st.warning("❌ No se encontraron jugadores con los filtros seleccionados" if st.session_state.language == 'en' else "❌ لا يوجد لاعبون بالفلاتر المحددة")
         else:
-            # Group by team (Team column - national teams)
-            for team in sorted(filtered_df[team_col].unique()):
-                team_players = filtered_df[filtered_df[team_col] == team]
-                
-                # Team header with flag emoji
-                flag_emoji = COUNTRY_FLAG_EMOJI.get(team, '🏴')
-                flag_html = f'<span style="font-size:40px; margin-right:10px;">{flag_emoji}</span>'
-                
-                # Count players with match reports in this team
-                team_players_with_match_reports = 0
-                if not df_reports.empty:
-                    team_players_with_match_reports = team_players[name_col].isin(df_reports['Player Name']).sum()
-                
-                # Count players with individual reports in this team
-                team_players_with_individual_reports = 0
-                if not df_individual_reports.empty:
-                    team_players_with_individual_reports = team_players[name_col].isin(df_individual_reports['Player']).sum()
-                
-                # Display team header
-                st.markdown(
-                    f'<div style="background-color: #002B5B; color: white; padding: 1rem; border-radius: 8px; margin: 1rem 0; font-weight: bold; font-size: 1.2rem;">{flag_html}{team} ({len(team_players)} players | ⚽ {team_players_with_match_reports} match reports | 📋 {team_players_with_individual_reports} individual reports)</div>',
-                    unsafe_allow_html=True
-                )
+            # Stable order: teams alphabetically, database order within each team
+            sorted_df = filtered_df.sort_values(team_col, kind='stable')
+            
+            # Team totals for the headers, computed once over the whole filtered list
+            team_groups = sorted_df[team_col]
+            team_summary = pd.DataFrame({
+                'players': team_groups.groupby(team_groups, observed=True).size(),
+                'match': sorted_df['player_key'].isin(players_with_match_reports_keys).groupby(team_groups, observed=True).sum(),
+                'individual': sorted_df['player_key'].isin(players_with_individual_reports_keys).groupby(team_groups, observed=True).sum(),
+            })
+            
+            # Pagination - only the visible page of players is turned into widgets
+            filter_signature = (search_player, selected_position, selected_team, only_with_reports,
+                                selected_conclusion, st.session_state.show_all_players,
+                                st.session_state.get('db_page_size', DATABASE_PAGE_SIZES[0]))
+            page_start, page_end = paginate(len(sorted_df), 'db_page', filter_signature, 'db_page_size', label="jugadores")
+            page_df = sorted_df.iloc[page_start:page_end]
+            
+            # Group the visible page by team (Team column - national teams)
+            for team, team_players in page_df.groupby(team_col, sort=False, observed=True):
+                # Team header with flag emoji; players with match / individual reports in the whole team
+                team_total = team_summary.loc[team]
+                st.markdown(render_html(
+                    'db_team_header',
+                    flag_emoji=COUNTRY_FLAG_EMOJI.get(team, '🏴'),
+                    team=team,
+                    players=team_total['players'],
+                    match=team_total['match'],
+                    individual=team_total['individual']
+                ), unsafe_allow_html=True)
                 
                 # Display players as expandable cards within this team
                 for idx, player in team_players.iterrows():
@@ -3183,85 +4210,20 @@ def show_fifa_u17_view():
                     player_club = player.get(club_col, 'N/A')  # Club de origen (informativo)
                     player_age = player.get('DOB', 'N/A')  # Fecha de nacimiento
                     
-                    # Check if player has match reports
-                    has_match_reports = False
-                    player_reports = pd.DataFrame()
-                    if not df_reports.empty:
-                        player_reports = df_reports[df_reports['Player Name'] == player_name]
-                        has_match_reports = len(player_reports) > 0
-                    
-                    # Check if player has individual reports
-                    has_individual_reports = False
-                    player_individual_reports = pd.DataFrame()
-                    if not df_individual_reports.empty:
-                        # Try exact match first
-                        player_individual_reports = df_individual_reports[df_individual_reports['Player'] == player_name]
-                        # If no exact match, try case-insensitive and stripped
-                        if len(player_individual_reports) == 0:
-                            player_individual_reports = df_individual_reports[
-                                df_individual_reports['Player'].str.strip().str.lower() == player_name.strip().lower()
-                            ]
-                        has_individual_reports = len(player_individual_reports) > 0
+                    # Player's reports from the precomputed index
+                    player_key = player.get('player_key') or normalize_player_name(player_name)
+                    player_reports = player_reports_from_index(report_index, 'match', df_reports, player_key)
+                    has_match_reports = len(player_reports) > 0
+                    player_individual_reports = player_reports_from_index(report_index, 'individual', df_individual_reports, player_key)
+                    has_individual_reports = len(player_individual_reports) > 0
                     
                     # Card header with status indicator
                     has_any_report = has_match_reports or has_individual_reports
                     
-                    # Determinar emoji según conclusión - revisar TODOS los informes
+                    # Emoji según la mejor conclusión de TODOS los informes
                     status_emoji = ""
-                    best_conclusion_priority = 0  # 0=ninguno, 1=otros, 2=B, 3=B+, 4=A
-                    
                     if has_any_report:
-                        # Revisar individual reports
-                        if has_individual_reports:
-                            for _, ind_report in player_individual_reports.iterrows():
-                                conclusion = str(ind_report.get('Conclusion', '')).strip()
-                                conclusion_upper = conclusion.upper()
-                                
-                                # Determinar prioridad
-                                if conclusion_upper.startswith('A ') or conclusion_upper.startswith('A-') or (conclusion_upper.startswith('A') and len(conclusion_upper) > 1 and conclusion_upper[1] in [' ', '-']):
-                                    if best_conclusion_priority < 4:
-                                        best_conclusion_priority = 4
-                                        status_emoji = "⭐️"
-                                elif 'B+' in conclusion_upper or 'B +' in conclusion_upper:
-                                    if best_conclusion_priority < 3:
-                                        best_conclusion_priority = 3
-                                        status_emoji = "🟢"
-                                elif conclusion_upper.startswith('B ') or conclusion_upper.startswith('B-'):
-                                    if best_conclusion_priority < 2:
-                                        best_conclusion_priority = 2
-                                        status_emoji = "☑️"
-                                elif conclusion and conclusion != 'nan':
-                                    if best_conclusion_priority < 1:
-                                        best_conclusion_priority = 1
-                                        status_emoji = "☑️"
-                        
-                        # Revisar match reports
-                        if has_match_reports:
-                            for _, match_report in player_reports.iterrows():
-                                match_conclusion = str(match_report.get('Conclusion', '')).strip()
-                                match_conclusion_upper = match_conclusion.upper()
-                                
-                                # Determinar prioridad
-                                if match_conclusion_upper.startswith('A ') or match_conclusion_upper.startswith('A-') or (match_conclusion_upper.startswith('A') and len(match_conclusion_upper) > 1 and match_conclusion_upper[1] in [' ', '-']):
-                                    if best_conclusion_priority < 4:
-                                        best_conclusion_priority = 4
-                                        status_emoji = "⭐️"
-                                elif 'B+' in match_conclusion_upper or 'B +' in match_conclusion_upper:
-                                    if best_conclusion_priority < 3:
-                                        best_conclusion_priority = 3
-                                        status_emoji = "🟢"
-                                elif match_conclusion_upper.startswith('B ') or match_conclusion_upper.startswith('B-'):
-                                    if best_conclusion_priority < 2:
-                                        best_conclusion_priority = 2
-                                        status_emoji = "☑️"
-                                elif match_conclusion and match_conclusion != 'nan':
-                                    if best_conclusion_priority < 1:
-                                        best_conclusion_priority = 1
-                                        status_emoji = "☑️"
-                        
-                        # Si no se encontró ninguna conclusión válida
-                        if not status_emoji:
-                            status_emoji = "☑️"
+                        status_emoji = CONCLUSION_STATUS_EMOJI.get(report_index['best'].get(player_key, 0), "☑️")
                     
                     # Siempre usar fondo blanco (sin color)
                     card_bg_color = "white"
@@ -3269,30 +4231,7 @@ def show_fifa_u17_view():
                     # Al Nassr minimalist player profile
                     with st.container():
                         # Get player photo
-                        player_photo_base64 = ""
-                        try:
-                            from PIL import Image
-                            import io
-                            import os
-                            
-                            player_photo_file = f"player_photos/{player_name.replace(' ', '_')}.jpg"
-                            if not os.path.exists(player_photo_file):
-                                player_photo_file = 'profile1.jpg'
-                            
-                            if os.path.exists(player_photo_file):
-                                img = Image.open(player_photo_file)
-                                img.thumbnail((120, 120), Image.Resampling.LANCZOS)
-                                buffered = io.BytesIO()
-                                
-                                if img.mode in ('RGBA', 'LA', 'P'):
-                                    img.save(buffered, format="PNG")
-                                else:
-                                    img = img.convert('RGB')
-                                    img.save(buffered, format="PNG")
-                                
-                                player_photo_base64 = base64.b64encode(buffered.getvalue()).decode()
-                        except:
-                            pass
+                        player_photo_src = get_photo_thumbnail_src(find_player_photo(player_name) or 'profile1.jpg', CARD_PHOTO_SIZE)
                         
                         # Birth year
                         birth_year = str(player.get('Año', ''))[:4] if player.get('Año') else 'N/A'
@@ -3304,43 +4243,18 @@ def show_fifa_u17_view():
                             expanded=False
                         ):
                             # Al Nassr Header Section
-                            photo_html = f'<img src="data:image/png;base64,{player_photo_base64}" style="width:120px; height:120px; border-radius:50%; object-fit:cover; border:3px solid #FFC60A;">' if player_photo_base64 else '<div style="width:120px; height:120px; border-radius:50%; background:#FFC60A; display:flex; align-items:center; justify-content:center; font-size:48px; border:3px solid #FFC60A;">👤</div>'
+                            photo_html = f'<img src="{player_photo_src}" style="width:120px; height:120px; border-radius:50%; object-fit:cover; border:3px solid #FFC60A;">' if player_photo_src else '<div style="width:120px; height:120px; border-radius:50%; background:#FFC60A; display:flex; align-items:center; justify-content:center; font-size:48px; border:3px solid #FFC60A;">👤</div>'
                             
-                            st.markdown(f"""
-                                <div style="background: #1a2332; padding: 30px; border-radius: 8px; margin-bottom: 30px;">
-                                    <div style="display: flex; align-items: center; gap: 30px; flex-wrap: wrap;">
-                                        <div>{photo_html}</div>
-                                        <div style="flex: 1; min-width: 300px;">
-                                            <div style="display: grid; grid-template-columns: repeat(auto-fit, minmax(150px, 1fr)); gap: 20px;">
-                                                <div>
-                                                    <div style="color: #FFC60A; font-size: 12px; text-transform: uppercase; font-weight: 600; margin-bottom: 5px;">POSITION</div>
-                                                    <div style="color: white; font-size: 24px; font-weight: 600;">{player_position}</div>
-                                                </div>
-                                                <div>
-                                                    <div style="color: #FFC60A; font-size: 12px; text-transform: uppercase; font-weight: 600; margin-bottom: 5px;">NATIONAL TEAM</div>
-                                                    <div style="color: white; font-size: 20px; font-weight: 600;">{player_team}</div>
-                                                </div>
-                                                <div>
-                                                    <div style="color: #FFC60A; font-size: 12px; text-transform: uppercase; font-weight: 600; margin-bottom: 5px;">CLUB</div>
-                                                    <div style="color: white; font-size: 16px; font-weight: 500;">{player_club}</div>
-                                                </div>
-                                                <div>
-                                                    <div style="color: #FFC60A; font-size: 12px; text-transform: uppercase; font-weight: 600; margin-bottom: 5px;">DOB</div>
-                                                    <div style="color: white; font-size: 18px; font-weight: 600;">{player_age}</div>
-                                                </div>
-                                                <div>
-                                                    <div style="color: #FFC60A; font-size: 12px; text-transform: uppercase; font-weight: 600; margin-bottom: 5px;">YEAR</div>
-                                                    <div style="color: white; font-size: 24px; font-weight: 600;">{birth_year}</div>
-                                                </div>
-                                                <div>
-                                                    <div style="color: #FFC60A; font-size: 12px; text-transform: uppercase; font-weight: 600; margin-bottom: 5px;">CONTRACT</div>
-                                                    <div style="color: white; font-size: 24px; font-weight: 600;">{contract_date}</div>
-                                                </div>
-                                            </div>
-                                        </div>
-                                    </div>
-                                </div>
-                            """, unsafe_allow_html=True)
+                            st.markdown(render_html(
+                                'db_player_header',
+                                photo_html=photo_html,
+                                player_position=player_position,
+                                player_team=player_team,
+                                player_club=player_club,
+                                player_age=player_age,
+                                birth_year=birth_year,
+                                contract_date=contract_date
+                            ), unsafe_allow_html=True)
                             
                             # Photo upload section
                             st.markdown("---")
@@ -3356,14 +4270,15 @@ def show_fifa_u17_view():
                                 
                                 if uploaded_player_photo:
                                     if st.button("💾 Guardar Foto", key=f"save_photo_{idx}_{player_name.replace(' ', '_').replace('.', '_')}"):
-                                        import os
-                                        os.makedirs('player_photos', exist_ok=True)
-                                        photo_filename = f"player_photos/{player_name.replace(' ', '_')}.jpg"
-                                        with open(photo_filename, 'wb') as f:
-                                            f.write(uploaded_player_photo.getbuffer())
-                                        st.success("✅ Foto guardada correctamente!")
-                                        time.sleep(1)
-                                        st.rerun()
+                                        saved_photo = ingest_player_photo(uploaded_player_photo.getvalue(), player_name)
+                                        if saved_photo is None:
+                                            st.error("❌ No se pudo procesar la imagen")
+                                        else:
+                                            if saved_photo['duplicate']:
+                                                st.info("📸 Esta foto ya estaba guardada")
+                                            st.success("✅ Foto guardada correctamente!")
+                                            time.sleep(1)
+                                            st.rerun()
                             
                             st.markdown("---")
                             
@@ -3387,12 +4302,8 @@ def show_fifa_u17_view():
                                     full_report = report.get('Report', '')
                                     
                                     # Conclusion badge color
-                                    conclusion_str = str(conclusion).strip().upper()
-                                    if 'A -' in conclusion_str or 'A-' in conclusion_str or conclusion_str.startswith('A '):
-                                        conclusion_color = '#4CAF50'  # Green for A
-                                        conclusion_bg = 'rgba(76, 175, 80, 0.1)'
-                                    elif 'B+' in conclusion_str:
-                                        conclusion_color = '#4CAF50'  # Green for B+
+                                    if report.get('Conclusion Code') in ('A', 'B+'):
+                                        conclusion_color = '#4CAF50'  # Green for A and B+
                                         conclusion_bg = 'rgba(76, 175, 80, 0.1)'
                                     else:
                                         conclusion_color = '#ff8c00'  # Orange for B
@@ -3481,21 +4392,8 @@ def show_fifa_u17_view():
                                 st.markdown("")
                                 
                                 # Cargar logo Al Nassr para las tarjetas
-                                try:
-                                    from PIL import Image
-                                    import io
-                                    logo_img = Image.open('alnassr.png')
-                                    logo_img.thumbnail((40, 40))
-                                    buffered = io.BytesIO()
-                                    if logo_img.mode in ('RGBA', 'LA', 'P'):
-                                        logo_img.save(buffered, format="PNG")
-                                    else:
-                                        logo_img = logo_img.convert('RGB')
-                                        logo_img.save(buffered, format="PNG")
-                                    logo_str = base64.b64encode(buffered.getvalue()).decode()
-                                    logo_html = f'<img src="data:image/png;base64,{logo_str}" style="height:24px; margin-bottom:8px;">'
-                                except:
-                                    logo_html = '<div style="font-size:24px; margin-bottom:10px;">🦅</div>'
+                                logo_uri = brand_asset_uri('alnassr.png', (40, 40))
+                                logo_html = f'<img src="{logo_uri}" style="height:24px; margin-bottom:8px;">' if logo_uri else '<div style="font-size:24px; margin-bottom:10px;">🦅</div>'
                                 
                                 # Mostrar valoraciones medias en 2 columnas con estilo minimalista
                                 col_avg1, col_avg2 = st.columns(2)
@@ -3571,63 +4469,11 @@ def show_fifa_u17_view():
     # Tab 2: VIEW MATCH REPORTS (content from old tab 4)
     with tabs[2]:
         # Al Nassr Match Reports CSS
-        st.markdown("""
-            <style>
-            .stats-card {
-                background: white;
-                padding: 20px;
-                border-radius: 8px;
-                box-shadow: 0 2px 8px rgba(0,0,0,0.1);
-                text-align: center;
-                border-left: 4px solid #FFC60A;
-            }
-            .stats-number {
-                font-size: 36px;
-                font-weight: 700;
-                color: #1a2332;
-                margin: 10px 0;
-            }
-            .stats-label {
-                font-size: 12px;
-                color: #666;
-                text-transform: uppercase;
-                letter-spacing: 1px;
-                font-weight: 600;
-            }
-            .match-card {
-                background: white;
-                border-left: 4px solid #e0e0e0;
-                border-radius: 8px;
-                padding: 20px;
-                margin-bottom: 15px;
-                box-shadow: 0 2px 8px rgba(0,0,0,0.08);
-                transition: all 0.3s ease;
-                cursor: pointer;
-            }
-            .match-card:hover {
-                border-left-color: #FFC60A;
-                transform: translateX(5px);
-                box-shadow: 0 4px 12px rgba(255,198,10,0.3);
-            }
-            </style>
-        """, unsafe_allow_html=True)
+        use_stylesheet('match_dashboard')
         
         # Title with Al Nassr logo
-        try:
-            from PIL import Image
-            import io
-            logo_dashboard = Image.open('alnassr.png')
-            logo_dashboard.thumbnail((40, 40))
-            buffered_logo = io.BytesIO()
-            if logo_dashboard.mode in ('RGBA', 'LA', 'P'):
-                logo_dashboard.save(buffered_logo, format="PNG")
-            else:
-                logo_dashboard = logo_dashboard.convert('RGB')
-                logo_dashboard.save(buffered_logo, format="PNG")
-            logo_dashboard_str = base64.b64encode(buffered_logo.getvalue()).decode()
-            logo_dashboard_html = f'<img src="data:image/png;base64,{logo_dashboard_str}" style="height:32px; vertical-align:middle; margin-right:10px;">'
-        except:
-            logo_dashboard_html = '⚽'
+        logo_dashboard_uri = brand_asset_uri('alnassr.png', (40, 40))
+        logo_dashboard_html = f'<img src="{logo_dashboard_uri}" style="height:32px; vertical-align:middle; margin-right:10px;">' if logo_dashboard_uri else '⚽'
         
         st.markdown(f"<h2 style='text-align: center; color: #1a2332;'>{logo_dashboard_html} MATCH REPORTS DASHBOARD</h2>", unsafe_allow_html=True)
         st.markdown("<h3 style='text-align: center; color: #666;'>FIFA U17 World Cup</h3>", unsafe_allow_html=True)
@@ -3695,59 +4541,35 @@ def show_fifa_u17_view():
             'Bolivia': 'bolivia.png'
         }
         
-        # Load match reports from Google Sheets
-        try:
-            df_reports = read_google_sheet('fifa_u17_match_reports', 'Sheet1')
-        except FileNotFoundError:
-            df_reports = pd.DataFrame()
-        except Exception as e:
-            df_reports = pd.DataFrame()
+        # Load match reports and the player snapshot (for birth years) concurrently
+        dashboard_sheets = load_concurrently({
+            'fifa_u17_match_reports': lambda: read_google_sheet('fifa_u17_match_reports', 'Sheet1'),
+            'players': get_player_snapshot,
+        })
+        df_reports = dashboard_sheets['fifa_u17_match_reports']
         
-        # Load player birth year data from WorldCupU17Data
+        # Birth year from the player snapshot, matched on the canonical player key
         try:
-            df_players_data = read_google_sheet('WorldCupU17Data', 'Sheet1')
-            
-            # Detect player column names in both dataframes
-            player_col_reports = None
-            player_col_data = None
-            year_col_data = None
+            df_players_data = dashboard_sheets['players']
             
             # Check for player column in reports (could be 'Player Name', 'Player', etc.)
+            player_col_reports = None
             for col in df_reports.columns:
                 col_lower = col.lower().replace(' ', '')
                 if col_lower in ['playername', 'player', 'jugador', 'nombre', 'name']:
                     player_col_reports = col
                     break
             
-            # Check for player column in data (could be 'Nombre', 'Player', etc.)
-            for col in df_players_data.columns:
-                col_lower = col.lower().replace(' ', '')
-                if col_lower in ['nombre', 'player', 'playername', 'jugador', 'name']:
-                    player_col_data = col
-                    break
-            
-            # Check for year column (could be 'Año', 'Year', 'Año')
-            for col in df_players_data.columns:
-                col_lower = col.lower()
-                if col_lower in ['año', 'year', 'año', 'ano']:
-                    year_col_data = col
-                    break
-            
-            # Try to merge if both have player columns and year exists
-            if player_col_reports and player_col_data and year_col_data:
-                # Create a temporary dataframe for merge
-                df_players_data_temp = df_players_data[[player_col_data, year_col_data]].copy()
-                df_players_data_temp.columns = [player_col_reports, 'BirthYear']
-                
-                # Merge to get birth year
-                df_reports = df_reports.merge(
-                    df_players_data_temp,
-                    on=player_col_reports,
-                    how='left'
-                )
+            if player_col_reports and 'player_key' in df_players_data.columns and 'Birth Year' in df_players_data.columns:
+                birth_years = df_players_data.drop_duplicates('player_key').set_index('player_key')['Birth Year']
+                df_reports = df_reports.copy()
+                df_reports['BirthYear'] = df_reports[player_col_reports].map(normalize_player_name).map(birth_years).astype(float)
         except Exception as e:
             pass  # Continue without birth year data
         
+        # Parse conclusions once for the filter and the badges
+        df_reports = add_conclusion_codes(migrate_rubric_columns(df_reports))
+        
         # Detect Player column name
         player_col = None
         for col in df_reports.columns:
@@ -3848,8 +4670,7 @@ def show_fifa_u17_view():
             if filter_phase:
                 filtered_reports = filtered_reports[filtered_reports['Phase'] == filter_phase]
             if filter_conclusion:
-                # Match exact conclusion from Excel
-                filtered_reports = filtered_reports[filtered_reports['Conclusion'] == filter_conclusion]
+                filtered_reports = filtered_reports[filtered_reports['Conclusion Code'] == CONCLUSION_FILTER_CODES[filter_conclusion]]
             
             st.markdown("---")
             st.markdown(f"<p style='color: #666; font-size: 14px;'><strong>📊 Reportes filtrados:</strong> {len(filtered_reports)}</p>", unsafe_allow_html=True)
@@ -3859,7 +4680,7 @@ def show_fifa_u17_view():
             if not filtered_reports.empty:
                 st.markdown("### 📥 Descargar Datos / Download Data")
                 create_download_buttons(
-                    filtered_reports, 
+                    filtered_reports.drop(columns=['Conclusion Code'], errors='ignore'), 
                     filename_base="fifa_u17_match_reports",
                     label_prefix="Descargar / Download"
                 )
@@ -3874,6 +4695,9 @@ def show_fifa_u17_view():
                 'Rafael': 'Rafa Gil'
             }
             
+            # Consecutive card markup is buffered and rendered in one st.markdown call before the next widget
+            html_batch = []
+            
             # Group by Scout first
             for scout in scouts_in_reports:
                 scout_reports = filtered_reports[filtered_reports['Scout'] == scout]
@@ -3896,38 +4720,13 @@ def show_fifa_u17_view():
                     scout_filename = scout.replace(' ', '_').lower()
                 
                 scout_photo_path = f"{scout_filename}.png"
-                scout_photo_html = ''
-                try:
-                    from PIL import Image
-                    import io
-                    import os
-                    if os.path.exists(scout_photo_path):
-                        scout_img = Image.open(scout_photo_path)
-                        scout_img.thumbnail((50, 50))
-                        buffered = io.BytesIO()
-                        if scout_img.mode in ('RGBA', 'LA', 'P'):
-                            scout_img.save(buffered, format="PNG")
-                        else:
-                            scout_img = scout_img.convert('RGB')
-                            scout_img.save(buffered, format="PNG")
-                        scout_img_str = base64.b64encode(buffered.getvalue()).decode()
-                        scout_photo_html = f'<img src="data:image/png;base64,{scout_img_str}" style="width: 50px; height: 50px; border-radius: 50%; object-fit: cover; border: 3px solid #FFC60A;">'
-                    else:
-                        scout_photo_html = '<div style="width: 50px; height: 50px; border-radius: 50%; background: #1a2332; display: flex; align-items: center; justify-content: center; color: #FFC60A; font-size: 24px; border: 3px solid #FFC60A;">👤</div>'
-                except Exception as e:
+                scout_img_uri = brand_asset_uri(scout_photo_path, (50, 50))
+                if scout_img_uri:
+                    scout_photo_html = f'<img src="{scout_img_uri}" style="width: 50px; height: 50px; border-radius: 50%; object-fit: cover; border: 3px solid #FFC60A;">'
+                else:
                     scout_photo_html = '<div style="width: 50px; height: 50px; border-radius: 50%; background: #1a2332; display: flex; align-items: center; justify-content: center; color: #FFC60A; font-size: 24px; border: 3px solid #FFC60A;">👤</div>'
                 
-                st.markdown(f"""
-                    <div style="background: #1a2332; border-left: 6px solid #FFC60A; border-radius: 8px; padding: 15px; margin: 20px 0 15px 0; box-shadow: 0 4px 12px rgba(0,0,0,0.15);">
-                        <div style="display: flex; align-items: center; gap: 15px;">
-                            {scout_photo_html}
-                            <div>
-                                <h3 style="color: #FFC60A; margin: 0; font-size: 20px; font-weight: 700;">{scout_display_name}</h3>
-                                <p style="color: white; margin: 3px 0 0 0; font-size: 11px; opacity: 0.9; letter-spacing: 1px;">SCOUT AL NASSR FC</p>
-                            </div>
-                        </div>
-                    </div>
-                """, unsafe_allow_html=True)
+                html_batch.append(render_html('scout_header', scout_photo_html=scout_photo_html, scout_display_name=scout_display_name))
                 
                 # Group by match for this scout
                 scout_matches = scout_reports['Match'].unique()
@@ -3951,21 +4750,17 @@ def show_fifa_u17_view():
                         team1 = match_name.strip()
                         team2 = ''
                     
-                    # Load team flags with debug
-                    # Get flag emojis for both teams
-                    team1_flag_emoji = COUNTRY_FLAG_EMOJI.get(team1, '🏴')
-                    team2_flag_emoji = COUNTRY_FLAG_EMOJI.get(team2, '🏴')
-                    team1_flag_html = f'{team1_flag_emoji} '
-                    team2_flag_html = f'{team2_flag_emoji} '
-                    
-                    # Match Header Card
-                    match_header_html = f"""
-                        <div style="background: white; border-left: 4px solid #FFC60A; border-radius: 8px; padding: 18px; margin-bottom: 10px; box-shadow: 0 2px 8px rgba(0,0,0,0.08);">
-                            <h4 style="color: #1a2332; margin: 0 0 8px 0; font-size: 18px; font-weight: 700;">{team1_flag_html}{team1} vs {team2_flag_html}{team2}</h4>
-                            <p style="margin: 0; color: #666; font-size: 13px;">{match_date} | {match_phase}</p>
-                        </div>
-                    """
-                    st.markdown(match_header_html, unsafe_allow_html=True)
+                    # Match Header Card, with flag emojis for both teams
+                    html_batch.append(render_html(
+                        'match_header',
+                        team1_flag_emoji=COUNTRY_FLAG_EMOJI.get(team1, '🏴'),
+                        team1=team1,
+                        team2_flag_emoji=COUNTRY_FLAG_EMOJI.get(team2, '🏴'),
+                        team2=team2,
+                        match_date=match_date,
+                        match_phase=match_phase
+                    ))
+                    flush_html(html_batch)
                     
                     # Toggle button
                     if st.button(f"▼ Ver Jugadores ({len(match_reports)})" if not st.session_state[match_key] else "▲ Ocultar", key=f"btn_{match_key}"):
@@ -3984,16 +4779,8 @@ def show_fifa_u17_view():
                             team_name = str(team_name).strip()
                             team_players = match_reports[match_reports['Team'] == team_name] if 'Team' in match_reports.columns else match_reports
                             
-                            # Load team flag emoji for section header
-                            team_flag_emoji = COUNTRY_FLAG_EMOJI.get(team_name, '🏴')
-                            team_flag_html = f'{team_flag_emoji} '
-                            
-                            # Team section header
-                            st.markdown(f"""
-                                <div style="background: #f8f9fa; border-left: 4px solid #1a2332; padding: 12px 15px; margin: 15px 0 10px 0; border-radius: 6px;">
-                                    <h5 style="margin: 0; color: #1a2332; font-size: 16px; font-weight: 700;">{team_flag_html}{team_name}</h5>
-                                </div>
-                            """, unsafe_allow_html=True)
+                            # Team section header (rendered together with the first player card)
+                            html_batch.append(render_html('match_team_header', team_flag_emoji=COUNTRY_FLAG_EMOJI.get(team_name, '🏴'), team_name=team_name))
                             
                             # Player rows for this team
                             for p_idx, report in team_players.iterrows():
@@ -4008,33 +4795,15 @@ def show_fifa_u17_view():
                                 player_birth_year = report.get('BirthYear', report.get('Year', ''))
                                 conclusion = report.get('Conclusion', '')
                                 
-                                # Determine conclusion badge color and text (order matters: B+ before B!)
+                                # Conclusion badge color and text from the parsed code
                                 conclusion_str = str(conclusion).strip()
-                                conclusion_upper = conclusion_str.upper()
-                                
-                                # Check for A - FIRMAR first (exact match format from Excel)
-                                if 'A - FIRMAR' in conclusion_upper or 'A -' in conclusion_str:
-                                    conclusion_color = '#4CAF50'  # Green
-                                    conclusion_text = 'A - FIRMAR'
-                                # Check for B+ before B (MUST check B+ first! More specific)
-                                elif 'B+' in conclusion_str or 'SEGUIR PARA FIRMAR' in conclusion_upper:
-                                    conclusion_color = '#2196F3'  # Blue
-                                    conclusion_text = 'B+ - SEGUIR PARA FIRMAR'
-                                # Then check for B - SEGUIR (but not B+)
-                                elif 'B - SEGUIR' in conclusion_upper and 'B+' not in conclusion_str:
-                                    conclusion_color = '#FF9800'  # Orange
-                                    conclusion_text = 'B - SEGUIR'
-                                elif 'B -' in conclusion_str and '+' not in conclusion_str:
-                                    conclusion_color = '#FF9800'  # Orange
-                                    conclusion_text = 'B - SEGUIR'
+                                conclusion_code = report.get('Conclusion Code')
+                                if conclusion_code in CONCLUSION_BADGES:
+                                    conclusion_color, conclusion_text = CONCLUSION_BADGES[conclusion_code]
                                 else:
                                     conclusion_color = '#9E9E9E'  # Gray for unknown
                                     conclusion_text = conclusion_str if conclusion_str and conclusion_str != 'nan' else 'N/A'
                                 
-                                # Load player's team flag emoji
-                                flag_emoji = COUNTRY_FLAG_EMOJI.get(str(player_team).strip(), '🏴')
-                                flag_html = f'<span style="font-size: 18px; margin-right: 6px;">{flag_emoji}</span>'
-                                
                                 # Progress bars (RED)
                                 perf_percent = (performance / 6) * 100
                                 pot_percent = (potential / 6) * 100
@@ -4055,34 +4824,20 @@ def show_fifa_u17_view():
                                     birth_year_display = ""
                                 
                                 # Horizontal player card: Nombre • Year • Posición | Rendimiento | Potencial | Conclusion Badge
-                                player_card_html = f"""
-                                    <div style="background: white; border: 1px solid #e0e0e0; border-radius: 8px; padding: 15px; margin-bottom: 10px; display: flex; align-items: center; justify-content: space-between; flex-wrap: wrap; gap: 15px;">
-                                        <div style="flex: 1; min-width: 200px;">
-                                            <div style="font-size: 15px; font-weight: 700; color: #1a2332; margin-bottom: 2px;">{player_name}</div>
-                                            <div style="font-size: 11px; color: #999;">{birth_year_display}{player_position} • {player_number}</div>
-                                        </div>
-                                        <div style="display: flex; gap: 20px; align-items: center; flex-wrap: wrap;">
-                                            <div style="text-align: center; min-width: 85px;">
-                                                <div style="font-size: 9px; color: #666; margin-bottom: 2px; text-transform: uppercase; font-weight: 600;">Rendimiento</div>
-                                                <div style="font-size: 16px; font-weight: 700; color: #1a2332;">{performance}/6</div>
-                                                <div style="background: #f0f0f0; border-radius: 3px; height: 5px; overflow: hidden; width: 65px; margin: 4px auto 0;">
-                                                    <div style="background: #ff4444; height: 100%; width: {perf_percent}%;"></div>
-                                                </div>
-                                            </div>
-                                            <div style="text-align: center; min-width: 85px;">
-                                                <div style="font-size: 9px; color: #666; margin-bottom: 2px; text-transform: uppercase; font-weight: 600;">Potencial</div>
-                                                <div style="font-size: 16px; font-weight: 700; color: #1a2332;">{potential}/6</div>
-                                                <div style="background: #f0f0f0; border-radius: 3px; height: 5px; overflow: hidden; width: 65px; margin: 4px auto 0;">
-                                                    <div style="background: #ff4444; height: 100%; width: {pot_percent}%;"></div>
-                                                </div>
-                                            </div>
-                                            <div style="background: {conclusion_color}; color: white; padding: 8px 12px; border-radius: 6px; font-size: 10px; font-weight: 700; text-transform: uppercase; letter-spacing: 0.5px; box-shadow: 0 2px 4px rgba(0,0,0,0.2);">
-                                                {conclusion_text}
-                                            </div>
-                                        </div>
-                                    </div>
-                                """
-                                st.markdown(player_card_html, unsafe_allow_html=True)
+                                html_batch.append(render_html(
+                                    'match_player_card',
+                                    player_name=player_name,
+                                    birth_year_display=birth_year_display,
+                                    player_position=player_position,
+                                    player_number=player_number,
+                                    performance=performance,
+                                    perf_percent=perf_percent,
+                                    potential=potential,
+                                    pot_percent=pot_percent,
+                                    conclusion_color=conclusion_color,
+                                    conclusion_text=conclusion_text
+                                ))
+                                flush_html(html_batch)
                                 
                                 # VER and EDITAR buttons
                                 edit_key = f"{player_key}_edit"
@@ -4273,37 +5028,41 @@ def show_fifa_u17_view():
                                         # Save button
                                         if st.button("💾 GUARDAR CAMBIOS", key=f"save_{player_key}", type="primary", use_container_width=True):
                                             try:
-                                                # Load current data from Google Sheets
-                                                df_all_reports = read_google_sheet('fifa_u17_match_reports', 'Sheet1')
+                                                # Identify the report row by Scout/Match/Player
+                                                report_key = {
+                                                    'Scout': scout,
+                                                    'Match': match_name,
+                                                    player_col: player_name
+                                                }
                                                 
-                                                # Find the exact row to update using multiple criteria
-                                                mask = (
-                                                    (df_all_reports['Scout'] == scout) &
-                                                    (df_all_reports['Match'] == match_name) &
-                                                    (df_all_reports[player_col] == player_name)
-                                                )
+                                                new_values = {
+                                                    'Date': str(new_date),
+                                                    'Phase': new_phase,
+                                                    'Number': new_number,
+                                                    'Position': new_position,
+                                                    'Birth Year': new_birth_year,
+                                                    'Starter': new_starter,
+                                                    'Minutes': new_minutes,
+                                                    'Performance': new_performance,
+                                                    'Potential': new_potential,
+                                                    'Conclusion': new_conclusion,
+                                                    'Report': new_report
+                                                }
                                                 
-                                                # Update all the values
-                                                df_all_reports.loc[mask, 'Date'] = str(new_date)
-                                                df_all_reports.loc[mask, 'Phase'] = new_phase
-                                                df_all_reports.loc[mask, 'Number'] = new_number
-                                                df_all_reports.loc[mask, 'Position'] = new_position
-                                                df_all_reports.loc[mask, 'Birth Year'] = new_birth_year
-                                                df_all_reports.loc[mask, 'Starter'] = new_starter
-                                                df_all_reports.loc[mask, 'Minutes'] = new_minutes
-                                                df_all_reports.loc[mask, 'Performance'] = new_performance
-                                                df_all_reports.loc[mask, 'Potential'] = new_potential
-                                                df_all_reports.loc[mask, 'Conclusion'] = new_conclusion
-                                                df_all_reports.loc[mask, 'Report'] = new_report
+                                                # Only send the cells that actually changed
+                                                changed_values = {
+                                                    col: value for col, value in new_values.items()
+                                                    if _sheet_cell_value(report.get(col, '')) != _sheet_cell_value(value)
+                                                }
                                                 
-                                                # Save back to Google Sheets
-                                                write_google_sheet(df_all_reports, 'fifa_u17_match_reports', 'Sheet1')
+                                                # Save the changed cells back to Google Sheets
+                                                result = update_sheet_rows('fifa_u17_match_reports', report_key, changed_values, 'Sheet1')
+                                                if not result:
+                                                    raise Exception("No se pudo actualizar la fila en Google Sheets")
                                                 
+                                                track_save(result, f"Update: {player_name}")
                                                 st.success("✅ Informe actualizado exitosamente!")
                                                 st.session_state[edit_key] = False
-                                                
-                                                # Wait a moment and reload
-                                                time.sleep(1)
                                                 st.rerun()
                                                 
                                             except Exception as e:
@@ -4321,30 +5080,24 @@ def show_fifa_u17_view():
                                                 st.rerun()
                                             else:
                                                 try:
-                                                    # Load current data from Google Sheets
-                                                    df_all_reports = read_google_sheet('fifa_u17_match_reports', 'Sheet1')
-                                                    
-                                                    # Find the exact row to delete
-                                                    mask = (
-                                                        (df_all_reports['Scout'] == scout) &
-                                                        (df_all_reports['Match'] == match_name) &
-                                                        (df_all_reports[player_col] == player_name)
-                                                    )
+                                                    # Identify the report row by Scout/Match/Player
+                                                    report_key = {
+                                                        'Scout': scout,
+                                                        'Match': match_name,
+                                                        player_col: player_name
+                                                    }
                                                     
-                                                    # Remove the row
-                                                    df_all_reports = df_all_reports[~mask]
-                                                    
-                                                    # Save back to Google Sheets
-                                                    write_google_sheet(df_all_reports, 'fifa_u17_match_reports', 'Sheet1')
+                                                    # Delete just that row from Google Sheets
+                                                    result = delete_sheet_rows('fifa_u17_match_reports', report_key, 'Sheet1')
+                                                    if not result:
+                                                        raise Exception("No se pudo eliminar la fila en Google Sheets")
                                                     
+                                                    track_save(result, f"Delete: {player_name}")
                                                     st.success("✅ Informe eliminado exitosamente!")
                                                     
                                                     # Clear confirmation state
                                                     if confirm_key in st.session_state:
                                                         del st.session_state[confirm_key]
-                                                    
-                                                    # Wait a moment and reload
-                                                    time.sleep(1)
                                                     st.rerun()
                                                     
                                                 except Exception as e:
@@ -4355,15 +5108,9 @@ def show_fifa_u17_view():
                                 
                                 # Expandable REPORT section (VIEW MODE)
                                 elif st.session_state[player_key] and full_report_text and str(full_report_text) != 'nan':
-                                    report_html = f"""
-                                        <div style="background: #fffef0; border: 2px solid #FFC60A; border-radius: 8px; padding: 25px; margin-bottom: 15px;">
-                                            <h4 style="color: #1a2332; margin: 0 0 15px 0; font-size: 16px; border-bottom: 2px solid #FFC60A; padding-bottom: 10px;">📝 REPORT</h4>
-                                            <div style="font-size: 14px; color: #333; line-height: 1.8;">
-                                                {full_report_text}
-                                            </div>
-                                        </div>
-                                    """
-                                    st.markdown(report_html, unsafe_allow_html=True)
+                                    html_batch.append(render_html('match_report_box', full_report_text=full_report_text))
+            
+            flush_html(html_batch)
 
 # Helper functions
 def show_login_page():
@@ -4392,39 +5139,15 @@ def show_login_page():
     }
     
     # Custom CSS for login page
-    st.markdown("""
-        <style>
-        .login-container {
-            max-width: 400px;
-            margin: 100px auto;
-            padding: 40px;
-            background: white;
-            border-radius: 15px;
-            box-shadow: 0 4px 20px rgba(0,0,0,0.1);
-        }
-        </style>
-    """, unsafe_allow_html=True)
+    use_stylesheet('login')
     
     # Center the login form
     col1, col2, col3 = st.columns([1, 2, 1])
     
     with col2:
         # Load Al Nassr logo for login
-        try:
-            from PIL import Image
-            import io
-            logo_login = Image.open('alnassr.png')
-            logo_login.thumbnail((40, 40))
-            buffered_login = io.BytesIO()
-            if logo_login.mode in ('RGBA', 'LA', 'P'):
-                logo_login.save(buffered_login, format="PNG")
-            else:
-                logo_login = logo_login.convert('RGB')
-                logo_login.save(buffered_login, format="PNG")
-            logo_login_str = base64.b64encode(buffered_login.getvalue()).decode()
-            logo_login_html = f'<img src="data:image/png;base64,{logo_login_str}" style="height:35px; vertical-align:middle; margin-right:10px;">'
-        except:
-            logo_login_html = '🔐'
+        logo_login_uri = brand_asset_uri('alnassr.png', (40, 40))
+        logo_login_html = f'<img src="{logo_login_uri}" style="height:35px; vertical-align:middle; margin-right:10px;">' if logo_login_uri else '🔐'
         
         st.markdown(f"### {logo_login_html} FIFA U17 Scouting", unsafe_allow_html=True)
         st.markdown("#### Login / تسجيل الدخول")
@@ -4471,35 +5194,10 @@ def logout():
     st.rerun()
 
 def apply_custom_css():
-    st.markdown("""
-    <style>
-    .main { background-color: #f5f5f5; }
-    
-    /* Mejorar el selectbox para que sea más fácil de usar */
-    .stSelectbox > div > div {
-        cursor: pointer;
-    }
-    
-    /* Hacer el dropdown más grande y visible */
-    [data-baseweb="select"] {
-        cursor: pointer;
-    }
-    
-    /* Mejorar la visibilidad del input de búsqueda en el selectbox */
-    [data-baseweb="popover"] {
-        z-index: 9999 !important;
-    }
-    
-    /* Estilo para el input de búsqueda dentro del selectbox */
-    [data-baseweb="select"] input {
-        font-size: 14px !important;
-        padding: 8px !important;
-    }
-    </style>
-    """, unsafe_allow_html=True)
+    use_stylesheet('app')
 
 def create_download_buttons(df, filename_base, label_prefix):
-    csv = df.to_csv(index=False).encode('utf-8')
+    csv = label_rubric_columns(df.drop(columns=[SYNC_ID_COLUMN], errors='ignore')).to_csv(index=False).encode('utf-8')
     st.download_button(
         label=f"{label_prefix} CSV",
         data=csv,